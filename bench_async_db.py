@@ -0,0 +1,100 @@
+"""
+Latency of concurrent profile reads through the sync session (a `def` route
+on the threadpool) against the async session (GET /profiles/{id}, awaiting
+aiosqlite on the event loop), optionally while sync routes occupy the
+threadpool the way ephemeris requests do while they wait on the worker pool.
+Runs in-process over ASGI against a copy of kundali.db.
+Run with: python3 bench_async_db.py [CONCURRENCY] [ROUNDS] [BUSY_REQUESTS] [DB_PATH]
+"""
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# Seconds each simulated ephemeris request holds a threadpool thread
+BUSY_SECONDS = 0.2
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))] * 1000
+
+
+async def measure(client, path, profile_ids, concurrency, rounds, busy):
+    latencies = []
+
+    async def read(profile_id):
+        started = time.perf_counter()
+        response = await client.get(path.format(profile_id))
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - started)
+
+    for _ in range(rounds):
+        background = [asyncio.create_task(client.get("/busy")) for _ in range(busy)]
+        await asyncio.sleep(0)  # let the busy requests take their threads first
+        await asyncio.gather(*(read(profile_ids[i % len(profile_ids)]) for i in range(concurrency)))
+        await asyncio.gather(*background)
+    return percentile(latencies, 0.5), percentile(latencies, 0.99)
+
+
+async def bench(concurrency, rounds, busy):
+    import httpx
+    from fastapi import Depends, FastAPI, HTTPException
+    from sqlalchemy.orm import Session
+
+    from kundali_app.api.routes import profiles
+    from kundali_app.db.session import SessionLocal, get_db
+    from kundali_app.models import Profile
+
+    app = FastAPI()
+    app.include_router(profiles.router, prefix="/profiles")
+
+    @app.get("/sync/{profile_id}")
+    def get_profile_sync(profile_id: str, db: Session = Depends(get_db)):
+        profile = db.query(Profile).filter(Profile.id == profile_id).first()
+        if not profile:
+            raise HTTPException(status_code=404, detail="Profile not found")
+        return profile
+
+    @app.get("/busy")
+    def busy_route():
+        time.sleep(BUSY_SECONDS)
+
+    db = SessionLocal()
+    profile_ids = [row.id for row in db.query(Profile.id)]
+    db.close()
+    if not profile_ids:
+        raise SystemExit("The database has no profiles")
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for path in ("/sync/{}", "/profiles/{}"):  # warm up both pools
+            await measure(client, path, profile_ids, 10, 1, 0)
+        print(f"{concurrency} concurrent reads x {rounds} rounds, {len(profile_ids)} profiles")
+        for label, load in (("idle", 0), (f"{busy} busy", busy)):
+            for name, path in (("sync ", "/sync/{}"), ("async", "/profiles/{}")):
+                p50, p99 = await measure(client, path, profile_ids, concurrency, rounds, load)
+                print(f"  {label:8} {name}  p50 {p50:8.2f} ms  p99 {p99:8.2f} ms")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    source = args[3] if len(args) > 3 else "kundali.db"
+    workdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(workdir, "bench.db")
+        shutil.copyfile(source, path)
+        os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+
+        from kundali_app.db.session import Base, engine, upgrade_schema
+        import kundali_app.models  # noqa: F401
+        Base.metadata.create_all(bind=engine)
+        upgrade_schema(engine)
+
+        asyncio.run(bench(int(args[0]) if len(args) > 0 else 200,
+                          int(args[1]) if len(args) > 1 else 5,
+                          int(args[2]) if len(args) > 2 else 40))
+    finally:
+        shutil.rmtree(workdir)
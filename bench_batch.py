@@ -0,0 +1,48 @@
+"""
+Throughput of the vectorized batch ephemeris path against the per-row
+AstrologyService.calculate_planets loop.
+Run with: python3 bench_batch.py [N]
+"""
+import sys
+import time
+import numpy as np
+from datetime import datetime, timedelta
+
+from kundali_app.services.astrology import AstrologyService
+from kundali_app.services.chart_cache import chart_cache
+
+
+def make_births(n, seed=7):
+    rng = np.random.default_rng(seed)
+    start = np.datetime64("1950-01-01T00:00")
+    utc = start + rng.integers(0, 70 * 365 * 24 * 60, n).astype("timedelta64[m]")
+    lat = np.round(rng.uniform(-50, 60, n), 4)
+    lon = np.round(rng.uniform(-120, 150, n), 4)
+    return utc, lat, lon
+
+
+def bench(n):
+    service = AstrologyService()
+    utc, lat, lon = make_births(n)
+    tz = 5.5
+
+    chart_cache.enabled = False  # measure computation, not cache hits
+    t0 = time.perf_counter()
+    for i in range(n):
+        local = utc[i].astype(datetime) + timedelta(hours=tz)
+        service.calculate_planets(lat[i], lon[i], local.year, local.month, local.day,
+                                  local.hour, local.minute, tz)
+    per_row = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    service.calculate_planets_batch(utc, lat, lon)
+    batch = time.perf_counter() - t0
+
+    print(f"births:   {n}")
+    print(f"per-row:  {per_row:.3f}s  ({n / per_row:,.0f} charts/sec)")
+    print(f"batch:    {batch:.3f}s  ({n / batch:,.0f} charts/sec)")
+    print(f"speedup:  {per_row / batch:.2f}x")
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,75 @@
+"""
+Current-dasha evaluation for PROFILES births x DATES as-of dates (one million
+pairs by default) through services/dasha_batch.py, against the per-birth
+paths it replaces: AstrologyService.get_current_dasha (planets + tree per
+call) and a DashaTree per birth with period_at per date, both timed on a
+sample and extrapolated. Spot-checks the batch output against period_at.
+Run with: python3 bench_dasha_batch.py [PROFILES] [DATES] [DEPTH]
+"""
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from kundali_app.services.astrology import AstrologyService
+from kundali_app.services.dasha_batch import combined_periods, current_dashas_batch
+from kundali_app.services.dasha_tree import DashaTree, vimshottari
+
+SAMPLE = 200
+
+
+def births(n, seed=7):
+    rng = random.Random(seed)
+    return [datetime(1940, 1, 1) + timedelta(minutes=rng.randrange(70 * 365 * 1440)) for _ in range(n)], \
+           [rng.uniform(0, 360) for _ in range(n)]
+
+
+def bench(profiles, dates, depth):
+    birth, moon = births(profiles)
+    as_of = [datetime(2026, 1, 1) + timedelta(days=d) for d in range(dates)]
+    pairs = profiles * dates
+    nakshatras = list(vimshottari()["nakshatra_lords"])
+    print(f"{profiles} births x {dates} dates = {pairs} pairs, depth {depth}")
+
+    service = AstrologyService()
+    started = time.perf_counter()
+    for when in birth[:SAMPLE]:
+        service.get_current_dasha(28.6139, 77.2090, when.year, when.month, when.day, when.hour, when.minute,
+                                  as_of_date=as_of[0].strftime("%d-%m-%Y"))
+    per_call = (time.perf_counter() - started) / SAMPLE
+    print(f"  get_current_dasha       {per_call * 1e6:9.1f} us/pair  ~{per_call * pairs:9.1f} s")
+
+    started = time.perf_counter()
+    for i in range(SAMPLE):
+        tree = DashaTree.from_moon(birth[i], moon[i], nakshatras[int(moon[i] // (360 / 27))])
+        for when in as_of:
+            tree.period_at(when, depth)
+    per_pair = (time.perf_counter() - started) / (SAMPLE * dates)
+    print(f"  DashaTree.period_at     {per_pair * 1e6:9.1f} us/pair  ~{per_pair * pairs:9.1f} s")
+
+    birth64 = np.array(birth, dtype="datetime64[s]")
+    as_of64 = np.array(as_of, dtype="datetime64[s]")
+    started = time.perf_counter()
+    table = current_dashas_batch(birth64, moon, as_of64, depth)
+    evaluated = time.perf_counter()
+    combined = combined_periods(table["lords"])
+    done = time.perf_counter()
+    print(f"  current_dashas_batch    {(evaluated - started) / pairs * 1e6:9.3f} us/pair   {evaluated - started:9.2f} s"
+          f"  (+{done - evaluated:.2f} s combined strings)")
+
+    rng = random.Random(1)
+    for _ in range(1000):
+        i, j = rng.randrange(profiles), rng.randrange(dates)
+        tree = DashaTree.from_moon(birth[i], moon[i], nakshatras[int(moon[i] // (360 / 27))])
+        expected = "-".join(period.lord for period in tree.period_at(as_of[j], depth)) or None
+        assert combined[i, j] == expected, (i, j, combined[i, j], expected)
+    print("  1000 random pairs match DashaTree.period_at")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    bench(int(args[0]) if len(args) > 0 else 100_000,
+          int(args[1]) if len(args) > 1 else 10,
+          int(args[2]) if len(args) > 2 else 3)
@@ -0,0 +1,120 @@
+"""
+Concurrent read/write load against a copy of kundali.db: the engine as it
+used to be configured (rollback journal, only check_same_thread=False) against
+db/session.create_db_engine (WAL, synchronous=NORMAL, cache/mmap pragmas,
+TimedQueuePool). Readers load a profile and its positions; writers rewrite a
+profile's positions. The source database is never modified.
+Run with: python3 bench_db.py [SECONDS] [READERS] [WRITERS] [DB_PATH]
+"""
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.orm import sessionmaker
+
+from kundali_app.db.session import Base, create_db_engine, pool_stats, upgrade_schema
+from kundali_app.models import Profile
+from kundali_app.services.positions import load_positions, replace_positions
+
+
+def baseline_engine(url):
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    with engine.connect() as conn:
+        conn.execute(text("PRAGMA journal_mode=DELETE"))
+    return engine
+
+
+def run(engine, seconds, readers, writers):
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    profile_ids = [row.id for row in db.query(Profile.id)]
+    stored = load_positions(db, profile_ids)
+    db.close()
+    if not profile_ids:
+        raise SystemExit("The database has no profiles")
+
+    latencies = {"read": [], "write": []}
+    errors = {"read": 0, "write": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def worker(kind, seed):
+        rng = random.Random(seed)
+        while time.perf_counter() < deadline:
+            profile_id = rng.choice(profile_ids)
+            started = time.perf_counter()
+            db = Session()
+            try:
+                if kind == "read":
+                    db.get(Profile, profile_id)
+                    load_positions(db, [profile_id])
+                else:
+                    rows = [{k: v for k, v in row.items() if k != "id"} for row in stored[profile_id]]
+                    replace_positions(db, rows, [profile_id])
+                    db.commit()
+                elapsed = time.perf_counter() - started
+                with lock:
+                    latencies[kind].append(elapsed)
+            except exc.OperationalError:
+                db.rollback()
+                with lock:
+                    errors[kind] += 1
+            finally:
+                db.close()
+
+    threads = [threading.Thread(target=worker, args=("read", n)) for n in range(readers)]
+    threads += [threading.Thread(target=worker, args=("write", 1000 + n)) for n in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with engine.connect() as conn:
+        journal = conn.execute(text("PRAGMA journal_mode")).scalar()
+    out = {"journal_mode": journal, "pool": pool_stats(engine)}
+    for kind, values in latencies.items():
+        values.sort()
+        out[kind] = {
+            "ops_per_second": round(len(values) / seconds, 1),
+            "p50_ms": round(values[len(values) // 2] * 1000, 2) if values else None,
+            "p99_ms": round(values[int(len(values) * 0.99)] * 1000, 2) if values else None,
+            "errors": errors[kind],
+        }
+    engine.dispose()
+    return out
+
+
+def bench(seconds, readers, writers, source):
+    workdir = tempfile.mkdtemp()
+    try:
+        results = {}
+        for name, make in (("baseline", baseline_engine), ("tuned", create_db_engine)):
+            path = os.path.join(workdir, f"{name}.db")
+            shutil.copyfile(source, path)
+            results[name] = run(make(f"sqlite:///{path}"), seconds, readers, writers)
+    finally:
+        shutil.rmtree(workdir)
+
+    print(f"{readers} readers, {writers} writers, {seconds}s each, source {source}")
+    for name, result in results.items():
+        print(f"{name:9} journal={result['journal_mode']:6} pool={result['pool']['pool']}")
+        for kind in ("read", "write"):
+            r = result[kind]
+            print(f"  {kind:5} {r['ops_per_second']:>9} ops/s  p50 {r['p50_ms']} ms  p99 {r['p99_ms']} ms  errors {r['errors']}")
+        if "wait_ms" in result["pool"]:
+            print(f"  pool checkout wait avg {result['pool']['wait_ms']['avg']} ms  max {result['pool']['wait_ms']['max']} ms")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    bench(float(args[0]) if len(args) > 0 else 10,
+          int(args[1]) if len(args) > 1 else 16,
+          int(args[2]) if len(args) > 2 else 4,
+          args[3] if len(args) > 3 else "kundali.db")
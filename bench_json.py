@@ -0,0 +1,61 @@
+"""
+Serialization time and payload size of the depth-4 Vimshottari dasha tree
+(9 x 9 x 9 x 9 periods): FastAPI's generic path (jsonable_encoder + stdlib
+json), the typed response model (VimshottariDasha, Pydantic dump_json) and
+api/responses.FastJSONResponse (orjson). Also times POST /astro/calculate/dasha
+end to end with KUNDALI_FAST_JSON off and on.
+Run with: python3 bench_json.py [REPEATS]
+"""
+import sys
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from kundali_app.api.responses import FastJSONResponse
+from kundali_app.core.config import settings
+from kundali_app.domain.schemas import VimshottariDasha
+from kundali_app.services.astrology import AstrologyService
+
+BIRTH = (28.6139, 77.2090, 1990, 5, 15, 10, 30, 5.5)
+QUERY = {"dob": "15/05/1990", "tob": "10:30", "lat": 28.6139, "lon": 77.2090, "dasha_depth": 4}
+
+
+def timed(fn, repeats):
+    fn()
+    started = time.perf_counter()
+    for _ in range(repeats):
+        body = fn()
+    return (time.perf_counter() - started) / repeats * 1000, len(body)
+
+
+def bench(repeats):
+    tree = AstrologyService().calculate_dasha_periods_deep(*BIRTH, depth=4)
+    model = TypeAdapter(VimshottariDasha)
+    paths = {
+        "jsonable_encoder + json": lambda: JSONResponse(jsonable_encoder(tree)).body,
+        "response model":          lambda: model.dump_json(model.validate_python(tree), exclude_unset=True),
+        "orjson (fast_json)":      lambda: FastJSONResponse(tree).body,
+    }
+    print(f"depth-4 dasha tree, {repeats} repeats")
+    baseline = None
+    for name, fn in paths.items():
+        ms, size = timed(fn, repeats)
+        baseline = baseline or ms
+        print(f"  {name:24} {ms:8.2f} ms  {size / 1024:7.1f} KiB  {baseline / ms:5.1f}x")
+
+    import os
+    os.environ.setdefault("KUNDALI_WORKER_MODE", "thread")
+    from fastapi.testclient import TestClient
+    from kundali_app.main import app
+    with TestClient(app) as client:
+        print("POST /astro/calculate/dasha?dasha_depth=4 (charts cached after the first call)")
+        for enabled in (False, True):
+            settings.FAST_JSON = enabled
+            ms, size = timed(lambda: client.post("/astro/calculate/dasha", params=QUERY).content, repeats)
+            print(f"  KUNDALI_FAST_JSON={int(enabled)}      {ms:8.2f} ms  {size / 1024:7.1f} KiB")
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
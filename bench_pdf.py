@@ -0,0 +1,81 @@
+"""
+Reports/sec of the PDF report paths:
+
+- plain: the default /download-pdf report (user pages only), as before the
+  illustrated report existed;
+- illustrated, per-report assets: ReportLab draws the full-size PNGs of
+  kundali_app/assets, decoding and compressing them for every report;
+- illustrated, preloaded assets: one ReportLab document per report from the
+  shared, downsampled ImageReaders (generate_direct, the no-pypdf path);
+- illustrated, template + pypdf: only the user pages are rendered, the
+  pre-rendered cover/house pages are merged in;
+- batch: render_batch over a process WorkerPool of WORKERS processes.
+
+Run with: python3 bench_pdf.py [REPORTS] [WORKERS]
+"""
+import os
+import sys
+import time
+
+from reportlab.lib.utils import ImageReader
+
+from kundali_app.services.pdf_generator import ASSET_SIZES, ASSETS_DIR, pdf_generator, render_batch
+from kundali_app.services.workers import WorkerPool, _warm_up
+
+REPORT = {
+    "name": "Asha Rao",
+    "basic_details": {"date_of_birth": "15-05-1990", "time_of_birth": "10:30"},
+    "birth_details": {"lat": 28.6139, "lon": 77.2090},
+    "astrological_details": {"ascendant": "Cancer", "sign": "Aquarius"},
+    "panchang_details": {"nakshatra": "Shatabhisha", "tithi": "Shukla Panchami"},
+    "planets": [{"planet": planet, "sign": "Taurus", "degree_decimal": 12.34, "nakshatra": "Rohini",
+                 "house": house, "is_retrograde": planet == "Saturn"}
+                for house, planet in enumerate(["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus",
+                                                "Saturn", "Rahu", "Ketu"], 1)],
+}
+
+
+def per_report_assets(data):
+    assets = {name: ImageReader(os.path.join(ASSETS_DIR, f"{name}.png")) for name in ASSET_SIZES}
+    return pdf_generator.generate_direct(data, assets=assets)
+
+
+def timed(label, fn, reports, size=None):
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    size = f"  {size / 1024:7.0f} KB/report" if size else ""
+    print(f"  {label:40} {reports / elapsed:8.1f} reports/s{size}")
+    return reports / elapsed
+
+
+def bench(reports, workers):
+    payloads = [dict(REPORT, name=f"Profile {i}") for i in range(reports)]
+    started = time.perf_counter()
+    pdf_generator.preload()
+    print(f"{reports} reports; assets + template prepared once in {time.perf_counter() - started:.2f}s")
+
+    timed("plain", lambda: [pdf_generator.generate(p) for p in payloads], reports,
+          len(pdf_generator.generate(REPORT).getvalue()))
+    before = timed("illustrated, per-report assets", lambda: [per_report_assets(p) for p in payloads], reports,
+                   len(per_report_assets(REPORT).getvalue()))
+    timed("illustrated, preloaded assets", lambda: [pdf_generator.generate_direct(p) for p in payloads], reports,
+          len(pdf_generator.generate_direct(REPORT).getvalue()))
+    after = timed("illustrated, template + pypdf", lambda: [pdf_generator.generate(p, True) for p in payloads],
+                  reports, len(pdf_generator.generate(REPORT, True).getvalue()))
+
+    pool = WorkerPool(workers=workers, queue_size=reports, timeout=120, mode="process", initializer=_warm_up)
+    try:
+        render_batch(payloads[:workers * 2], pool=pool, chunk_size=2)  # start and warm the workers
+        timed(f"plain batch, {workers} processes", lambda: render_batch(payloads, pool=pool), reports)
+        batch = timed(f"illustrated batch, {workers} processes",
+                      lambda: render_batch(payloads, True, pool=pool), reports)
+    finally:
+        pool.shutdown()
+    print(f"  illustrated speedup over per-report assets: {after / before:.1f}x single process, "
+          f"{batch / before:.1f}x batch")
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 100,
+          int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1))
@@ -0,0 +1,106 @@
+"""
+Write and read throughput of PlanetaryPosition storage: one ORM object per
+row against services/positions.py (executemany inserts, batched indexed reads).
+Runs against a scratch SQLite file, not kundali.db.
+Run with: python3 bench_positions.py [N_PROFILES]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from kundali_app.db.session import Base
+from kundali_app.models import PlanetaryPosition
+from kundali_app.services.positions import load_positions, replace_positions
+
+PLANETS = ["Ascendant", "Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Rahu", "Ketu"]
+
+# The ORM path is timed on this many profiles and extrapolated
+ORM_SAMPLE = 2000
+
+# Profiles per replace_positions call while loading the table
+WRITE_BATCH = 1000
+
+READ_PROFILES = 1000
+
+
+def make_rows(profile_id, rng):
+    rows = []
+    for chart_type in ("D1", "D9"):
+        for planet in PLANETS:
+            absolute = rng.uniform(0, 360)
+            rows.append({
+                "profile_id": profile_id, "chart_type": chart_type, "planet": planet,
+                "sign_id": int(absolute // 30) + 1, "degree": absolute % 30, "absolute_degree": absolute,
+                "house": rng.randint(1, 12), "nakshatra_id": rng.randint(1, 27), "nakshatra_pada": rng.randint(1, 4),
+                "is_retrograde": rng.random() < 0.1,
+            })
+    return rows
+
+
+def bench(n):
+    rng = random.Random(7)
+    path = os.path.join(tempfile.mkdtemp(), "bench_positions.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    profile_ids = [f"p{i:07d}" for i in range(n)]
+
+    # Writes: ORM, one add() per row and one commit per profile (as create_profile used to)
+    sample = profile_ids[:min(ORM_SAMPLE, n)]
+    db = Session()
+    t0 = time.perf_counter()
+    for profile_id in sample:
+        for row in make_rows(profile_id, rng):
+            db.add(PlanetaryPosition(**row))
+        db.commit()
+    orm = (time.perf_counter() - t0) / len(sample)
+
+    # Writes: bulk, every profile rewritten through replace_positions
+    t0 = time.perf_counter()
+    for start in range(0, n, WRITE_BATCH):
+        batch = profile_ids[start:start + WRITE_BATCH]
+        replace_positions(db, [row for profile_id in batch for row in make_rows(profile_id, rng)], batch)
+        db.commit()
+    bulk = (time.perf_counter() - t0) / n
+
+    # Reads: one query per profile vs load_positions, with and without the composite index
+    wanted = rng.sample(profile_ids, min(READ_PROFILES, n))
+
+    def per_profile():
+        t = time.perf_counter()
+        for profile_id in wanted:
+            db.query(PlanetaryPosition).filter(PlanetaryPosition.profile_id == profile_id,
+                                               PlanetaryPosition.chart_type == "D1").all()
+        db.expunge_all()
+        return time.perf_counter() - t
+
+    def batched():
+        t = time.perf_counter()
+        load_positions(db, wanted, "D1")
+        return time.perf_counter() - t
+
+    indexed = (per_profile(), batched())
+    db.execute(text("DROP INDEX ix_planetary_positions_profile_chart"))
+    unindexed_batched = batched()
+    unindexed = (per_profile() if n <= 20000 else None, unindexed_batched)
+    rows = db.query(PlanetaryPosition).count()
+    db.close()
+    os.remove(path)
+
+    print(f"profiles: {n}  ({rows:,} position rows)")
+    print(f"write  orm:  {orm * 1000:.3f} ms/profile  (~{orm * n:.1f}s for all, from {len(sample)})")
+    print(f"write  bulk: {bulk * 1000:.3f} ms/profile  ({bulk * n:.1f}s)  speedup {orm / bulk:.1f}x")
+    print(f"read {len(wanted)} profiles, indexed:   per-profile {indexed[0]:.3f}s  batched {indexed[1]:.3f}s")
+    if unindexed[0] is None:
+        print(f"read {len(wanted)} profiles, unindexed: per-profile skipped  batched {unindexed[1]:.3f}s")
+    else:
+        print(f"read {len(wanted)} profiles, unindexed: per-profile {unindexed[0]:.3f}s  batched {unindexed[1]:.3f}s")
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
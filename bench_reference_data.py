@@ -0,0 +1,59 @@
+"""
+Per-call time and file opens of the AstrologyService methods that read
+kundali_app/data (charts, dashas, current dasha, ascendant report, birth
+details), with the ephemeris context built once so only the methods' own
+work is timed (best of ROUNDS). Opens are counted by wrapping builtins.open
+during the calls.
+Run with: python3 bench_reference_data.py [REPEATS]
+"""
+import builtins
+import sys
+import time
+
+from kundali_app.services.astrology import AstrologyService
+
+BIRTH = (28.6139, 77.2090, 1990, 5, 15, 10, 30, 5.5)
+ROUNDS = 5
+
+
+def bench(repeats):
+    service = AstrologyService()
+    ctx = service.build_context(*BIRTH)
+    calls = {
+        "calculate_navamsha_chart": lambda: service.calculate_navamsha_chart(*BIRTH, ctx=ctx),
+        "get_all_charts": lambda: service.get_all_charts(*BIRTH, ctx=ctx),
+        "calculate_vimshottari_dasha": lambda: service.calculate_vimshottari_dasha(*BIRTH, ctx=ctx),
+        "calculate_dasha_periods_deep(3)": lambda: service.calculate_dasha_periods_deep(*BIRTH, depth=3, ctx=ctx),
+        "get_current_dasha": lambda: service.get_current_dasha(*BIRTH, as_of_date="17-10-2026", ctx=ctx),
+        "get_ascendant_report": lambda: service.get_ascendant_report(*BIRTH, ctx=ctx),
+        "calculate_extended_birth_details": lambda: service.calculate_extended_birth_details(*BIRTH, ctx=ctx),
+    }
+    real_open = builtins.open
+    opens = [0]
+
+    def counting_open(*args, **kwargs):
+        opens[0] += 1
+        return real_open(*args, **kwargs)
+
+    print(f"{repeats} calls each, best of {ROUNDS}, ephemeris context prebuilt")
+    total = 0.0
+    for name, fn in calls.items():
+        fn()
+        opens[0] = 0
+        builtins.open = counting_open
+        try:
+            elapsed = float("inf")
+            for _ in range(ROUNDS):
+                started = time.perf_counter()
+                for _ in range(repeats):
+                    fn()
+                elapsed = min(elapsed, (time.perf_counter() - started) / repeats)
+        finally:
+            builtins.open = real_open
+        total += elapsed
+        print(f"  {name:34} {elapsed * 1e6:9.1f} us  {opens[0] / (repeats * ROUNDS):4.1f} file opens/call")
+    print(f"  {'all':34} {total * 1e6:9.1f} us")
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,73 @@
+"""
+"Which profiles start a new antardasha this week": the stored transition
+index (services/dasha_transitions.py, one range scan of
+ix_dasha_transitions_level_start) against sweeping every profile's dasha
+tree. Fills a throwaway SQLite database with PROFILES synthetic profiles.
+Run with: python3 bench_transitions.py [PROFILES] [WINDOW_DAYS]
+"""
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+
+def bench(profiles, window_days):
+    from kundali_app.db.session import Base, SessionLocal, engine
+    from kundali_app.models import Profile
+    from kundali_app.services.dasha_transitions import find_transitions, replace_transitions, transition_mappings
+    from kundali_app.services.dasha_tree import DashaTree, vimshottari
+
+    Base.metadata.create_all(bind=engine)
+    nakshatras = list(vimshottari()["nakshatra_lords"])
+    rng = random.Random(3)
+    births = []
+    for _ in range(profiles):
+        born = datetime(1940, 1, 1) + timedelta(minutes=rng.randrange(70 * 365 * 1440))
+        births.append((str(uuid.uuid4()), born, rng.uniform(0, 360)))
+
+    db = SessionLocal()
+    started = time.perf_counter()
+    rows = []
+    for profile_id, born, moon in births:
+        db.add(Profile(id=profile_id, name="bench", dob=born.date(), tob=born.time(), lat=28.6, lon=77.2))
+        profile = Profile(id=profile_id, dob=born.date(), tob=born.time())
+        rows.extend(transition_mappings(profile, {"planets": [
+            {"planet": "Moon", "absolute_degree": moon, "nakshatra": nakshatras[int(moon // (360 / 27))]}]}))
+    db.flush()
+    replace_transitions(db, rows, [profile_id for profile_id, _, _ in births])
+    db.commit()
+    print(f"{profiles} profiles, {len(rows)} transitions indexed in {time.perf_counter() - started:.1f} s")
+
+    start = datetime(2026, 10, 19)
+    end = start + timedelta(days=window_days)
+    started = time.perf_counter()
+    found = find_transitions(db, start, end, level=2)
+    indexed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    swept = []
+    for profile_id, born, moon in births:
+        tree = DashaTree.from_moon(born.replace(second=0, microsecond=0), moon, nakshatras[int(moon // (360 / 27))])
+        swept.extend(profile_id for period in tree.periods_between(start, end, depth=2)
+                     if start <= period.start_datetime <= end)
+    sweep = time.perf_counter() - started
+    db.close()
+
+    assert sorted(row["profile_id"] for row in found) == sorted(swept)
+    print(f"antardasha starts in {window_days} days: {len(found)} profiles")
+    print(f"  index scan  {indexed * 1000:9.1f} ms")
+    print(f"  tree sweep  {sweep * 1000:9.1f} ms  ({sweep / indexed:.0f}x)")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    workdir = tempfile.mkdtemp()
+    try:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+        bench(int(args[0]) if len(args) > 0 else 20_000, int(args[1]) if len(args) > 1 else 7)
+    finally:
+        shutil.rmtree(workdir)
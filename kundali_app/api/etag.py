@@ -0,0 +1,183 @@
+"""
+ETags and conditional requests for the deterministic chart endpoints.
+
+A response of these routes is fixed by its inputs, so its ETag is derived
+from the inputs alone and checked before the route runs: a matching
+If-None-Match is answered with 304 without computing (or loading) anything.
+Only GET and HEAD are handled (RFC 9110 allows 304 for those alone); POST
+requests pass through untouched.
+
+- Profile routes (/astro/{id}/kundali, /charts, /dashas, ...): the profile's
+  snapshot fingerprint (birth data, ayanamsa, house system, ephemeris
+  backend, ENGINE_VERSION), its display fields and the query string.
+- GET /astro/calculate* (the GET twins of the POST routes; inputs are
+  query parameters): the normalized query,
+  the default ayanamsa, house system, backend, ENGINE_VERSION and the
+  reference data version.
+
+Routes that evaluate the current instant get no ETag unless a parameter
+pins it: current dasha (down to sookshma periods of a few hours) without
+`as_of_date`, and dasha periods without `start`. Only 200 responses get an
+ETag.
+"""
+import hashlib
+import json
+import re
+import threading
+from urllib.parse import parse_qsl
+
+from kundali_app.core.config import settings
+
+# (route name, path pattern) of GET routes; profile routes capture the profile id.
+# /calculate* come first: the profile patterns would also match "calculate" as an id.
+CACHEABLE_ROUTES = [
+    ("calculate", re.compile(r"^/astro/calculate$")),
+    ("calculate_full", re.compile(r"^/astro/calculate/full$")),
+    ("calculate_charts", re.compile(r"^/astro/calculate/charts$")),
+    ("calculate_dasha", re.compile(r"^/astro/calculate/dasha$")),
+    ("calculate_dasha_current", re.compile(r"^/astro/calculate/dasha/current$")),
+    ("calculate_dasha_periods", re.compile(r"^/astro/calculate/dasha/periods$")),
+    ("calculate_ascendant_report", re.compile(r"^/astro/calculate/ascendant-report$")),
+    ("profile_kundali", re.compile(r"^/astro/(?P<profile_id>[^/]+)/kundali$")),
+    ("profile_birth_details", re.compile(r"^/astro/(?P<profile_id>[^/]+)/birth_details$")),
+    ("profile_planets_detailed", re.compile(r"^/astro/(?P<profile_id>[^/]+)/planets_detailed$")),
+    ("profile_charts", re.compile(r"^/astro/(?P<profile_id>[^/]+)/charts$")),
+    ("profile_chart", re.compile(r"^/astro/(?P<profile_id>[^/]+)/chart/[^/]+$")),
+    ("profile_dashas", re.compile(r"^/astro/(?P<profile_id>[^/]+)/dashas$")),
+    ("profile_dasha_current", re.compile(r"^/astro/(?P<profile_id>[^/]+)/dasha/current$")),
+    ("profile_dasha_periods", re.compile(r"^/astro/(?P<profile_id>[^/]+)/dasha/periods$")),
+    ("profile_ascendant_report", re.compile(r"^/astro/(?P<profile_id>[^/]+)/ascendant-report$")),
+]
+
+# Routes that evaluate the current time unless the named parameter pins it; not cacheable then
+NOW_DEPENDENT = {
+    "profile_dasha_current": "as_of_date",
+    "calculate_dasha_current": "as_of_date",
+    "calculate_full": "as_of_date",  # only with the current_dasha section
+    "profile_dasha_periods": "start",
+    "calculate_dasha_periods": "start",
+}
+
+# Profile columns shown in responses besides the chart data
+PROFILE_DISPLAY_FIELDS = ("name", "gender", "location_name", "grandfather_name", "father_name",
+                          "mother_name", "caste", "gotra")
+
+
+def _normalize(value):
+    value = value.strip()
+    try:
+        return repr(float(value))  # 28.60 and 28.6 are the same input
+    except ValueError:
+        return value.lower()
+
+
+def normalized_query(query_string):
+    return sorted((key, _normalize(value)) for key, value in parse_qsl(query_string, keep_blank_values=True))
+
+
+def _evaluates_now(route, params):
+    pin = NOW_DEPENDENT.get(route)
+    if pin is None or params.get(pin):
+        return False
+    if route == "calculate_full":
+        sections = [name.strip() for name in params.get("sections", "").split(",") if name.strip()]
+        return not sections or "current_dasha" in sections
+    return True
+
+
+def make_etag(*parts):
+    return '"' + hashlib.sha1(json.dumps(parts, default=str).encode()).hexdigest() + '"'
+
+
+def _matches(if_none_match, etag):
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+class HttpCacheStats:
+    """Per-route counters of conditional requests answered with 304."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def record(self, route, hit):
+        with self._lock:
+            counts = self._routes.setdefault(route, {"requests": 0, "not_modified": 0})
+            counts["requests"] += 1
+            counts["not_modified"] += hit
+
+    def stats(self):
+        with self._lock:
+            return {
+                route: {**counts, "hit_ratio": round(counts["not_modified"] / counts["requests"], 4)}
+                for route, counts in sorted(self._routes.items())
+            }
+
+
+http_cache_stats = HttpCacheStats()
+
+
+class ETagMiddleware:
+    """ASGI middleware adding ETag/Cache-Control to CACHEABLE_ROUTES and answering If-None-Match."""
+
+    def __init__(self, app, max_age=0):
+        self.app = app
+        self.cache_control = f"private, max-age={max_age}, must-revalidate" if max_age else "private, no-cache"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            return await self.app(scope, receive, send)
+        route = match = None
+        for name, pattern in CACHEABLE_ROUTES:
+            match = pattern.match(scope["path"])
+            if match:
+                route = name
+                break
+        if route is None:
+            return await self.app(scope, receive, send)
+
+        etag = await self._etag(route, match, scope)
+        if etag is None:  # e.g. unknown profile, or "now" queries: let the route answer
+            return await self.app(scope, receive, send)
+
+        headers = dict((k.decode("latin-1"), v.decode("latin-1")) for k, v in scope["headers"])
+        hit = _matches(headers.get("if-none-match", ""), etag)
+        http_cache_stats.record(route, hit)
+        cache_headers = [(b"etag", etag.encode()), (b"cache-control", self.cache_control.encode())]
+        if hit:
+            await send({"type": "http.response.start", "status": 304, "headers": cache_headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_etag(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                message = {**message, "headers": [*message.get("headers", []), *cache_headers]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
+
+    async def _etag(self, route, match, scope):
+        query = normalized_query(scope.get("query_string", b"").decode("latin-1"))
+        params = dict(query)
+        if _evaluates_now(route, params):
+            return None
+        if "profile_id" not in match.groupdict():
+            from kundali_app.services.reference_data import registry as reference_data
+            from kundali_app.services.snapshots import ENGINE_VERSION
+            return make_etag(route, query, ENGINE_VERSION, reference_data.get().version,
+                             settings.AYANAMSA_MODE, settings.HOUSE_SYSTEM, settings.EPHEMERIS_BACKEND)
+
+        from kundali_app.db.session import get_async_sessionmaker
+        from kundali_app.models import Profile
+        from kundali_app.services.snapshots import fingerprint
+        async with get_async_sessionmaker()() as db:
+            profile = await db.get(Profile, match["profile_id"])
+        if profile is None:
+            return None
+        try:
+            chart_inputs = fingerprint(profile)
+        except ValueError:  # e.g. a stored ayanamsa no longer in the registry
+            return None
+        display = [getattr(profile, field) for field in PROFILE_DISPLAY_FIELDS]
+        return make_etag(route, scope["path"], query, chart_inputs, display)
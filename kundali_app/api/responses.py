@@ -0,0 +1,51 @@
+"""
+Fast JSON responses for large chart and dasha payloads.
+
+Routes opt in by returning `fast_json(content)`. A Response returned from a
+route is sent as is, so FastAPI skips both its jsonable_encoder walk and
+response-model serialization; FastJSONResponse then encodes the content
+with orjson in one pass. Without orjson (or with KUNDALI_FAST_JSON=0),
+`fast_json` returns the content unchanged and the route's response_model,
+if any, serializes it. Streamed NDJSON lines go through `ndjson_line`.
+"""
+import json
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from kundali_app.core.config import settings
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY if orjson else 0
+
+
+def _default(obj):
+    # Types orjson does not know natively (e.g. Decimal, Enum members of
+    # other types); FastAPI's encoder rules apply
+    return jsonable_encoder(obj)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered by orjson (stdlib json through jsonable_encoder without it)."""
+
+    def render(self, content):
+        if orjson is None:
+            return super().render(jsonable_encoder(content))
+        return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+def fast_json(content, status_code=200):
+    if not settings.FAST_JSON or orjson is None:
+        return content
+    return FastJSONResponse(content, status_code=status_code)
+
+
+def ndjson_line(content):
+    """One NDJSON line of `content` (bytes), encoded like FastJSONResponse."""
+    if not settings.FAST_JSON or orjson is None:
+        return (json.dumps(jsonable_encoder(content)) + "\n").encode()
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS) + b"\n"
@@ -1,52 +1,189 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import StreamingResponse
-from typing import Dict, Any
-from kundali_app.services.pdf_generator import pdf_generator
+from typing import Dict, Any, List
+from datetime import datetime, timedelta
+from kundali_app.api.responses import fast_json, ndjson_line
+from kundali_app.domain.schemas import DashaBatchRequest, VimshottariDasha
+from kundali_app.services.tasks import call_service, current_dasha_rows, panchang_events, render_pdf
+from kundali_app.services.workers import PoolBusy, PoolTimeout, worker_pool
+from kundali_app.services.positions import load_positions_async
+from kundali_app.services.profile_charts import ACTIVE
+from kundali_app.services.dasha_tree import parse_date as parse_dasha_date
+from kundali_app.services.dasha_transitions import TRANSITION_DEPTH, find_transitions_async
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from kundali_app.db.session import get_db
-from kundali_app.models import Profile, PlanetaryPosition, ChartType
+from kundali_app.db.session import get_async_db, get_db
+from kundali_app.models import Profile, ChartType
 
 router = APIRouter()
 
+# GET twins of the deterministic /calculate* routes (query parameters only), so
+# clients can revalidate them with If-None-Match (api/etag.py). main.py includes
+# this router ahead of `router`, where /{profile_id}/... would match them first.
+calculate_router = APIRouter()
+
+def _service(ayanamsa=None):
+    """AstrologyService for one request; an unknown ayanamsa becomes a 400."""
+    from kundali_app.services.astrology import AstrologyService
+    try:
+        return AstrologyService(ayanamsa=ayanamsa)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _pool_error(e):
+    if isinstance(e, PoolBusy):
+        return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    return HTTPException(status_code=504, detail=str(e))
+
+def _run(fn, *args, **kwargs):
+    """Run `fn` on the worker pool; a full pool is a 503, a timeout a 504."""
+    try:
+        return worker_pool.run(fn, *args, **kwargs)
+    except (PoolBusy, PoolTimeout) as e:
+        raise _pool_error(e)
+
+def _compute(service, method, *args, **kwargs):
+    """service.<method>(...) evaluated on the worker pool."""
+    return _run(call_service, service.ayanamsa_mode, method, *args, **kwargs)
+
+def _get_profile(db, profile_id):
+    profile = db.query(Profile).filter(Profile.id == profile_id).first()
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return profile
+
+def _parse_birth(dob, tob):
+    from kundali_app.services.astrology import AstrologyService
+    try:
+        return AstrologyService.parse_birth(dob, tob)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _full(service, lat, lon, year, month, day, hour, minute, timezone, sections, **options):
+    """AstrologyService.calculate_full on the worker pool; bad sections or dates are a 400."""
+    try:
+        return _compute(service, "calculate_full", lat, lon, year, month, day, hour, minute, timezone,
+                        sections=sections, **options)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _full_adhoc(dob, tob, lat, lon, timezone, ayanamsa, sections, **options):
+    return _full(_service(ayanamsa), lat, lon, *_parse_birth(dob, tob), timezone, sections, **options)
+
+def _full_profile(profile, sections, **options):
+    return _full(
+        _service(profile.ayanamsa), profile.lat, profile.lon,
+        profile.dob.year, profile.dob.month, profile.dob.day,
+        profile.tob.hour, profile.tob.minute, 5.5,  # Profiles have no timezone yet
+        sections, place=profile.location_name, **options
+    )
+
+# Snapshot keys that make up the /kundali response
+KUNDALI_KEYS = ("basic_details", "panchang_details", "ghat_chakra", "astrological_details", "planets", "dasha_balance")
+
+def _snapshot(db, profile):
+    """The profile's materialized charts, built on the worker pool when missing or stale."""
+    from kundali_app.services.snapshots import get_snapshot
+    try:
+        return get_snapshot(db, profile, run=worker_pool.run)
+    except (PoolBusy, PoolTimeout) as e:
+        raise _pool_error(e)
+
+def _view(full):
+    """A calculate_full result without its timings, for the single-purpose endpoints."""
+    full.pop("timings_ms", None)
+    return full
+
+MAX_PANCHANG_RANGE_DAYS = 366 * 5
+
+def _month_pieces(start_date, end_date):
+    """(first, last) dates of each calendar month of start_date..end_date, clipped to the range."""
+    while start_date <= end_date:
+        next_month = (start_date.replace(day=1) + timedelta(days=32)).replace(day=1)
+        yield start_date, min(end_date, next_month - timedelta(days=1))
+        start_date = next_month
+
+def _merge_cache_stats(reports, cache):
+    """One cache's counters summed over the worker processes' reports."""
+    parts = [report[cache] for report in reports]
+    hits, misses = sum(p["hits"] for p in parts), sum(p["misses"] for p in parts)
+    return {**parts[0], "size": sum(p["size"] for p in parts), "hits": hits, "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0, "processes": len(parts)}
+
+@router.get("/cache/stats")
+def get_cache_stats():
+    """
+    Hit/miss counters and occupancy of the chart and sunrise caches, summed
+    over the worker processes that compute charts (each as of its latest
+    task; size and maxsize are per process), the per-route share of
+    conditional requests answered with 304 and the loaded reference data
+    version.
+    """
+    from kundali_app.api.etag import http_cache_stats
+    from kundali_app.services.reference_data import registry as reference_data
+    from kundali_app.services.tasks import cache_stats
+    if worker_pool.mode == "process":
+        reports = list(worker_pool.worker_reports().values()) or [cache_stats()]
+    else:
+        reports = [cache_stats()]  # worker threads share this process's caches
+    return {"charts": _merge_cache_stats(reports, "charts"), "sun_times": _merge_cache_stats(reports, "sun_times"),
+            "http": http_cache_stats.stats(), "reference_data": reference_data.stats()}
+
+@router.get("/workers/stats")
+def get_worker_stats():
+    """
+    Queue depth, wait and execution times of the CPU-bound worker pool.
+    """
+    return worker_pool.stats()
+
+@router.get("/db/stats")
+def get_db_stats():
+    """
+    Connection pool occupancy and checkout wait times of the database engine.
+    """
+    from kundali_app.db import session
+    stats = session.pool_stats()
+    stats["async"] = session.pool_stats(session.async_engine) if session.async_engine is not None else None
+    return stats
+
+# Profiles per /planets request
+PLANETS_BATCH_LIMIT = 1000
+
+@router.get("/planets")
+async def get_planets_batch(ids: str, chart: str = "D1", db: AsyncSession = Depends(get_async_db)):
+    """
+    Stored planetary positions of many profiles in one query.
+    `ids` is a comma-separated list of profile ids; returns {profile_id: [positions]}.
+    """
+    profile_ids = list(dict.fromkeys(pid.strip() for pid in ids.split(",") if pid.strip()))
+    if not profile_ids or len(profile_ids) > PLANETS_BATCH_LIMIT:
+        raise HTTPException(status_code=400, detail=f"Pass between 1 and {PLANETS_BATCH_LIMIT} profile ids")
+    return await load_positions_async(db, profile_ids, chart)
+
 @router.get("/{profile_id}/planets")
-def get_planets(profile_id: str, chart: str = "D1", db: Session = Depends(get_db)):
+async def get_planets(profile_id: str, chart: str = "D1", db: AsyncSession = Depends(get_async_db)):
     """
     Get planetary positions for a specific chart (D1, D9, etc.)
     """
-    positions = db.query(PlanetaryPosition).filter(
-        PlanetaryPosition.profile_id == profile_id,
-        PlanetaryPosition.chart_type == chart
-    ).all()
+    positions = (await load_positions_async(db, [profile_id], chart))[profile_id]
     
     if not positions and chart == "D1":
-        raise HTTPException(status_code=404, detail="No planetary data found. Profile might still be processing.")
+        status = await db.scalar(select(Profile.chart_status).where(Profile.id == profile_id))
+        if status in ACTIVE:
+            raise HTTPException(status_code=404, detail=f"No planetary data yet; charts are {status}. See /profiles/{profile_id}/status.")
+        raise HTTPException(status_code=404, detail="No planetary data found.")
         
     return positions
 
-@router.get("/{profile_id}/dashas")
-def get_dashas(profile_id: str, db: Session = Depends(get_db)):
-    # Placeholder for Dasha Logic which would be computed on the fly or stored
-    # For now, return static not implemented or compute on fly using AstrologyService
-    return {"message": "Dasha calculation endpoint"}
-
 @router.get("/{profile_id}/birth_details")
 def get_birth_details(profile_id: str, db: Session = Depends(get_db)):
     """
     Get comprehensive Birth Particulars and Panchang details.
     """
-    profile = db.query(Profile).filter(Profile.id == profile_id).first()
-    if not profile:
-        raise HTTPException(status_code=404, detail="Profile not found")
-        
-    # Instantiate Service (or DI)
-    from kundali_app.services.astrology import AstrologyService
-    service = AstrologyService()
+    profile = _get_profile(db, profile_id)
+    details = _snapshot(db, profile)["birth_details"]
     
-    details = service.calculate_extended_birth_details(
-        lat=profile.lat, lon=profile.lon,
-        year=profile.dob.year, month=profile.dob.month, day=profile.dob.day,
-        hour=profile.tob.hour, minute=profile.tob.minute, timezone=5.5 # Hardcoded for now, add to Profile model in future
-    )
     # Inject Profile Specifics
     details['birth_particulars']['sex'] = profile.gender
     details['birth_particulars']['place'] = profile.location_name or "Unknown"
@@ -60,28 +197,62 @@ def get_birth_details(profile_id: str, db: Session = Depends(get_db)):
         "gotra": profile.gotra
     }
     
-    return details
+    return fast_json(details)
 
 @router.get("/{profile_id}/planets_detailed")
 def get_planets_detailed(profile_id: str, db: Session = Depends(get_db)):
     """
     Get comprehensive planetary positions with Sign Lord, Nakshatra, Nakshatra Lord, etc.
-    This endpoint calculates fresh data rather than reading from DB.
+    Served from the profile's chart snapshot.
     """
-    profile = db.query(Profile).filter(Profile.id == profile_id).first()
-    if not profile:
-        raise HTTPException(status_code=404, detail="Profile not found")
-    
-    from kundali_app.services.astrology import AstrologyService
-    service = AstrologyService()
-    
-    planets = service._calculate_planets_full(
-        lat=profile.lat, lon=profile.lon,
-        year=profile.dob.year, month=profile.dob.month, day=profile.dob.day,
-        hour=profile.tob.hour, minute=profile.tob.minute, timezone=5.5
+    return fast_json({"planets": _snapshot(db, _get_profile(db, profile_id))["planets"]})
+
+@router.get("/panchang/range")
+def get_panchang_range(
+    start: str,  # DD/MM/YYYY
+    end: str,    # DD/MM/YYYY
+    lat: float,
+    lon: float,
+    timezone: float = 5.5,
+    ayanamsa: str = None
+):
+    """
+    Stream a daily panchang calendar for one location as NDJSON: sunrise/sunset
+    and every tithi, nakshatra, yoga and karana transition, in time order.
+
+    The range is swept one calendar month per worker pool task, each streamed
+    as it completes. A full pool or a timeout on the first month is a 503/504;
+    later on, the headers are sent already, so the stream ends with an
+    {"event": "error"} line instead.
+    """
+    try:
+        start_date = datetime.strptime(start, "%d/%m/%Y").date()
+        end_date = datetime.strptime(end, "%d/%m/%Y").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="start and end must be DD/MM/YYYY")
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    if (end_date - start_date).days > MAX_PANCHANG_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range is limited to {MAX_PANCHANG_RANGE_DAYS} days")
+    
+    service = _service(ayanamsa)
+    pieces = _month_pieces(start_date, end_date)
+    first = _run(panchang_events, service.ayanamsa_mode, lat, lon, *next(pieces), timezone)
+
+    def events():
+        yield from first
+        for piece_start, piece_end in pieces:
+            try:
+                yield from worker_pool.run(panchang_events, service.ayanamsa_mode, lat, lon,
+                                           piece_start, piece_end, timezone, start_event=False)
+            except (PoolBusy, PoolTimeout) as e:
+                yield {"event": "error", "detail": str(e)}
+                return
+
+    return StreamingResponse(
+        (ndjson_line(event) for event in events()),
+        media_type="application/x-ndjson"
     )
-    
-    return {"planets": planets}
 
 @router.get("/{profile_id}/kundali")
 def get_kundali(profile_id: str, db: Session = Depends(get_db)):
@@ -93,100 +264,10 @@ def get_kundali(profile_id: str, db: Session = Depends(get_db)):
     - Astrological Details (Sign, Sign Lord, Nakshatra, Nakshatra Lord, Charan, Tatva, etc.)
     - Planetary Positions
     """
-    profile = db.query(Profile).filter(Profile.id == profile_id).first()
-    if not profile:
-        raise HTTPException(status_code=404, detail="Profile not found")
-    
-    from kundali_app.services.astrology import AstrologyService
-    service = AstrologyService()
-    
-    # Get all birth details
-    details = service.calculate_extended_birth_details(
-        lat=profile.lat, lon=profile.lon,
-        year=profile.dob.year, month=profile.dob.month, day=profile.dob.day,
-        hour=profile.tob.hour, minute=profile.tob.minute, timezone=5.5
-    )
-    
-    # Get planets
-    planets = service._calculate_planets_full(
-        lat=profile.lat, lon=profile.lon,
-        year=profile.dob.year, month=profile.dob.month, day=profile.dob.day,
-        hour=profile.tob.hour, minute=profile.tob.minute, timezone=5.5
-    )
-    
-    # Calculate Prahar (3-hour periods from sunrise)
-    from datetime import datetime, timedelta
-    birth_hour = profile.tob.hour + profile.tob.minute / 60.0
-    # Assuming sunrise ~5:30 for now (should use actual sunrise)
-    sunrise_hour = 5.5  # Approx
-    prahar = int((birth_hour - sunrise_hour) / 3) + 1
-    if prahar < 1: prahar = 8 + prahar
-    
-    # Calculate Day Lord (based on weekday)
-    day_lords = ["Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Sun"]
-    day_lord = day_lords[profile.dob.weekday()]
-    
-    # Find Moon and Ascendant for astrological details
-    moon_data = next((p for p in planets if p["planet"] == "Moon"), None)
-    asc_data = next((p for p in planets if p["planet"] == "Ascendant"), None)
-    
-    # Tatva (Element) mapping
-    tatva_map = {
-        "Aries": "Fire", "Leo": "Fire", "Sagittarius": "Fire",
-        "Taurus": "Earth", "Virgo": "Earth", "Capricorn": "Earth",
-        "Gemini": "Air", "Libra": "Air", "Aquarius": "Air",
-        "Cancer": "Water", "Scorpio": "Water", "Pisces": "Water"
-    }
-    
-    # Yunja (odd/even pada)
-    yunja = "Poorva" if moon_data and moon_data["nakshatra_pada"] <= 2 else "Uttara"
-    
-    return {
-        "basic_details": {
-            "date_of_birth": profile.dob.strftime("%d/%m/%Y"),
-            "time_of_birth": profile.tob.strftime("%H:%M"),
-            "place_of_birth": profile.location_name or "Unknown",
-            "latitude": details["birth_particulars"]["lat"],
-            "longitude": details["birth_particulars"]["lon"],
-            "timezone": "+05:30",
-            "ayanamsha": details["sun_moon_params"]["ayanamsha"],
-            "sunrise": details["sun_moon_params"]["sunrise"],
-            "sunset": details["sun_moon_params"]["sunset"]
-        },
-        "panchang_details": {
-            "month": details["tamil_calendar"]["tamil_month"],
-            "tithi": details["panchang"]["tithi"]["at_birth"],
-            "day": day_lord,
-            "nakshatra": details["panchang"]["nakshatra"]["at_birth"],
-            "yog": details["panchang"]["yoga"]["at_birth"],
-            "karan": details["panchang"]["karana"]["at_birth"],
-            "prahar": prahar,
-            "moon_sign": moon_data["sign"] if moon_data else "Unknown"
-        },
-        "ghat_chakra": {
-            "varna": details["avakhada_chakra"]["varna"],
-            "vashya": details["avakhada_chakra"]["vashya"],
-            "yoni": details["avakhada_chakra"]["yoni"],
-            "gan": details["avakhada_chakra"]["gana"],
-            "nadi": details["avakhada_chakra"]["nadi"]
-        },
-        "astrological_details": {
-            "sign": moon_data["sign"] if moon_data else "Unknown",
-            "sign_lord": moon_data["sign_lord"] if moon_data else "Unknown",
-            "nakshatra": moon_data["nakshatra"] if moon_data else "Unknown",
-            "nakshatra_lord": moon_data["nakshatra_lord"] if moon_data else "Unknown",
-            "charan": moon_data["nakshatra_pada"] if moon_data else 0,
-            "yunja": yunja,
-            "tatva": tatva_map.get(moon_data["sign"], "Unknown") if moon_data else "Unknown",
-            "name_alphabet": details["avakhada_chakra"]["naamakshar"],
-            "paya": details["avakhada_chakra"]["paya_nakshatra"],
-            "ascendant": asc_data["sign"] if asc_data else "Unknown",
-            "ascendant_lord": asc_data["sign_lord"] if asc_data else "Unknown"
-        },
-        "planets": planets,
-        "dasha_balance": details["sun_moon_params"]["dasha_balance"]
-    }
+    snapshot = _snapshot(db, _get_profile(db, profile_id))
+    return fast_json({key: snapshot[key] for key in KUNDALI_KEYS})
 
+@calculate_router.get("/calculate")
 @router.post("/calculate")
 def calculate_kundali_adhoc(
     dob: str,  # Format: DD/MM/YYYY
@@ -194,107 +275,40 @@ def calculate_kundali_adhoc(
     lat: float,
     lon: float,
     place: str = "Unknown",
-    timezone: float = 5.5
+    timezone: float = 5.5,
+    ayanamsa: str = None
 ):
     """
     Calculate Kundali without storing in database.
     Useful for quick calculations or testing.
     """
-    from datetime import datetime
-    from kundali_app.services.astrology import AstrologyService
-    
-    # Parse date and time
-    dob_parts = dob.split("/")
-    tob_parts = tob.split(":")
-    
-    day = int(dob_parts[0])
-    month = int(dob_parts[1])
-    year = int(dob_parts[2])
-    hour = int(tob_parts[0])
-    minute = int(tob_parts[1])
-    
-    service = AstrologyService()
-    
-    # Get birth details
-    details = service.calculate_extended_birth_details(
-        lat=lat, lon=lon,
-        year=year, month=month, day=day,
-        hour=hour, minute=minute, timezone=timezone
-    )
-    
-    # Get planets
-    planets = service._calculate_planets_full(
-        lat=lat, lon=lon,
-        year=year, month=month, day=day,
-        hour=hour, minute=minute, timezone=timezone
-    )
-    
-    # Day Lord
-    birth_dt = datetime(year, month, day)
-    day_lords = ["Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Sun"]
-    day_lord = day_lords[birth_dt.weekday()]
-    
-    # Prahar
-    sunrise_hour = 5.5
-    prahar = int((hour + minute/60.0 - sunrise_hour) / 3) + 1
-    if prahar < 1: prahar = 8 + prahar
-    
-    # Moon and Ascendant
-    moon_data = next((p for p in planets if p["planet"] == "Moon"), None)
-    asc_data = next((p for p in planets if p["planet"] == "Ascendant"), None)
-    
-    tatva_map = {
-        "Aries": "Fire", "Leo": "Fire", "Sagittarius": "Fire",
-        "Taurus": "Earth", "Virgo": "Earth", "Capricorn": "Earth",
-        "Gemini": "Air", "Libra": "Air", "Aquarius": "Air",
-        "Cancer": "Water", "Scorpio": "Water", "Pisces": "Water"
-    }
-    yunja = "Poorva" if moon_data and moon_data["nakshatra_pada"] <= 2 else "Uttara"
-    
-    return {
-        "basic_details": {
-            "date_of_birth": dob,
-            "time_of_birth": tob,
-            "place_of_birth": place,
-            "latitude": service.decimal_to_dms(lat),
-            "longitude": service.decimal_to_dms(lon),
-            "timezone": f"+{int(timezone):02d}:{int((timezone%1)*60):02d}",
-            "ayanamsha": details["sun_moon_params"]["ayanamsha"],
-            "sunrise": details["sun_moon_params"]["sunrise"],
-            "sunset": details["sun_moon_params"]["sunset"]
-        },
-        "panchang_details": {
-            "month": details["tamil_calendar"]["tamil_month"],
-            "tithi": details["panchang"]["tithi"]["at_birth"],
-            "day": day_lord,
-            "nakshatra": details["panchang"]["nakshatra"]["at_birth"],
-            "yog": details["panchang"]["yoga"]["at_birth"],
-            "karan": details["panchang"]["karana"]["at_birth"],
-            "prahar": prahar
-        },
-        "ghat_chakra": {
-            "varna": details["avakhada_chakra"]["varna"],
-            "vashya": details["avakhada_chakra"]["vashya"],
-            "yoni": details["avakhada_chakra"]["yoni"],
-            "gan": details["avakhada_chakra"]["gana"],
-            "nadi": details["avakhada_chakra"]["nadi"]
-        },
-        "astrological_details": {
-            "sign": moon_data["sign"] if moon_data else "Unknown",
-            "sign_lord": moon_data["sign_lord"] if moon_data else "Unknown",
-            "nakshatra": moon_data["nakshatra"] if moon_data else "Unknown",
-            "nakshatra_lord": moon_data["nakshatra_lord"] if moon_data else "Unknown",
-            "charan": moon_data["nakshatra_pada"] if moon_data else 0,
-            "yunja": yunja,
-            "tatva": tatva_map.get(moon_data["sign"], "Unknown") if moon_data else "Unknown",
-            "name_alphabet": details["avakhada_chakra"]["naamakshar"],
-            "paya": details["avakhada_chakra"]["paya_nakshatra"],
-            "ascendant": asc_data["sign"] if asc_data else "Unknown",
-            "ascendant_lord": asc_data["sign_lord"] if asc_data else "Unknown"
-        },
-        "planets": planets,
-        "dasha_balance": details["sun_moon_params"]["dasha_balance"]
-    }
+    return fast_json(_view(_full_adhoc(dob, tob, lat, lon, timezone, ayanamsa, ("basic", "panchang"), place=place)))
+
+@calculate_router.get("/calculate/full")
+@router.post("/calculate/full")
+def calculate_full_adhoc(
+    dob: str,  # DD/MM/YYYY
+    tob: str,  # HH:MM
+    lat: float,
+    lon: float,
+    place: str = "Unknown",
+    timezone: float = 5.5,
+    ayanamsa: str = None,
+    sections: str = None,
+    dasha_depth: int = Query(2, ge=1, le=4),
+    as_of_date: str = None
+):
+    """
+    Any combination of kundali sections from one ephemeris pass, in place of
+    separate calls to /calculate, /calculate/charts, /calculate/dasha,
+    /calculate/dasha/current and /calculate/ascendant-report.
+    `sections` is comma-separated: basic, panchang, charts, dasha,
+    current_dasha, ascendant_report (default: all). Per-section compute
+    time is reported under "timings_ms".
+    """
+    selected = [name.strip() for name in sections.split(",") if name.strip()] if sections else None
+    return fast_json(_full_adhoc(dob, tob, lat, lon, timezone, ayanamsa, selected, place=place,
+                       dasha_depth=dasha_depth, as_of_date=as_of_date))
 
 # ============ CHART ENDPOINTS ============
 
@@ -304,100 +318,57 @@ def get_all_charts(profile_id: str, db: Session = Depends(get_db)):
     Get all horoscope charts: Lagna (D1), Moon, and Navamsha (D9).
     Returns house-wise planet placement with descriptions.
     """
-    profile = db.query(Profile).filter(Profile.id == profile_id).first()
-    if not profile:
-        raise HTTPException(status_code=404, detail="Profile not found")
-    
-    from kundali_app.services.astrology import AstrologyService
-    service = AstrologyService()
-    
-    return service.get_all_charts(
-        lat=profile.lat, lon=profile.lon,
-        year=profile.dob.year, month=profile.dob.month, day=profile.dob.day,
-        hour=profile.tob.hour, minute=profile.tob.minute, timezone=5.5
-    )
+    return fast_json(_snapshot(db, _get_profile(db, profile_id))["charts"])
 
 @router.get("/{profile_id}/chart/{chart_type}")
 def get_chart(profile_id: str, chart_type: str, db: Session = Depends(get_db)):
     """
     Get specific chart: D1 (Lagna), Moon, or D9 (Navamsha).
     """
-    profile = db.query(Profile).filter(Profile.id == profile_id).first()
-    if not profile:
-        raise HTTPException(status_code=404, detail="Profile not found")
-    
-    from kundali_app.services.astrology import AstrologyService
-    service = AstrologyService()
-    
     chart_type_upper = chart_type.upper()
     
     if chart_type_upper in ["D1", "LAGNA"]:
-        return service.calculate_lagna_chart(
-            lat=profile.lat, lon=profile.lon,
-            year=profile.dob.year, month=profile.dob.month, day=profile.dob.day,
-            hour=profile.tob.hour, minute=profile.tob.minute, timezone=5.5
-        )
+        key = "lagna_chart"
     elif chart_type_upper in ["MOON", "CHANDRA"]:
-        return service.calculate_moon_chart(
-            lat=profile.lat, lon=profile.lon,
-            year=profile.dob.year, month=profile.dob.month, day=profile.dob.day,
-            hour=profile.tob.hour, minute=profile.tob.minute, timezone=5.5
-        )
+        key = "moon_chart"
     elif chart_type_upper in ["D9", "NAVAMSHA"]:
-        return service.calculate_navamsha_chart(
-            lat=profile.lat, lon=profile.lon,
-            year=profile.dob.year, month=profile.dob.month, day=profile.dob.day,
-            hour=profile.tob.hour, minute=profile.tob.minute, timezone=5.5
-        )
+        key = "navamsha_chart"
     else:
         raise HTTPException(status_code=400, detail=f"Unknown chart type: {chart_type}. Valid: D1, Moon, D9")
+    
+    chart = _snapshot(db, _get_profile(db, profile_id))["charts"][key]
+    chart.pop("description", None)
+    return fast_json(chart)
 
+@calculate_router.get("/calculate/charts")
 @router.post("/calculate/charts")
 def calculate_charts_adhoc(
     dob: str,  # DD/MM/YYYY
     tob: str,  # HH:MM
     lat: float,
     lon: float,
-    timezone: float = 5.5
+    timezone: float = 5.5,
+    ayanamsa: str = None
 ):
     """
     Calculate all charts without storing in database.
     """
-    from datetime import datetime
-    from kundali_app.services.astrology import AstrologyService
-    
-    dob_parts = dob.split("/")
-    tob_parts = tob.split(":")
-    
-    day = int(dob_parts[0])
-    month = int(dob_parts[1])
-    year = int(dob_parts[2])
-    hour = int(tob_parts[0])
-    minute = int(tob_parts[1])
-    
-    service = AstrologyService()
-    
-    return service.get_all_charts(lat, lon, year, month, day, hour, minute, timezone)
+    return fast_json(_full_adhoc(dob, tob, lat, lon, timezone, ayanamsa, ("charts",))["charts"])
 
 # ============ DASHA ENDPOINTS ============
 
-@router.get("/{profile_id}/dashas")
+# response_model=VimshottariDasha documents the dasha table in OpenAPI. The
+# routes return fast_json(...), a Response that FastAPI sends as is, so the
+# model only validates and filters the output with KUNDALI_FAST_JSON=0 (or
+# without orjson); validating a depth-4 table would cost about half as much as
+# computing it.
+
+@router.get("/{profile_id}/dashas", response_model=VimshottariDasha, response_model_exclude_unset=True)
 def get_vimshottari_dasha(profile_id: str, db: Session = Depends(get_db)):
     """
     Get complete Vimshottari Dasha table with Mahadasha and Antardasha periods.
     """
-    profile = db.query(Profile).filter(Profile.id == profile_id).first()
-    if not profile:
-        raise HTTPException(status_code=404, detail="Profile not found")
-    
-    from kundali_app.services.astrology import AstrologyService
-    service = AstrologyService()
-    
-    return service.calculate_vimshottari_dasha(
-        lat=profile.lat, lon=profile.lon,
-        year=profile.dob.year, month=profile.dob.month, day=profile.dob.day,
-        hour=profile.tob.hour, minute=profile.tob.minute, timezone=5.5
-    )
+    return fast_json(_snapshot(db, _get_profile(db, profile_id))["dasha"])
 
 @router.get("/{profile_id}/dasha/current")
 def get_current_dasha(profile_id: str, as_of_date: str = None, db: Session = Depends(get_db)):
@@ -405,47 +376,27 @@ def get_current_dasha(profile_id: str, as_of_date: str = None, db: Session = Dep
     Get current running Mahadasha and Antardasha with effects.
     Optional: as_of_date in DD-MM-YYYY format to check dasha for a specific date.
     """
-    profile = db.query(Profile).filter(Profile.id == profile_id).first()
-    if not profile:
-        raise HTTPException(status_code=404, detail="Profile not found")
-    
-    from kundali_app.services.astrology import AstrologyService
-    service = AstrologyService()
-    
-    return service.get_current_dasha(
-        lat=profile.lat, lon=profile.lon,
-        year=profile.dob.year, month=profile.dob.month, day=profile.dob.day,
-        hour=profile.tob.hour, minute=profile.tob.minute, timezone=5.5,
-        as_of_date=as_of_date
-    )
+    profile = _get_profile(db, profile_id)
+    return fast_json(_full_profile(profile, ("current_dasha",), as_of_date=as_of_date)["current_dasha"])
 
-@router.post("/calculate/dasha")
+@calculate_router.get("/calculate/dasha", response_model=VimshottariDasha, response_model_exclude_unset=True)
+@router.post("/calculate/dasha", response_model=VimshottariDasha, response_model_exclude_unset=True)
 def calculate_dasha_adhoc(
     dob: str,  # DD/MM/YYYY
     tob: str,  # HH:MM
     lat: float,
     lon: float,
-    timezone: float = 5.5
+    timezone: float = 5.5,
+    ayanamsa: str = None,
+    dasha_depth: int = Query(2, ge=1, le=4)
 ):
     """
     Calculate Vimshottari Dasha without storing in database.
+    dasha_depth: 1 = Mahadasha only, 2 = + Antardasha, 3 = + Pratyantardasha, 4 = + Sookshma.
     """
-    from datetime import datetime
-    from kundali_app.services.astrology import AstrologyService
-    
-    dob_parts = dob.split("/")
-    tob_parts = tob.split(":")
-    
-    day = int(dob_parts[0])
-    month = int(dob_parts[1])
-    year = int(dob_parts[2])
-    hour = int(tob_parts[0])
-    minute = int(tob_parts[1])
-    
-    service = AstrologyService()
-    
-    return service.calculate_vimshottari_dasha(lat, lon, year, month, day, hour, minute, timezone)
+    return fast_json(_full_adhoc(dob, tob, lat, lon, timezone, ayanamsa, ("dasha",), dasha_depth=dasha_depth)["dasha"])
 
+@calculate_router.get("/calculate/dasha/current")
 @router.post("/calculate/dasha/current")
 def calculate_current_dasha_adhoc(
     dob: str,  # DD/MM/YYYY
@@ -453,26 +404,115 @@ def calculate_current_dasha_adhoc(
     lat: float,
     lon: float,
     timezone: float = 5.5,
+    ayanamsa: str = None,
     as_of_date: str = None
 ):
     """
     Get current dasha for given birth details.
     """
-    from datetime import datetime
-    from kundali_app.services.astrology import AstrologyService
-    
-    dob_parts = dob.split("/")
-    tob_parts = tob.split(":")
-    
-    day = int(dob_parts[0])
-    month = int(dob_parts[1])
-    year = int(dob_parts[2])
-    hour = int(tob_parts[0])
-    minute = int(tob_parts[1])
-    
-    service = AstrologyService()
-    
-    return service.get_current_dasha(lat, lon, year, month, day, hour, minute, timezone, as_of_date)
+    return fast_json(_full_adhoc(dob, tob, lat, lon, timezone, ayanamsa, ("current_dasha",),
+                                 as_of_date=as_of_date)["current_dasha"])
+
+def _dasha_window(service, lat, lon, year, month, day, hour, minute, timezone, start, end, depth):
+    """AstrologyService.calculate_dasha_window on the worker pool; bad dates are a 400."""
+    try:
+        return _compute(service, "calculate_dasha_window", lat, lon, year, month, day, hour, minute, timezone,
+                        start=start, end=end, depth=depth)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/{profile_id}/dasha/periods")
+def get_dasha_periods(
+    profile_id: str,
+    start: str = None,  # DD-MM-YYYY [HH:MM]
+    end: str = None,
+    depth: int = Query(2, ge=1, le=5),
+    db: Session = Depends(get_db)
+):
+    """
+    Dasha periods at one level overlapping a date window, e.g. the
+    antardashas of 2026-2028: start=01-01-2026&end=31-12-2028&depth=2.
+    depth: 1 = Mahadasha, 2 = Antardasha, 3 = Pratyantardasha, 4 = Sookshma, 5 = Prana.
+    start defaults to now; without end, the periods running at start.
+    """
+    profile = _get_profile(db, profile_id)
+    return fast_json(_dasha_window(
+        _service(profile.ayanamsa), profile.lat, profile.lon,
+        profile.dob.year, profile.dob.month, profile.dob.day,
+        profile.tob.hour, profile.tob.minute, 5.5,  # Profiles have no timezone yet
+        start, end, depth
+    ))
+
+@calculate_router.get("/calculate/dasha/periods")
+@router.post("/calculate/dasha/periods")
+def calculate_dasha_periods_adhoc(
+    dob: str,  # DD/MM/YYYY
+    tob: str,  # HH:MM
+    lat: float,
+    lon: float,
+    timezone: float = 5.5,
+    ayanamsa: str = None,
+    start: str = None,  # DD-MM-YYYY [HH:MM]
+    end: str = None,
+    depth: int = Query(2, ge=1, le=5)
+):
+    """
+    Dasha periods at one level overlapping a date window (see /{profile_id}/dasha/periods).
+    """
+    return fast_json(_dasha_window(_service(ayanamsa), lat, lon, *_parse_birth(dob, tob), timezone, start, end, depth))
+
+# Rows per /dasha/transitions response
+TRANSITIONS_LIMIT = 10_000
+
+@router.get("/dasha/transitions")
+async def get_dasha_transitions(
+    start: str,  # DD-MM-YYYY [HH:MM]
+    end: str,
+    level: int = Query(2, ge=1, le=TRANSITION_DEPTH),
+    lord: str = None,
+    limit: int = Query(TRANSITIONS_LIMIT, ge=1, le=TRANSITIONS_LIMIT),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Profiles entering a new period within [start, end], e.g. every antardasha
+    starting next week: start=20-10-2026&end=26-10-2026&level=2.
+    level: 1 = Mahadasha, 2 = Antardasha; optionally only periods of `lord`.
+    Read from the stored transition index (services/dasha_transitions.py), in start order.
+    """
+    try:
+        window_start, window_end = parse_dasha_date(start), parse_dasha_date(end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if window_end < window_start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    return fast_json(await find_transitions_async(db, window_start, window_end, level, lord, limit))
+
+# (birth, date) pairs per /dasha/current/batch request
+DASHA_BATCH_LIMIT = 200_000
+
+@router.post("/dasha/current/batch")
+def get_current_dasha_batch(request: DashaBatchRequest):
+    """
+    Running dasha of many births at one or more dates, e.g. every profile's
+    period for each day of a notification run. Births carry the sidereal Moon
+    longitude, so no chart is computed; all pairs are evaluated in one
+    vectorized pass (services/dasha_batch.py).
+    Returns rows of [id, date, combined_period, start, end] for the deepest level.
+    """
+    pairs = len(request.births) * len(request.dates)
+    if not pairs or pairs > DASHA_BATCH_LIMIT:
+        raise HTTPException(status_code=400, detail=f"Pass between 1 and {DASHA_BATCH_LIMIT} (birth, date) pairs")
+    try:
+        rows = _run(current_dasha_rows,
+                    [b.id for b in request.births], [b.birth for b in request.births],
+                    [b.moon_longitude for b in request.births], request.dates, request.depth)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return fast_json({
+        "depth": request.depth,
+        "columns": ["id", "date", "combined_period", "start", "end"],
+        "rows": rows,
+    })
 
 # ============ ASCENDANT REPORT ENDPOINTS ============
 
@@ -485,57 +525,73 @@ def get_ascendant_report(profile_id: str, db: Session = Depends(get_db)):
     - Description, Spiritual Lesson
     - Positive/Negative Traits
     """
-    profile = db.query(Profile).filter(Profile.id == profile_id).first()
-    if not profile:
-        raise HTTPException(status_code=404, detail="Profile not found")
-    
-    from kundali_app.services.astrology import AstrologyService
-    service = AstrologyService()
-    
-    return service.get_ascendant_report(
-        lat=profile.lat, lon=profile.lon,
-        year=profile.dob.year, month=profile.dob.month, day=profile.dob.day,
-        hour=profile.tob.hour, minute=profile.tob.minute, timezone=5.5
-    )
+    return fast_json(_snapshot(db, _get_profile(db, profile_id))["ascendant_report"])
 
+@calculate_router.get("/calculate/ascendant-report")
 @router.post("/calculate/ascendant-report")
 def calculate_ascendant_report_adhoc(
     dob: str,  # DD/MM/YYYY
     tob: str,  # HH:MM
     lat: float,
     lon: float,
-    timezone: float = 5.5
+    timezone: float = 5.5,
+    ayanamsa: str = None
 ):
     """
     Calculate Ascendant Report without storing in database.
     """
-    from kundali_app.services.astrology import AstrologyService
-    
-    dob_parts = dob.split("/")
-    tob_parts = tob.split(":")
-    
-    day = int(dob_parts[0])
-    month = int(dob_parts[1])
-    year = int(dob_parts[2])
-    hour = int(tob_parts[0])
-    minute = int(tob_parts[1])
-    
-    service = AstrologyService()
-    
-    return service.get_ascendant_report(lat, lon, year, month, day, hour, minute, timezone)
+    return fast_json(_full_adhoc(dob, tob, lat, lon, timezone, ayanamsa, ("ascendant_report",))["ascendant_report"])
 
 @router.post("/download-pdf")
-async def download_pdf(data: Dict[str, Any]):
+async def download_pdf(data: Dict[str, Any], illustrated: bool = False):
+    """
+    The kundali report as a PDF; `illustrated` adds a cover, the house
+    introductions and a page background.
+    """
+    from io import BytesIO
     try:
-        pdf_buffer = pdf_generator.generate(data)
-        filename = f"{data.get('name', 'Report')}_kundali.pdf".replace(" ", "_")
-        
-        return StreamingResponse(
-            pdf_buffer,
-            media_type="application/pdf",
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
-        )
+        # Rendered in a worker so a slow report never blocks the event loop
+        pdf_bytes = await worker_pool.run_async(render_pdf, data, illustrated)
+    except (PoolBusy, PoolTimeout) as e:
+        raise _pool_error(e)
     except Exception as e:
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
+    
+    filename = f"{data.get('name', 'Report')}_kundali.pdf".replace(" ", "_")
+    return StreamingResponse(
+        BytesIO(pdf_bytes),
+        media_type="application/pdf",
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+PDF_BATCH_LIMIT = 100
+
+@router.post("/download-pdf/batch")
+def download_pdf_batch(reports: List[Dict[str, Any]], illustrated: bool = False):
+    """
+    Many reports (the /download-pdf payload each) as one zip, rendered in
+    parallel across the worker pool.
+    """
+    import zipfile
+    from io import BytesIO
+    from kundali_app.services.pdf_generator import render_batch
+    if not reports or len(reports) > PDF_BATCH_LIMIT:
+        raise HTTPException(status_code=400, detail=f"Pass between 1 and {PDF_BATCH_LIMIT} reports")
+    try:
+        pdfs = render_batch(reports, illustrated)
+    except (PoolBusy, PoolTimeout) as e:
+        raise _pool_error(e)
+
+    archive = BytesIO()
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_STORED) as zf:  # PDF streams are already compressed
+        for i, (data, pdf_bytes) in enumerate(zip(reports, pdfs), 1):
+            name = str(data.get('name', 'Report')).replace(" ", "_").replace("/", "_")
+            zf.writestr(f"{i:03d}_{name}_kundali.pdf", pdf_bytes)
+    archive.seek(0)
+    return StreamingResponse(
+        archive,
+        media_type="application/zip",
+        headers={"Content-Disposition": "attachment; filename=kundali_reports.zip"}
+    )
@@ -0,0 +1,85 @@
+import io
+import tempfile
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from kundali_app.db.session import get_db
+from kundali_app.models import ChartJob
+from kundali_app.services.astrology import FULL_SECTIONS
+from kundali_app.services.ayanamsa import resolve as resolve_ayanamsa
+from kundali_app.services.jobs import INPUT_FORMATS, job_runner, progress
+
+router = APIRouter()
+
+# Uploads larger than this are spooled to a temporary file instead of memory
+UPLOAD_SPOOL_BYTES = 8 * 1024 * 1024
+
+@router.post("", status_code=202)
+async def create_job(
+    request: Request,
+    format: str = None,
+    sections: str = "basic",
+    ayanamsa: str = None,
+    dasha_depth: int = Query(2, ge=1, le=4)
+):
+    """
+    Start a bulk chart job from the request body: CSV with a header row, or
+    NDJSON with one object per line. Each record needs dob (DD/MM/YYYY),
+    tob (HH:MM), lat and lon; timezone (default 5.5), place and id are optional.
+    `format` defaults from the Content-Type; `sections` are those of
+    /astro/calculate/full. Poll /astro/jobs/{id} for progress and read
+    /astro/jobs/{id}/results for the NDJSON results.
+    """
+    fmt = (format or ("csv" if "csv" in request.headers.get("content-type", "") else "ndjson")).lower()
+    if fmt not in INPUT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown format: {fmt}. Valid: {', '.join(INPUT_FORMATS)}")
+    selected = [name.strip() for name in sections.split(",") if name.strip()]
+    unknown = [name for name in selected if name not in FULL_SECTIONS]
+    if unknown or not selected:
+        raise HTTPException(status_code=400, detail=f"Unknown section(s): {', '.join(unknown)}. Valid: {', '.join(FULL_SECTIONS)}")
+    try:
+        ayanamsa = resolve_ayanamsa(ayanamsa)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    with tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_BYTES) as upload:
+        async for chunk in request.stream():
+            upload.write(chunk)
+        upload.seek(0)
+        lines = io.TextIOWrapper(upload, encoding="utf-8-sig", newline="")
+        try:
+            return await run_in_threadpool(job_runner.create, lines, fmt, selected, ayanamsa, dasha_depth)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        finally:
+            lines.detach()
+
+@router.get("")
+def list_jobs(limit: int = Query(20, ge=1, le=200), db: Session = Depends(get_db)):
+    """
+    Most recent jobs first, with their progress.
+    """
+    jobs = db.query(ChartJob).order_by(ChartJob.created_at.desc()).limit(limit).all()
+    return [progress(job) for job in jobs]
+
+@router.get("/{job_id}")
+def get_job(job_id: str, db: Session = Depends(get_db)):
+    """
+    Status, progress, throughput (records/second) and ETA of a job.
+    """
+    job = db.query(ChartJob).filter(ChartJob.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return progress(job)
+
+@router.get("/{job_id}/results")
+def get_job_results(job_id: str, follow: bool = True, db: Session = Depends(get_db)):
+    """
+    Stream results as NDJSON in upload order: {"seq", "id", "result"} or
+    {"seq", "id", "error"} per record. With follow=true (default) the stream
+    stays open until the job finishes; follow=false returns what is ready.
+    """
+    if not db.query(ChartJob.id).filter(ChartJob.id == job_id).first():
+        raise HTTPException(status_code=404, detail="Job not found")
+    return StreamingResponse(job_runner.results(job_id, follow=follow), media_type="application/x-ndjson")
@@ -1,13 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+import time as clock
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from kundali_app.db.session import get_db
-from kundali_app.models import Profile, PlanetaryPosition
-from kundali_app.services.astrology import AstrologyService
+from kundali_app.db.session import get_async_db, get_db
+from kundali_app.models import JobStatus, Profile
+from kundali_app.services.ayanamsa import resolve as resolve_ayanamsa
+from kundali_app.services.profile_charts import ACTIVE, chart_status, profile_charts
 from pydantic import BaseModel
 from datetime import date, time
 
+# Seconds between status checks while a long-poll waits
+STATUS_POLL = 0.25
+
 router = APIRouter()
-astro_service = AstrologyService()
 
 class ProfileCreate(BaseModel):
     name: str
@@ -22,33 +28,50 @@ class ProfileCreate(BaseModel):
     mother_name: str = ""
     caste: str = ""
     gotra: str = ""
+    ayanamsa: str = "lahiri"
 
-@router.post("/")
+@router.post("/", status_code=202)
 def create_profile(profile: ProfileCreate, db: Session = Depends(get_db)):
-    # 1. Save Profile
-    db_profile = Profile(**profile.dict())
-    db.add(db_profile)
-    db.commit()
-    db.refresh(db_profile)
-    
-    # 2. Calculate & Save Planets (Async ideally, Sync for now)
-    planets_data = astro_service.calculate_planets(
-        lat=profile.lat, lon=profile.lon,
-        year=profile.dob.year, month=profile.dob.month, day=profile.dob.day,
-        hour=profile.tob.hour, minute=profile.tob.minute
-    )
-    
-    for p_data in planets_data:
-        db_planet = PlanetaryPosition(**p_data, profile_id=db_profile.id)
-        db.add(db_planet)
+    """
+    Store a profile and queue its chart computation; returns at once with
+    status "pending". Follow /profiles/{id}/status (optionally with ?wait=).
+    """
+    try:
+        ayanamsa = resolve_ayanamsa(profile.ayanamsa)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
+    db_profile = Profile(**{**profile.dict(), "ayanamsa": ayanamsa},
+                         chart_status=JobStatus.PENDING.value, chart_attempts=0)
+    db.add(db_profile)
     db.commit()
     
-    return {"id": db_profile.id, "message": "Profile created and calculated"}
+    profile_charts.enqueue(db_profile.id)
+    return {**chart_status(db_profile), "message": "Profile created; charts are being calculated"}
+
+@router.get("/{profile_id}/status")
+async def get_profile_status(profile_id: str, wait: float = Query(0, ge=0, le=30),
+                             db: AsyncSession = Depends(get_async_db)):
+    """
+    Chart status of a profile: pending, running, completed or failed (with
+    the error after the last retry). With wait > 0 the request is held until
+    the charts are done or `wait` seconds have passed.
+    """
+    deadline = clock.monotonic() + wait
+    while True:
+        profile = await db.get(Profile, profile_id, populate_existing=True)
+        if profile is None:
+            raise HTTPException(status_code=404, detail="Profile not found")
+        status = chart_status(profile)
+        # Hand the connection back to the pool while waiting
+        await db.close()
+        if status["status"] not in ACTIVE or clock.monotonic() >= deadline:
+            return status
+        await asyncio.sleep(STATUS_POLL)
 
 @router.get("/{profile_id}")
-def get_profile(profile_id: str, db: Session = Depends(get_db)):
-    profile = db.query(Profile).filter(Profile.id == profile_id).first()
+async def get_profile(profile_id: str, db: AsyncSession = Depends(get_async_db)):
+    profile = await db.get(Profile, profile_id)
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
     return profile
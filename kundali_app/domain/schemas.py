@@ -1,3 +1,4 @@
+from typing import List, Optional
 from pydantic import BaseModel, Field
 
 class KundaliRequest(BaseModel):
@@ -10,3 +11,43 @@ class KundaliRequest(BaseModel):
     lat: float = Field(..., ge=-90, le=90, description="Latitude")
     lon: float = Field(..., ge=-180, le=180, description="Longitude")
     timezone: float = Field(5.5, description="Timezone offset from UTC (default IST)")
+
+# Response models of the Vimshottari dasha endpoints. Routes return plain dicts
+# with only the keys their depth produces, so they use response_model_exclude_unset.
+# With orjson responses (api/responses.py) the models only document the shape.
+
+class DashaPeriod(BaseModel):
+    lord: str
+    start_date: str = Field(..., description="DD-MM-YYYY HH:MM")
+    end_date: str = Field(..., description="DD-MM-YYYY HH:MM")
+    duration_years: float
+    pratyantardashas: Optional[List["DashaPeriod"]] = Field(None, description="depth >= 3 (on antardashas)")
+    sookshmas: Optional[List["DashaPeriod"]] = Field(None, description="depth 4 (on pratyantardashas)")
+
+class Mahadasha(BaseModel):
+    lord: str
+    start_date: str = Field(..., description="DD-MM-YYYY HH:MM")
+    end_date: str = Field(..., description="DD-MM-YYYY HH:MM")
+    years: float
+    is_partial: bool = Field(..., description="The mahadasha running at birth, counted from its balance")
+    antardashas: List[DashaPeriod] = []
+
+class VimshottariDasha(BaseModel):
+    dasha_system: Optional[str] = None
+    birth_nakshatra: Optional[str] = None
+    birth_lord: Optional[str] = None
+    balance_at_birth: Optional[str] = None
+    mahadashas: Optional[List[Mahadasha]] = None
+    error: Optional[str] = None
+
+# Request of POST /astro/dasha/current/batch
+
+class DashaBatchBirth(BaseModel):
+    id: str
+    birth: str = Field(..., description="Birth instant, local time: YYYY-MM-DDTHH:MM")
+    moon_longitude: float = Field(..., ge=0, lt=360, description="Sidereal Moon longitude at birth")
+
+class DashaBatchRequest(BaseModel):
+    births: List[DashaBatchBirth]
+    dates: List[str] = Field(..., description="As-of instants: YYYY-MM-DD or YYYY-MM-DDTHH:MM")
+    depth: int = Field(3, ge=1, le=5, description="1 = Mahadasha ... 5 = Prana")
@@ -1,14 +1,24 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from kundali_app.core.config import settings
-from kundali_app.db.session import engine, Base
-from kundali_app.api.routes import profiles, astro
+from kundali_app.db import session
+from kundali_app.db.session import engine, Base, upgrade_schema
+from kundali_app.api.routes import profiles, astro, jobs
+from kundali_app.api.etag import ETagMiddleware
+from kundali_app.services.workers import worker_pool
+from kundali_app.services.jobs import job_runner
+from kundali_app.services.profile_charts import profile_charts
+from kundali_app.services import dasha_transitions, ephemeris_table
 
 # Create Tables
 Base.metadata.create_all(bind=engine)
+upgrade_schema(engine)
 
 app = FastAPI(title="Headless Kundali API", version="2.0")
 
+# Conditional GET for the chart endpoints; added first so CORS also wraps its 304s
+app.add_middleware(ETagMiddleware, max_age=settings.HTTP_CACHE_MAX_AGE)
+
 # CORS Middleware - Allow frontend access
 app.add_middleware(
     CORSMiddleware,
@@ -16,12 +26,40 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 app.include_router(profiles.router, prefix="/profiles", tags=["Profiles"])
+app.include_router(jobs.router, prefix="/astro/jobs", tags=["Jobs"])
+app.include_router(astro.calculate_router, prefix="/astro", tags=["Astrology"])
 app.include_router(astro.router, prefix="/astro", tags=["Astrology"])
 
 
+@app.on_event("startup")
+def check_ephemeris_table():
+    # Warn at startup rather than on the first chart if the table cannot be used
+    if settings.EPHEMERIS_BACKEND == "table":
+        ephemeris_table.available_table()
+
+
+@app.on_event("startup")
+def resume_jobs():
+    job_runner.resume()
+    profile_charts.resume()
+    dasha_transitions.backfill()
+
+
+@app.on_event("shutdown")
+def stop_workers():
+    worker_pool.shutdown()
+
+
+@app.on_event("shutdown")
+async def close_async_engine():
+    if session.async_engine is not None:
+        await session.async_engine.dispose()
+
+
 @app.get("/")
 def health_check():
     return {"status": "ok", "mode": "headless"}
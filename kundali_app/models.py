@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Date, Time, DateTime, ForeignKey, Boolean, Enum as SqlEnum
+from sqlalchemy import Column, Integer, String, Float, Date, Time, DateTime, ForeignKey, Boolean, Text, Index, Enum as SqlEnum
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .db.session import Base
@@ -42,13 +42,23 @@ class Profile(Base):
     caste = Column(String, nullable=True)
     gotra = Column(String, nullable=True)
     
+    ayanamsa = Column(String, nullable=True) # None = settings.AYANAMSA_MODE
+    
+    # Background chart materialization (see services/profile_charts.py); JobStatus values
+    chart_status = Column(String, default="pending", index=True)
+    chart_attempts = Column(Integer, default=0)
+    chart_error = Column(Text, nullable=True)
+    
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
     planetary_positions = relationship("PlanetaryPosition", back_populates="profile", cascade="all, delete-orphan")
+    snapshot = relationship("ChartSnapshot", back_populates="profile", uselist=False, cascade="all, delete-orphan")
+    dasha_transitions = relationship("DashaTransition", back_populates="profile", cascade="all, delete-orphan")
 
 class PlanetaryPosition(Base):
     __tablename__ = "planetary_positions"
+    __table_args__ = (Index("ix_planetary_positions_profile_chart", "profile_id", "chart_type"),)
 
     id = Column(Integer, primary_key=True, index=True)
     profile_id = Column(String, ForeignKey("profiles.id"))
@@ -63,3 +73,70 @@ class PlanetaryPosition(Base):
     is_retrograde = Column(Boolean, default=False)
 
     profile = relationship("Profile", back_populates="planetary_positions")
+
+class ChartSnapshot(Base):
+    """Materialized chart data for a Profile (see services/snapshots.py)."""
+    __tablename__ = "chart_snapshots"
+
+    profile_id = Column(String, ForeignKey("profiles.id"), primary_key=True)
+    fingerprint = Column(String) # Hash of birth data, settings and engine version
+    engine_version = Column(String)
+    data = Column(Text) # JSON
+    computed_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    profile = relationship("Profile", back_populates="snapshot")
+
+class DashaTransition(Base):
+    """Start of one mahadasha or antardasha of a Profile (see services/dasha_transitions.py)."""
+    __tablename__ = "dasha_transitions"
+    __table_args__ = (Index("ix_dasha_transitions_level_start", "level", "start_jd"),)
+
+    id = Column(Integer, primary_key=True)
+    profile_id = Column(String, ForeignKey("profiles.id"), index=True)
+    level = Column(Integer) # 1 = Mahadasha, 2 = Antardasha
+    lord = Column(String)
+    lords = Column(String) # Path from the mahadasha, e.g. "Rahu-Sun"
+    start_jd = Column(Float) # Julian day of the naive local start (services/dasha_tree.py)
+    end_jd = Column(Float)
+
+    profile = relationship("Profile", back_populates="dasha_transitions")
+
+class JobStatus(str, enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class ChartJob(Base):
+    """A bulk chart computation job (see services/jobs.py)."""
+    __tablename__ = "chart_jobs"
+
+    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
+    status = Column(String, default=JobStatus.PENDING.value, index=True)
+    sections = Column(String) # Comma-separated calculate_full sections
+    ayanamsa = Column(String, nullable=True)
+    dasha_depth = Column(Integer, default=2)
+    total = Column(Integer, default=0)
+    done = Column(Integer, default=0)
+    failed = Column(Integer, default=0)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    records = relationship("ChartJobRecord", back_populates="job", cascade="all, delete-orphan")
+
+class ChartJobRecord(Base):
+    """One uploaded birth of a ChartJob; `result`/`error` are filled in by the runner."""
+    __tablename__ = "chart_job_records"
+    __table_args__ = (Index("ix_chart_job_records_job_seq", "job_id", "seq", unique=True),)
+
+    id = Column(Integer, primary_key=True)
+    job_id = Column(String, ForeignKey("chart_jobs.id"))
+    seq = Column(Integer) # 1-based position in the upload
+    payload = Column(Text) # Normalized input record (JSON)
+    status = Column(String, default=JobStatus.PENDING.value)
+    result = Column(Text, nullable=True) # JSON
+    error = Column(Text, nullable=True)
+
+    job = relationship("ChartJob", back_populates="records")
@@ -1,23 +1,76 @@
 import ephem
 import math
-import json
-import os
+import heapq
+from time import perf_counter
 from datetime import datetime, timedelta, date, time
 from kundali_app.models import PlanetName, ChartType
+from kundali_app.services.transitions import TransitionSolver
+from kundali_app.services.chart_cache import chart_cache
+from kundali_app.services.sun_times import sun_times
+from kundali_app.services.dasha_tree import DashaTree, parse_date as parse_dasha_date, LEVEL_KEYS as DASHA_LEVEL_KEYS, MAX_DEPTH as DASHA_MAX_DEPTH
+from kundali_app.services import houses
+from kundali_app.services.reference_data import registry as reference_data, thaw
+from kundali_app.services.ayanamsa import label as ayanamsa_label, resolve as resolve_ayanamsa
+from kundali_app.core.config import settings
 
-# Load Lookup Data
-_LOOKUP_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'astro_lookups.json')
-with open(_LOOKUP_PATH, 'r') as f:
-    ASTRO_LOOKUPS = json.load(f)
+# Panchang names
+TITHI_NAMES = ["Pratipada", "Dwitiya", "Tritiya", "Chaturthi", "Panchami", "Shashthi", 
+    "Saptami", "Ashtami", "Navami", "Dashami", "Ekadashi", "Dwadashi", 
+    "Trayodashi", "Chaturdashi", "Purnima", "Pratipada", "Dwitiya", "Tritiya", "Chaturthi", "Panchami", "Shashthi", "Saptami", "Ashtami", "Navami", "Dashami", "Ekadashi", "Dwadashi", "Trayodashi", "Chaturdashi", "Amavasya"]
+
+YOGA_NAMES = ["Vishkumbha", "Priti", "Ayushman", "Saubhagya", "Sobhana", "Atiganda", "Sukarma", "Dhriti", "Shula", "Ganda", "Vriddhi", "Dhruva", "Vyaghata", "Harshan", "Vajra", "Siddhi", "Vyatipata", "Variyan", "Parigha", "Shiva", "Siddha", "Sadhya", "Shubha", "Shukla", "Brahma", "Indra", "Vaidhriti"]
+
+# Sections of calculate_full, in response order
+FULL_SECTIONS = ("basic", "panchang", "charts", "dasha", "current_dasha", "ascendant_report")
+
+# Weekday lords, Monday first (datetime.weekday())
+DAY_LORDS = ["Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Sun"]
+
+TATVA_BY_SIGN = {
+    "Aries": "Fire", "Leo": "Fire", "Sagittarius": "Fire",
+    "Taurus": "Earth", "Virgo": "Earth", "Capricorn": "Earth",
+    "Gemini": "Air", "Libra": "Air", "Aquarius": "Air",
+    "Cancer": "Water", "Scorpio": "Water", "Pisces": "Water"
+}
+
+KARANA_NAMES = ["Bava", "Balava", "Kaulava", "Taitila", "Gara", "Vanija", "Vishti", "Shakuni", "Chatushpada", "Naga", "Kimstughna"]
+
+# Tamil solar months from the sidereal Sun sign (Aries first); weekdays Monday first
+TAMIL_MONTHS = ("Chithirai", "Vaikasi", "Aani", "Aadi", "Avani", "Puratasi", "Aippasi", "Karthigai", "Margazhi", "Thai", "Maasi", "Panguni")
+TAMIL_WEEKDAYS = ("Thingal", "Chevvaai", "Pudhan", "Viyaazhan", "Velli", "Sani", "Nyaairu")
+
+# Planet abbreviations of the chart house displays
+PLANET_ABBR = {
+    "Ascendant": "As", "Sun": "Su", "Moon": "Mo", "Mars": "Ma", "Mercury": "Me",
+    "Jupiter": "Ju", "Venus": "Ve", "Saturn": "Sa", "Rahu": "Ra", "Ketu": "Ke",
+}
 
 class AstrologyService:
+
+    def __init__(self, ephemeris=None, house_system=None, ayanamsa=None):
+        # "live" or "table"; None follows settings.EPHEMERIS_BACKEND
+        self.ephemeris = ephemeris
+        # Key of ayanamsa.AYANAMSAS; None follows settings.AYANAMSA_MODE
+        self.ayanamsa_mode = resolve_ayanamsa(ayanamsa)
+        # One of houses.HOUSE_SYSTEMS; None follows settings.HOUSE_SYSTEM
+        self.house_system = house_system or settings.HOUSE_SYSTEM
     
     @staticmethod
     def _get_zodiac_sign(lon):
-        signs = ["Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo", "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"]
         lon = lon % 360
         index = int(lon / 30)
-        return index, signs[index]
+        return index, reference_data.get().signs[index]
+
+    @staticmethod
+    def parse_birth(dob, tob):
+        """(year, month, day, hour, minute) from "DD/MM/YYYY" and "HH:MM"; ValueError if malformed."""
+        try:
+            day, month, year = (int(part) for part in dob.split("/"))
+            hour, minute = (int(part) for part in tob.split(":")[:2])
+            datetime(year, month, day, hour, minute)
+        except (ValueError, AttributeError):
+            raise ValueError(f"Expected dob as DD/MM/YYYY and tob as HH:MM, got {dob!r} {tob!r}")
+        return year, month, day, hour, minute
 
     @staticmethod
     def decimal_to_dms(deg):
@@ -42,78 +95,56 @@ class AstrologyService:
         v = int(((ghatis - g) * 60 - p) * 60)
         return f"{g:02d}:{p:02d}:{v:02d}"
 
-    def calculate_planets(self, lat, lon, year, month, day, hour, minute, timezone=5.5):
-        return self._calculate_planets_full(lat, lon, year, month, day, hour, minute, timezone)
-
-    def _calculate_planets_full(self, lat, lon, year, month, day, hour, minute, timezone):
-        obs = ephem.Observer()
-        obs.lat = str(lat)
-        obs.lon = str(lon)
-        local_dt = datetime(year, month, day, hour, minute)
-        utc_dt = local_dt - timedelta(hours=timezone)
-        obs.date = utc_dt
-        
-        # Ayanamsa
-        t = (ephem.julian_date(obs.date) - 2451545.0) / 36525
-        ayanamsa = 23.85 + 1.4 * t
-        
-        # Rahu/Ketu calculation (Mean Node)
-        mean_node_lon = (125.04452 - 1934.136261 * t) % 360
-        rahu_sid = (mean_node_lon - ayanamsa) % 360
-        ketu_sid = (rahu_sid + 180) % 360
-        
-        bodies = {
-            "Sun": ephem.Sun(), "Moon": ephem.Moon(), "Mars": ephem.Mars(),
-            "Mercury": ephem.Mercury(), "Jupiter": ephem.Jupiter(), 
-            "Venus": ephem.Venus(), "Saturn": ephem.Saturn()
-        }
+    def build_context(self, lat, lon, year, month, day, hour, minute, timezone=5.5):
+        """
+        Compute the ephemeris once for a birth moment; pass the result as `ctx=` to any method.
+        Served from the process-wide chart cache when enabled.
+        """
+        return chart_cache.get(lat, lon, year, month, day, hour, minute, timezone,
+                               ephemeris=self.ephemeris, ayanamsa_mode=self.ayanamsa_mode)
+
+    def _context(self, ctx, lat, lon, year, month, day, hour, minute, timezone):
+        if ctx is None:
+            return self.build_context(lat, lon, year, month, day, hour, minute, timezone)
+        return ctx
+
+    def calculate_planets(self, lat, lon, year, month, day, hour, minute, timezone=5.5, ctx=None):
+        return self._calculate_planets_full(lat, lon, year, month, day, hour, minute, timezone, ctx=ctx)
+
+    def calculate_planets_batch(self, utc, lat, lon):
+        """
+        Vectorized calculate_planets for many births at once (NumPy arrays in,
+        structured array out). See services/batch.py.
+        """
+        from kundali_app.services.batch import calculate_planets_batch
+        return calculate_planets_batch(utc, lat, lon, self.house_system, self.ayanamsa_mode)
+
+    def _calculate_planets_full(self, lat, lon, year, month, day, hour, minute, timezone, ctx=None):
+        ctx = self._context(ctx, lat, lon, year, month, day, hour, minute, timezone)
         
         results = []
-        sun_lon = 0
-        
-        for name, body in bodies.items():
-            body.compute(obs)
-            ecl = ephem.Ecliptic(body)
-            trop_lon = math.degrees(ecl.lon)
-            sid_lon = (trop_lon - ayanamsa) % 360
-            
-            # Retrograde detection
-            is_retro = False
-            if name not in ["Sun", "Moon"]:
-                obs_next = ephem.Observer()
-                obs_next.lat, obs_next.lon = str(lat), str(lon)
-                obs_next.date = ephem.Date(obs.date + 1)
-                body.compute(obs_next)
-                ecl_next = ephem.Ecliptic(body)
-                lon_next = (math.degrees(ecl_next.lon) - ayanamsa) % 360
-                diff = lon_next - sid_lon
-                if diff > 180: diff -= 360
-                if diff < -180: diff += 360
-                is_retro = diff < 0
-            
-            results.append(self._build_planet_data(name, sid_lon, is_retro))
-            if name == "Sun": sun_lon = sid_lon
-        
-        # Add Rahu and Ketu
-        results.append(self._build_planet_data("Rahu", rahu_sid, False))
-        results.append(self._build_planet_data("Ketu", ketu_sid, False))
-        
-        # Ascendant
-        hours_from_6 = (hour + minute/60.0) - 6.0
-        lagna_sid = (sun_lon + (hours_from_6 * 15)) % 360
+        for name in ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Rahu", "Ketu"]:
+            # Retrograde/stationary status from the instantaneous speed
+            results.append(self._build_planet_data(
+                name, ctx.sidereal[name], ctx.is_retrograde(name),
+                speed=ctx.speeds[name], is_stationary=ctx.is_stationary(name)
+            ))
+        
+        # Ascendant (from local sidereal time, latitude and obliquity)
+        lagna_sid = ctx.ascendant
         results.insert(0, self._build_planet_data("Ascendant", lagna_sid, False))
         
-        # Calculate Houses (Whole Sign)
-        asc_sign = int(lagna_sid / 30) + 1
+        # Calculate Houses
+        cusps = ctx.house_cusps(self.house_system)
         for p in results:
             if p["planet"] == "Ascendant":
                 p["house"] = 1
             else:
-                p["house"] = ((p["sign_id"] - asc_sign) % 12) + 1
+                p["house"] = houses.house_of(ctx.sidereal[p["planet"]], cusps, self.house_system)
             
         return results
     
-    def _build_planet_data(self, name, sid_lon, is_retro):
+    def _build_planet_data(self, name, sid_lon, is_retro, speed=None, is_stationary=False):
         """Build comprehensive planet data object using JSON lookups."""
         sign_idx = int(sid_lon / 30)
         nak_idx = int(sid_lon / (360/27))
@@ -125,156 +156,92 @@ class AstrologyService:
         deg_s = int(((degree_in_sign - deg_d) * 60 - deg_m) * 60)
         degree_str = f"{deg_d:02d}:{deg_m:02d}:{deg_s:02d}"
         
-        rashi = ASTRO_LOOKUPS["rashis"][sign_idx]
-        nak = ASTRO_LOOKUPS["nakshatras"][nak_idx]
+        ref = reference_data.get()
         
         return {
             "planet": name,
             "is_retrograde": is_retro,
-            "sign": rashi["name"],
+            "is_stationary": is_stationary,
+            "speed": round(speed, 4) if speed is not None else None,
+            "sign": ref.signs[sign_idx],
             "sign_id": sign_idx + 1,
             "degrees": degree_str,
             "degree_decimal": round(degree_in_sign, 4),
             "absolute_degree": round(sid_lon, 4),
-            "sign_lord": rashi["lord"],
-            "nakshatra": nak["name"],
+            "sign_lord": ref.sign_lords[sign_idx],
+            "nakshatra": ref.nakshatras[nak_idx],
             "nakshatra_id": nak_idx + 1,
             "nakshatra_pada": pada,
-            "nakshatra_lord": nak["lord"],
+            "nakshatra_lord": ref.nakshatra_lords[nak_idx],
             "house": 0
         }
 
-    def _find_event_end_time(self, obs, event_func, current_val, step_min=5, max_steps=400):
-        start_date = ephem.Date(obs.date)
-        for i in range(1, max_steps):
-            obs.date = ephem.Date(start_date + (i * step_min / 1440.0))
-            new_val = event_func(obs)
-            if new_val != current_val:
-                end_dt = obs.date.datetime() + timedelta(hours=5.5)
-                return end_dt.strftime("%H:%M:%S")
-        return "Unknown"
+    @staticmethod
+    def _karana_name(idx):
+        """Karana name for a 1-based karana index (1-60)."""
+        return KARANA_NAMES[(idx - 1) % 7] if idx < 57 else KARANA_NAMES[7 + ((idx - 57) % 4)]
 
-    def _get_tithi_index(self, obs):
-        sun = ephem.Sun()
-        moon = ephem.Moon()
-        sun.compute(obs)
-        moon.compute(obs)
-        
-        t = (ephem.julian_date(obs.date) - 2451545.0) / 36525
-        ayanamsa = 23.85 + 1.4 * t
-        
-        sun_ecl = ephem.Ecliptic(sun)
-        moon_ecl = ephem.Ecliptic(moon)
-        s = (math.degrees(sun_ecl.lon) - ayanamsa) % 360
-        m = (math.degrees(moon_ecl.lon) - ayanamsa) % 360
-        diff = (m - s) % 360
-        return int(diff / 12) + 1
-
-    def _get_nak_index(self, obs):
-        moon = ephem.Moon()
-        moon.compute(obs)
-        t = (ephem.julian_date(obs.date) - 2451545.0) / 36525
-        ayanamsa = 23.85 + 1.4 * t
-        
-        moon_ecl = ephem.Ecliptic(moon)
-        m = (math.degrees(moon_ecl.lon) - ayanamsa) % 360
-        return int(m / (360/27))
-
-    def calculate_extended_birth_details(self, lat, lon, year, month, day, hour, minute, timezone=5.5):
-        obs = ephem.Observer()
-        obs.lat, obs.lon = str(lat), str(lon)
-        local_dt = datetime(year, month, day, hour, minute)
-        utc_dt = local_dt - timedelta(hours=timezone)
-        obs.date = utc_dt
-        
-        t = (ephem.julian_date(obs.date) - 2451545.0) / 36525
-        ayanamsa = 23.85 + 1.4 * t
-        
-        s_body = ephem.Sun(); s_body.compute(obs)
-        sun_lon = (math.degrees(ephem.Ecliptic(s_body).lon) - ayanamsa) % 360
-        
-        # Sunrise/Sunset
-        sun = ephem.Sun()
-        obs_mid = ephem.Observer()
-        obs_mid.lat, obs_mid.lon = str(lat), str(lon)
-        obs_mid.date = datetime(year, month, day) - timedelta(hours=timezone)
-        try:
-            sunrise_utc = obs_mid.next_rising(sun)
-            sunset_utc = obs_mid.next_setting(sun)
-            sunrise_dt = ephem.Date(sunrise_utc + (timezone/24.0)).datetime()
-            sunset_dt = ephem.Date(sunset_utc + (timezone/24.0)).datetime()
-        except:
-            sunrise_dt = local_dt; sunset_dt = local_dt
-
-        def get_yoga_idx(obs):
-            s = ephem.Sun(); m = ephem.Moon(); s.compute(obs); m.compute(obs)
-            t = (ephem.julian_date(obs.date) - 2451545.0) / 36525
-            a = 23.85 + 1.4 * t
-            sl = (math.degrees(ephem.Ecliptic(s).lon) - a) % 360
-            ml = (math.degrees(ephem.Ecliptic(m).lon) - a) % 360
-            return int((sl + ml) / 13.333333) + 1
-            
-        def get_karana_idx(obs):
-            s = ephem.Sun(); m = ephem.Moon(); s.compute(obs); m.compute(obs)
-            t = (ephem.julian_date(obs.date) - 2451545.0) / 36525
-            a = 23.85 + 1.4 * t
-            sl = (math.degrees(ephem.Ecliptic(s).lon) - a) % 360
-            ml = (math.degrees(ephem.Ecliptic(m).lon) - a) % 360
-            return int(((ml - sl) % 360) / 6) + 1
-
-        # Panchang at Sunrise
-        obs_sunrise = ephem.Observer()
-        obs_sunrise.lat, obs_sunrise.lon = str(lat), str(lon)
-        obs_sunrise.date = sunrise_utc
-        
-        tithi_at_sunrise_idx = self._get_tithi_index(obs_sunrise)
-        nak_at_sunrise_idx = self._get_nak_index(obs_sunrise)
-        yoga_at_sunrise_idx = get_yoga_idx(obs_sunrise)
-        karana_at_sunrise_idx = get_karana_idx(obs_sunrise)
-        
-        # Next Sunrise
-        try:
-            next_sunrise_utc = obs_mid.next_rising(sun, start=sunrise_utc + 0.5)
-            next_sunrise_dt = ephem.Date(next_sunrise_utc + (timezone/24.0)).datetime()
-            next_sunrise_str = next_sunrise_dt.strftime("%H:%M:%S")
-        except:
-            next_sunrise_str = "Calc Error"
-
-        # End Times
-        obs_copy = ephem.Observer(); obs_copy.lat, obs_copy.lon = str(lat), str(lon); obs_copy.date = utc_dt
-        curr_tithi = self._get_tithi_index(obs_copy)
-        tithi_end_time = self._find_event_end_time(obs_copy, self._get_tithi_index, curr_tithi)
-        
-        obs_copy.date = utc_dt
-        curr_nak = self._get_nak_index(obs_copy)
-        nak_end_time = self._find_event_end_time(obs_copy, self._get_nak_index, curr_nak)
-        
-        obs_copy.date = utc_dt
-        curr_yoga = get_yoga_idx(obs_copy)
-        yoga_end_time = self._find_event_end_time(obs_copy, get_yoga_idx, curr_yoga)
-        
-        obs_copy.date = utc_dt
-        curr_karana = get_karana_idx(obs_copy)
-        karana_end_time = self._find_event_end_time(obs_copy, get_karana_idx, curr_karana)
-        
-        # Moon Nak Entry
-        def find_nak_entry_time(obs, current_nak_idx, step_min=5, max_steps=400):
-            start_date = ephem.Date(obs.date)
-            for i in range(1, max_steps):
-                obs.date = ephem.Date(start_date - (i * step_min / 1440.0))
-                new_val = self._get_nak_index(obs)
-                if new_val != current_nak_idx:
-                    entry_dt = ephem.Date(obs.date + (step_min / 1440.0)).datetime() + timedelta(hours=timezone)
-                    return entry_dt.strftime("%d %b %Y %H:%M:%S")
+    @staticmethod
+    def _format_transition(result, timezone, fmt="%H:%M:%S"):
+        """Format a solver Transition as local time, or "Unknown" if no crossing was found."""
+        if result.time is None:
             return "Unknown"
+        return ephem.Date(result.time + timezone / 24.0).datetime().strftime(fmt)
+
+    @staticmethod
+    def _transition_precision(result):
+        """Precision of a solver Transition in seconds, or None if no crossing was found."""
+        if result.precision_seconds is None:
+            return None
+        return round(result.precision_seconds, 3)
+
+    def calculate_extended_birth_details(self, lat, lon, year, month, day, hour, minute, timezone=5.5, ctx=None):
+        ctx = self._context(ctx, lat, lon, year, month, day, hour, minute, timezone)
+        local_dt, utc_dt = ctx.local_dt, ctx.utc_dt
+        ayanamsa = ctx.ayanamsa
+        sun_lon = ctx.sidereal["Sun"]
+        
+        # Sunrise/Sunset (cached per location grid cell and local date)
+        sun_day = sun_times.get(lat, lon, date(year, month, day), timezone)
+        sunrise_utc = sun_day.sunrise if sun_day.sunrise is not None else ctx.date
+        sunrise_dt = sun_day.local("sunrise", timezone) or local_dt
+        sunset_dt = sun_day.local("sunset", timezone) or local_dt
+
+        # Panchang at Sunrise (one Sun/Moon evaluation for all four limbs)
+        solver = TransitionSolver(lat, lon, ayanamsa_mode=ctx.ayanamsa_mode)
+        solver.prime(ctx.date, sun_lon, ctx.sidereal["Moon"])
+        at_sunrise = solver.indices_at(sunrise_utc)
+        tithi_at_sunrise_idx = at_sunrise["tithi"]
+        nak_at_sunrise_idx = at_sunrise["nakshatra"]
+        yoga_at_sunrise_idx = at_sunrise["yoga"]
+        karana_at_sunrise_idx = at_sunrise["karana"]
         
-        obs_copy.date = utc_dt
-        moon_nak_entry_str = find_nak_entry_time(obs_copy, curr_nak)
+        # Next Sunrise
+        next_sunrise_dt = sun_day.local("next_sunrise", timezone)
+        next_sunrise_str = next_sunrise_dt.strftime("%H:%M:%S") if next_sunrise_dt else "Calc Error"
+
+        # End Times (shared solver: bracketing + false-position refinement)
+        birth_date = ctx.date
+        at_birth = solver.indices_at(birth_date)
+        curr_tithi = at_birth["tithi"]
+        curr_nak = at_birth["nakshatra"]
+        curr_yoga = at_birth["yoga"]
+        curr_karana = at_birth["karana"]
+        
+        tithi_end = solver.find("tithi", birth_date)
+        nak_end = solver.find("nakshatra", birth_date)
+        yoga_end = solver.find("yoga", birth_date)
+        karana_end = solver.find("karana", birth_date)
+        nak_entry = solver.find("nakshatra", birth_date, direction=-1)
+        
+        tithi_end_time = self._format_transition(tithi_end, timezone)
+        nak_end_time = self._format_transition(nak_end, timezone)
+        yoga_end_time = self._format_transition(yoga_end, timezone)
+        karana_end_time = self._format_transition(karana_end, timezone)
+        moon_nak_entry_str = self._format_transition(nak_entry, timezone, "%d %b %Y %H:%M:%S")
         
         # Avakhada
-        moon = ephem.Moon(); moon.compute(obs)
-        moon_ecl = ephem.Ecliptic(moon)
-        moon_lon = (math.degrees(moon_ecl.lon) - ayanamsa) % 360
+        moon_lon = ctx.sidereal["Moon"]
         nak_idx = int(moon_lon / 13.333333)
         pada = int((moon_lon % 13.333333) / 3.333333) + 1
         sign_idx = int(moon_lon / 30) + 1
@@ -292,10 +259,9 @@ class AstrologyService:
         bhayat_str = f"{int(bhayat_ghatis)}:{int((bhayat_ghatis%1)*60):02d} ghatis"
         bhabhog_str = f"{int(bhabhog_ghatis)}:{int((bhabhog_ghatis%1)*60):02d} ghatis"
 
-        lords = ["Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury"]
-        years = [7, 20, 6, 10, 7, 18, 16, 19, 17]
-        lord = lords[nak_idx % 9]
-        total_dur = years[nak_idx % 9]
+        ref = reference_data.get()
+        lord = ref.nakshatra_lords[nak_idx]
+        total_dur = ref.vimshottari["periods"][lord]
         balance_years = (1 - (moon_deg_in_nak / nak_len)) * total_dur
         y = int(balance_years)
         m = int((balance_years - y) * 12)
@@ -308,28 +274,14 @@ class AstrologyService:
         lmt_corr_min = diff_deg * 4
         
         # Maps
-        tithi_list = ["Pratipada", "Dwitiya", "Tritiya", "Chaturthi", "Panchami", "Shashthi", 
-            "Saptami", "Ashtami", "Navami", "Dashami", "Ekadashi", "Dwadashi", 
-            "Trayodashi", "Chaturdashi", "Purnima", "Pratipada", "Dwitiya", "Tritiya", "Chaturthi", "Panchami", "Shashthi", "Saptami", "Ashtami", "Navami", "Dashami", "Ekadashi", "Dwadashi", "Trayodashi", "Chaturdashi", "Amavasya"]
-        tithi_name = tithi_list[(curr_tithi - 1) % 30]
+        tithi_name = TITHI_NAMES[(curr_tithi - 1) % 30]
         paksha = "Shukla" if curr_tithi <= 15 else "Krishna"
-        
-        nak_list = ["Ashwini", "Bharani", "Krittika", "Rohini", "Mrigashira", "Ardra", 
-            "Punarvasu", "Pushya", "Ashlesha", "Magha", "Purva Phalguni", "Uttara Phalguni",
-            "Hasta", "Chitra", "Swati", "Vishakha", "Anuradha", "Jyeshtha",
-            "Mula", "Purva Ashadha", "Uttara Ashadha", "Shravana", "Dhanishta", 
-            "Shatabhisha", "Purva Bhadrapada", "Uttara Bhadrapada", "Revati"]
-        nak_name = nak_list[nak_idx]
-        
-        yogas = ["Vishkumbha", "Priti", "Ayushman", "Saubhagya", "Sobhana", "Atiganda", "Sukarma", "Dhriti", "Shula", "Ganda", "Vriddhi", "Dhruva", "Vyaghata", "Harshan", "Vajra", "Siddhi", "Vyatipata", "Variyan", "Parigha", "Shiva", "Siddha", "Sadhya", "Shubha", "Shukla", "Brahma", "Indra", "Vaidhriti"]
-        yoga_name = yogas[(curr_yoga - 1) % 27]
-        
-        karanas = ["Bava", "Balava", "Kaulava", "Taitila", "Gara", "Vanija", "Vishti", "Shakuni", "Chatushpada", "Naga", "Kimstughna"]
-        karana_name = karanas[(curr_karana - 1) % 7] if curr_karana < 57 else karanas[7 + ((curr_karana-57)%4)]
+        nak_name = ref.nakshatras[nak_idx]
+        yoga_name = YOGA_NAMES[(curr_yoga - 1) % 27]
+        karana_name = self._karana_name(curr_karana)
         
         # Tamil
-        tamil_months = ["Chithirai", "Vaikasi", "Aani", "Aadi", "Avani", "Puratasi", "Aippasi", "Karthigai", "Margazhi", "Thai", "Maasi", "Panguni"]
-        tamil_month_real = tamil_months[int(sun_lon / 30) % 12]
+        tamil_month_real = TAMIL_MONTHS[int(sun_lon / 30) % 12]
 
         gmt_at_birth = utc_dt.strftime("%H:%M:%S")
         try:
@@ -338,8 +290,7 @@ class AstrologyService:
             ishtkaal_str = "00:00:00"
 
         # Lagna
-        hours_from_6 = (hour + minute/60.0) - 6.0
-        lagna_sid = (sun_lon + (hours_from_6 * 15)) % 360
+        lagna_sid = ctx.ascendant
         lagna_sign_idx, lagna_sign_name = self._get_zodiac_sign(lagna_sid)
         lagna_deg = lagna_sid % 30
         lagna_str = f"{lagna_sign_name} {int(lagna_deg)}° {int((lagna_deg % 1)*60)}'"
@@ -359,7 +310,7 @@ class AstrologyService:
                 "gmt_at_birth": gmt_at_birth,
                 "lmt_correction": f"{lmt_corr_min:.1f} min",
                 "local_mean_time": f"{(local_dt + timedelta(minutes=lmt_corr_min)).strftime('%H:%M:%S')}",
-                "sidereal_time": str(obs.sidereal_time()),
+                "sidereal_time": str(ephem.hours(ctx.sidereal_time)),
                 "ishtkaal": ishtkaal_str,
                 "sunsign_western": self._get_western_sunsign(local_dt),
                 "lagna": lagna_str
@@ -367,9 +318,9 @@ class AstrologyService:
             "family_particulars": { "grandfather": "", "father": "", "mother": "", "caste": "", "gotra": "" },
             "avakhada_chakra": avakhada,
             "tamil_calendar": {
-                "tamil_year": ASTRO_LOOKUPS["samvatsaras"][(year - 1987) % 60],
+                "tamil_year": ref.lookups["samvatsaras"][(year - 1987) % 60],
                 "tamil_month": tamil_month_real,
-                "tamil_weekday": ["Thingal", "Chevvaai", "Pudhan", "Viyaazhan", "Velli", "Sani", "Nyaairu"][local_dt.weekday()], 
+                "tamil_weekday": TAMIL_WEEKDAYS[local_dt.weekday()],
                 "tamil_date": str(day)
             },
             "hindu_calendar": {
@@ -384,39 +335,36 @@ class AstrologyService:
                 "karana_end_time": karana_end_time
             },
             "panchang": {
-                "tithi": { "at_sunrise": tithi_list[(tithi_at_sunrise_idx - 1) % 30], "ending_time": tithi_end_time, "at_birth": tithi_name },
-                "nakshatra": { "at_sunrise": nak_list[nak_at_sunrise_idx], "ending_time": nak_end_time, "at_birth": nak_name },
-                "yoga": { "at_sunrise": yogas[(yoga_at_sunrise_idx - 1) % 27], "ending_time": yoga_end_time, "at_birth": yoga_name },
-                "karana": { "at_sunrise": karanas[(karana_at_sunrise_idx - 1) % 7], "ending_time": karana_end_time, "at_birth": karana_name }
+                "tithi": { "at_sunrise": TITHI_NAMES[(tithi_at_sunrise_idx - 1) % 30], "ending_time": tithi_end_time, "at_birth": tithi_name,
+                           "precision_seconds": self._transition_precision(tithi_end) },
+                "nakshatra": { "at_sunrise": ref.nakshatras[nak_at_sunrise_idx], "ending_time": nak_end_time, "at_birth": nak_name,
+                               "precision_seconds": self._transition_precision(nak_end) },
+                "yoga": { "at_sunrise": YOGA_NAMES[(yoga_at_sunrise_idx - 1) % 27], "ending_time": yoga_end_time, "at_birth": yoga_name,
+                          "precision_seconds": self._transition_precision(yoga_end) },
+                "karana": { "at_sunrise": self._karana_name(karana_at_sunrise_idx), "ending_time": karana_end_time, "at_birth": karana_name,
+                            "precision_seconds": self._transition_precision(karana_end) }
             },
             "sun_moon_params": {
                 "sunrise": sunrise_dt.strftime("%H:%M:%S"),
                 "sunset": sunset_dt.strftime("%H:%M:%S"),
                 "next_day_sunrise": next_sunrise_str,
                 "moon_nak_entry": moon_nak_entry_str,
+                "moon_nak_entry_precision_seconds": self._transition_precision(nak_entry),
                 "moon_nak_exit": nak_end_time,
                 "bhayat": bhayat_str,
                 "bhabhog": bhabhog_str,
                 "dasha_balance": dasha_balance,
-                "ayanamsha": f"{ayanamsa:.2f} Lahiri"
+                "ayanamsha": f"{ayanamsa:.2f} {ayanamsa_label(ctx.ayanamsa_mode)}"
             }
         }
 
     def _calculate_avakhada_full(self, nak_idx, sign_idx, pada):
-        nak_data = ASTRO_LOOKUPS["nakshatras"][nak_idx]
-        rashi_data = ASTRO_LOOKUPS["rashis"][sign_idx - 1]
+        ref = reference_data.get()
+        nak_data = ref.lookups["nakshatras"][nak_idx]
+        rashi_data = ref.lookups["rashis"][sign_idx - 1]
         
         naamakshar = nak_data["padas"][pada - 1] if pada <= 4 else "?"
-        
-        paya_map = ASTRO_LOOKUPS.get("paya", {})
-        if nak_idx in paya_map.get("gold", []):
-            paya = "Gold"
-        elif nak_idx in paya_map.get("silver", []):
-            paya = "Silver"
-        elif nak_idx in paya_map.get("copper", []):
-            paya = "Copper"
-        else:
-            paya = "Iron"
+        paya = ref.nakshatra_payas[nak_idx]
         
         hansak = rashi_data.get("element", "Fire").capitalize()
         
@@ -451,19 +399,36 @@ class AstrologyService:
 
     # ============ CHART CALCULATIONS ============
     
-    def calculate_lagna_chart(self, lat, lon, year, month, day, hour, minute, timezone=5.5):
+    def calculate_lagna_chart(self, lat, lon, year, month, day, hour, minute, timezone=5.5, ctx=None):
         """
         Calculate Lagna Chart (D1) - planets placed in houses from Ascendant.
         Returns house-wise planet placement for chart visualization.
         """
-        planets = self._calculate_planets_full(lat, lon, year, month, day, hour, minute, timezone)
-        return self._create_chart_data(planets, "D1", "Lagna Chart (Birth Chart)")
+        ctx = self._context(ctx, lat, lon, year, month, day, hour, minute, timezone)
+        planets = self._calculate_planets_full(lat, lon, year, month, day, hour, minute, timezone, ctx=ctx)
+        chart = self._create_chart_data(planets, "D1", "Lagna Chart (Birth Chart)")
+        chart["house_system"] = self.house_system
+        chart["cusps"] = self.calculate_house_cusps(lat, lon, year, month, day, hour, minute, timezone, ctx=ctx)
+        return chart
+
+    def calculate_house_cusps(self, lat, lon, year, month, day, hour, minute, timezone=5.5, ctx=None, system=None):
+        """
+        Sidereal house cusps for the service's house system (or `system`).
+        For Sripati these are the bhava madhyas.
+        """
+        ctx = self._context(ctx, lat, lon, year, month, day, hour, minute, timezone)
+        system = system or self.house_system
+        return [
+            {"house": i + 1, "sign": self._get_zodiac_sign(c)[1], "absolute_degree": round(c, 4),
+             "degrees": self.decimal_to_dms(c % 30)}
+            for i, c in enumerate(ctx.house_cusps(system))
+        ]
     
-    def calculate_moon_chart(self, lat, lon, year, month, day, hour, minute, timezone=5.5):
+    def calculate_moon_chart(self, lat, lon, year, month, day, hour, minute, timezone=5.5, ctx=None):
         """
         Calculate Moon Chart (Chandra Kundali) - houses counted from Moon sign.
         """
-        planets = self._calculate_planets_full(lat, lon, year, month, day, hour, minute, timezone)
+        planets = self._calculate_planets_full(lat, lon, year, month, day, hour, minute, timezone, ctx=ctx)
         
         # Find Moon's sign
         moon = next((p for p in planets if p["planet"] == "Moon"), None)
@@ -478,30 +443,23 @@ class AstrologyService:
         
         return self._create_chart_data(planets, "Moon", "Moon Chart (Chandra Kundali)")
     
-    def calculate_navamsha_chart(self, lat, lon, year, month, day, hour, minute, timezone=5.5):
+    def calculate_navamsha_chart(self, lat, lon, year, month, day, hour, minute, timezone=5.5, ctx=None):
         """
         Calculate Navamsha Chart (D9) - each sign divided into 9 parts of 3°20'.
         """
-        planets = self._calculate_planets_full(lat, lon, year, month, day, hour, minute, timezone)
+        planets = self._calculate_planets_full(lat, lon, year, month, day, hour, minute, timezone, ctx=ctx)
         
-        # Load navamsha mapping
-        chart_defs_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'chart_definitions.json')
-        with open(chart_defs_path, 'r') as f:
-            chart_defs = json.load(f)
-        navamsha_map = chart_defs["navamsha_mapping"]
-        
-        signs = ["Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo", 
-                 "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"]
+        ref = reference_data.get()
         
         d9_planets = []
         for p in planets:
             degree_in_sign = p["degree_decimal"]
             navamsha_num = int(degree_in_sign / (30/9))  # 0-8
             
-            # Get D9 sign from mapping
+            # Get D9 sign from the 12 x 9 navamsha table
             d1_sign = p["sign"]
-            d9_sign = navamsha_map[d1_sign][navamsha_num]
-            d9_sign_id = signs.index(d9_sign) + 1
+            d9_sign_id = int(ref.navamsha[p["sign_id"] - 1, navamsha_num]) + 1
+            d9_sign = ref.signs[d9_sign_id - 1]
             
             d9_planets.append({
                 "planet": p["planet"],
@@ -563,32 +521,19 @@ class AstrologyService:
     
     def _get_planet_abbr(self, planet_name):
         """Get abbreviated planet name for chart display."""
-        abbr_map = {
-            "Ascendant": "As",
-            "Sun": "Su",
-            "Moon": "Mo",
-            "Mars": "Ma",
-            "Mercury": "Me",
-            "Jupiter": "Ju",
-            "Venus": "Ve",
-            "Saturn": "Sa",
-            "Rahu": "Ra",
-            "Ketu": "Ke"
-        }
-        return abbr_map.get(planet_name, planet_name[:2])
+        return PLANET_ABBR.get(planet_name, planet_name[:2])
     
-    def get_all_charts(self, lat, lon, year, month, day, hour, minute, timezone=5.5):
+    def get_all_charts(self, lat, lon, year, month, day, hour, minute, timezone=5.5, ctx=None):
         """
         Get all three main charts: Lagna, Moon, and Navamsha.
+        All three share one ephemeris pass.
         """
-        lagna = self.calculate_lagna_chart(lat, lon, year, month, day, hour, minute, timezone)
-        moon = self.calculate_moon_chart(lat, lon, year, month, day, hour, minute, timezone)
-        navamsha = self.calculate_navamsha_chart(lat, lon, year, month, day, hour, minute, timezone)
+        ctx = self._context(ctx, lat, lon, year, month, day, hour, minute, timezone)
+        lagna = self.calculate_lagna_chart(lat, lon, year, month, day, hour, minute, timezone, ctx=ctx)
+        moon = self.calculate_moon_chart(lat, lon, year, month, day, hour, minute, timezone, ctx=ctx)
+        navamsha = self.calculate_navamsha_chart(lat, lon, year, month, day, hour, minute, timezone, ctx=ctx)
         
-        # Load descriptions
-        chart_defs_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'chart_definitions.json')
-        with open(chart_defs_path, 'r') as f:
-            chart_defs = json.load(f)
+        chart_defs = reference_data.get().chart_definitions
         
         return {
             "lagna_chart": {
@@ -607,117 +552,60 @@ class AstrologyService:
 
     # ============ VIMSHOTTARI DASHA CALCULATIONS ============
     
-    def calculate_vimshottari_dasha(self, lat, lon, year, month, day, hour, minute, timezone=5.5):
+    def calculate_vimshottari_dasha(self, lat, lon, year, month, day, hour, minute, timezone=5.5, ctx=None):
         """
         Calculate complete Vimshottari Dasha with Mahadasha and Antardasha.
         Returns full dasha table from birth.
         """
-        # Load dasha data
-        dasha_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'dasha_data.json')
-        with open(dasha_path, 'r') as f:
-            dasha_data = json.load(f)
-        
-        vimshottari = dasha_data["vimshottari"]
-        lords = vimshottari["lords"]
-        periods = vimshottari["periods"]
-        
         # Get Moon position to determine birth nakshatra
-        planets = self._calculate_planets_full(lat, lon, year, month, day, hour, minute, timezone)
+        planets = self._calculate_planets_full(lat, lon, year, month, day, hour, minute, timezone, ctx=ctx)
         moon = next((p for p in planets if p["planet"] == "Moon"), None)
         
         if not moon:
             return {"error": "Moon position not found"}
         
-        # Get nakshatra lord
-        nakshatra_name = moon["nakshatra"]
-        nakshatra_lords = vimshottari["nakshatra_lords"]
-        birth_lord = nakshatra_lords.get(nakshatra_name, "Ketu")
-        
-        # Calculate dasha balance at birth
-        moon_lon = moon["absolute_degree"]
-        nak_len = 360 / 27  # 13.333... degrees
-        degree_in_nakshatra = moon_lon % nak_len
-        elapsed_fraction = degree_in_nakshatra / nak_len
-        
-        birth_lord_period = periods[birth_lord]
-        balance_years = birth_lord_period * (1 - elapsed_fraction)
-        
-        # Birth date
-        birth_date = datetime(year, month, day, hour, minute)
-        
-        # Generate Mahadasha sequence starting from birth lord
-        start_idx = lords.index(birth_lord)
+        # All levels come from the same dasha tree boundaries, so a sub-period
+        # starts exactly when its parent does (see calculate_dasha_periods_deep)
+        tree = DashaTree.from_moon(datetime(year, month, day, hour, minute), moon["absolute_degree"], moon["nakshatra"])
+        periods = reference_data.get().vimshottari["periods"]
+        balance_years = tree.balance_years
         
         mahadashas = []
-        current_date = birth_date
-        
-        # First mahadasha (partial)
-        first_md_end = self._add_years(current_date, balance_years)
-        mahadashas.append({
-            "lord": birth_lord,
-            "start_date": current_date.strftime("%d-%m-%Y %H:%M"),
-            "end_date": first_md_end.strftime("%d-%m-%Y %H:%M"),
-            "years": round(balance_years, 2),
-            "is_partial": True,
-            "antardashas": self._calculate_antardashas(birth_lord, current_date, balance_years, lords, periods)
-        })
-        current_date = first_md_end
-        
-        # Subsequent full mahadashas (complete 120-year cycle)
-        for i in range(1, 9):  # 8 more mahadashas
-            lord = lords[(start_idx + i) % 9]
-            years = periods[lord]
-            end_date = self._add_years(current_date, years)
-            
+        for i, md in enumerate(tree.mahadashas):
             mahadashas.append({
-                "lord": lord,
-                "start_date": current_date.strftime("%d-%m-%Y %H:%M"),
-                "end_date": end_date.strftime("%d-%m-%Y %H:%M"),
-                "years": years,
-                "is_partial": False,
-                "antardashas": self._calculate_antardashas(lord, current_date, years, lords, periods)
+                "lord": md.lord,
+                "start_date": md.start_datetime.strftime("%d-%m-%Y %H:%M"),
+                "end_date": md.end_datetime.strftime("%d-%m-%Y %H:%M"),
+                "years": round(balance_years, 2) if i == 0 else periods[md.lord],
+                "is_partial": i == 0,
+                "antardashas": [
+                    {
+                        "lord": ad.lord,
+                        "start_date": ad.start_datetime.strftime("%d-%m-%Y %H:%M"),
+                        "end_date": ad.end_datetime.strftime("%d-%m-%Y %H:%M"),
+                        "duration_years": round(ad.years, 3)
+                    }
+                    for ad in md.children()
+                ]
             })
-            current_date = end_date
         
         return {
             "dasha_system": "Vimshottari",
-            "birth_nakshatra": nakshatra_name,
-            "birth_lord": birth_lord,
+            "birth_nakshatra": moon["nakshatra"],
+            "birth_lord": tree.birth_lord,
             "balance_at_birth": f"{int(balance_years)}y {int((balance_years % 1) * 12)}m {int(((balance_years % 1) * 12 % 1) * 30)}d",
             "mahadashas": mahadashas
         }
     
-    def _calculate_antardashas(self, mahadasha_lord, md_start, md_years, lords, periods):
-        """Calculate Antardashas (sub-periods) within a Mahadasha."""
-        antardashas = []
-        total_period_years = 120
-        
-        # Start from mahadasha lord
-        start_idx = lords.index(mahadasha_lord)
-        current_date = md_start
-        
-        for i in range(9):
-            ad_lord = lords[(start_idx + i) % 9]
-            # Antardasha duration = (MD years * AD lord years) / 120
-            ad_years = (md_years * periods[ad_lord]) / total_period_years
-            end_date = self._add_years(current_date, ad_years)
-            
-            antardashas.append({
-                "lord": ad_lord,
-                "start_date": current_date.strftime("%d-%m-%Y %H:%M"),
-                "end_date": end_date.strftime("%d-%m-%Y %H:%M"),
-                "duration_years": round(ad_years, 3)
-            })
-            current_date = end_date
-        
-        return antardashas
-    
-    def _add_years(self, dt, years):
-        """Add fractional years to a datetime."""
-        days = years * 365.25
-        return dt + timedelta(days=days)
+    def dasha_tree(self, lat, lon, year, month, day, hour, minute, timezone=5.5, ctx=None):
+        """Lazy Vimshottari DashaTree (services/dasha_tree.py) of a birth; None without a Moon."""
+        planets = self._calculate_planets_full(lat, lon, year, month, day, hour, minute, timezone, ctx=ctx)
+        moon = next((p for p in planets if p["planet"] == "Moon"), None)
+        if not moon:
+            return None
+        return DashaTree.from_moon(datetime(year, month, day, hour, minute), moon["absolute_degree"], moon["nakshatra"])
     
-    def get_current_dasha(self, lat, lon, year, month, day, hour, minute, timezone=5.5, as_of_date=None):
+    def get_current_dasha(self, lat, lon, year, month, day, hour, minute, timezone=5.5, as_of_date=None, ctx=None):
         """
         Get the current running Mahadasha, Antardasha, Pratyantardasha, and Sookshma.
         """
@@ -726,162 +614,69 @@ class AstrologyService:
         elif isinstance(as_of_date, str):
             as_of_date = datetime.strptime(as_of_date, "%d-%m-%Y")
         
-        # Load dasha config
-        dasha_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'dasha_data.json')
-        with open(dasha_path, 'r') as f:
-            dasha_data = json.load(f)
-        
-        vimshottari = dasha_data["vimshottari"]
-        lords = vimshottari["lords"]
-        periods = vimshottari["periods"]
-        effects = dasha_data.get("dasha_effects", {})
-        
-        # Get birth nakshatra lord and balance
-        planets = self._calculate_planets_full(lat, lon, year, month, day, hour, minute, timezone)
-        moon = next((p for p in planets if p["planet"] == "Moon"), None)
-        
-        if not moon:
+        tree = self.dasha_tree(lat, lon, year, month, day, hour, minute, timezone, ctx=ctx)
+        if tree is None:
             return {"error": "Moon position not found"}
         
-        nakshatra_name = moon["nakshatra"]
-        nakshatra_lords = vimshottari["nakshatra_lords"]
-        birth_lord = nakshatra_lords.get(nakshatra_name, "Ketu")
-        
-        # Calculate balance
-        moon_lon = moon["absolute_degree"]
-        nak_len = 360 / 27
-        degree_in_nakshatra = moon_lon % nak_len
-        elapsed_fraction = degree_in_nakshatra / nak_len
-        
-        birth_date = datetime(year, month, day, hour, minute)
-        balance_years = periods[birth_lord] * (1 - elapsed_fraction)
-        
-        # Find current Mahadasha
-        start_idx = lords.index(birth_lord)
-        current_date = birth_date
-        
-        current_md = None
-        md_years = 0
-        
-        # First check partial mahadasha
-        first_md_end = self._add_years(current_date, balance_years)
-        if current_date <= as_of_date <= first_md_end:
-            current_md = {"lord": birth_lord, "start": current_date, "end": first_md_end, "years": balance_years}
-        else:
-            current_date = first_md_end
-            for i in range(1, 9):
-                lord = lords[(start_idx + i) % 9]
-                years = periods[lord]
-                end_date = self._add_years(current_date, years)
-                if current_date <= as_of_date <= end_date:
-                    current_md = {"lord": lord, "start": current_date, "end": end_date, "years": years}
-                    break
-                current_date = end_date
-        
-        if not current_md:
+        running = tree.period_at(as_of_date, depth=4)
+        if not running:
             return {"message": "Date is outside calculated dasha range"}
         
-        # Find Antardasha within Mahadasha
-        md_lord = current_md["lord"]
-        md_start = current_md["start"]
-        md_years = current_md["years"]
-        md_lord_idx = lords.index(md_lord)
-        
-        current_ad = None
-        ad_start = md_start
-        
-        for i in range(9):
-            ad_lord = lords[(md_lord_idx + i) % 9]
-            ad_years = (md_years * periods[ad_lord]) / 120
-            ad_end = self._add_years(ad_start, ad_years)
-            
-            if ad_start <= as_of_date <= ad_end:
-                current_ad = {"lord": ad_lord, "start": ad_start, "end": ad_end, "years": ad_years}
-                break
-            ad_start = ad_end
-        
-        # Find Pratyantardasha within Antardasha
-        current_prad = None
-        if current_ad:
-            ad_lord = current_ad["lord"]
-            ad_lord_idx = lords.index(ad_lord)
-            prad_start = current_ad["start"]
-            
-            for i in range(9):
-                prad_lord = lords[(ad_lord_idx + i) % 9]
-                prad_years = (current_ad["years"] * periods[prad_lord]) / 120
-                prad_end = self._add_years(prad_start, prad_years)
-                
-                if prad_start <= as_of_date <= prad_end:
-                    current_prad = {"lord": prad_lord, "start": prad_start, "end": prad_end, "years": prad_years}
-                    break
-                prad_start = prad_end
-        
-        # Find Sookshma within Pratyantardasha
-        current_sookshm = None
-        if current_prad:
-            prad_lord = current_prad["lord"]
-            prad_lord_idx = lords.index(prad_lord)
-            sookshm_start = current_prad["start"]
-            
-            for i in range(9):
-                sookshm_lord = lords[(prad_lord_idx + i) % 9]
-                sookshm_years = (current_prad["years"] * periods[sookshm_lord]) / 120
-                sookshm_end = self._add_years(sookshm_start, sookshm_years)
-                
-                if sookshm_start <= as_of_date <= sookshm_end:
-                    current_sookshm = {"lord": sookshm_lord, "start": sookshm_start, "end": sookshm_end, "years": sookshm_years}
-                    break
-                sookshm_start = sookshm_end
+        effects = reference_data.get().dasha_effects
         
         # Format response
         result = {
             "as_of_date": as_of_date.strftime("%d-%m-%Y"),
             "note": "All dates indicate dasha end date",
-            "mahadasha": {
-                "lord": current_md["lord"],
-                "start_date": current_md["start"].strftime("%d-%m-%Y %H:%M"),
-                "end_date": current_md["end"].strftime("%d-%m-%Y %H:%M"),
-                "effects": effects.get(current_md["lord"], {})
-            }
         }
-        
-        if current_ad:
-            result["antardasha"] = {
-                "lord": current_ad["lord"],
-                "start_date": current_ad["start"].strftime("%d-%m-%Y %H:%M"),
-                "end_date": current_ad["end"].strftime("%d-%m-%Y %H:%M"),
-                "effects": effects.get(current_ad["lord"], {})
-            }
-        
-        if current_prad:
-            result["pratyantardasha"] = {
-                "lord": current_prad["lord"],
-                "start_date": current_prad["start"].strftime("%d-%m-%Y %H:%M"),
-                "end_date": current_prad["end"].strftime("%d-%m-%Y %H:%M")
-            }
-        
-        if current_sookshm:
-            result["sookshma_dasha"] = {
-                "lord": current_sookshm["lord"],
-                "start_date": current_sookshm["start"].strftime("%d-%m-%Y %H:%M"),
-                "end_date": current_sookshm["end"].strftime("%d-%m-%Y %H:%M")
+        for period, key in zip(running, ("mahadasha", "antardasha", "pratyantardasha", "sookshma_dasha")):
+            result[key] = {
+                "lord": period.lord,
+                "start_date": period.start_datetime.strftime("%d-%m-%Y %H:%M"),
+                "end_date": period.end_datetime.strftime("%d-%m-%Y %H:%M"),
             }
+            if period.level <= 2:
+                result[key]["effects"] = thaw(effects.get(period.lord, {}))
         
         # Combined period string
-        combined = current_md["lord"]
-        if current_ad:
-            combined += f"-{current_ad['lord']}"
-        if current_prad:
-            combined += f"-{current_prad['lord']}"
-        if current_sookshm:
-            combined += f"-{current_sookshm['lord']}"
-        
-        result["combined_period"] = combined
+        result["combined_period"] = "-".join(period.lord for period in running)
         
         return result
     
-    def calculate_dasha_periods_deep(self, lat, lon, year, month, day, hour, minute, timezone=5.5, depth=3):
+    def calculate_dasha_window(self, lat, lon, year, month, day, hour, minute, timezone=5.5,
+                               start=None, end=None, depth=2, ctx=None):
+        """
+        Vimshottari periods at level `depth` (1 = Mahadasha ... 5 = Prana)
+        overlapping [start, end]; dates are DD-MM-YYYY or DD-MM-YYYY HH:MM.
+        start defaults to now, end to start (the periods running at start).
+        Only the branches of the lazy dasha tree that overlap the window are expanded.
+        """
+        if not 1 <= depth <= DASHA_MAX_DEPTH:
+            raise ValueError(f"depth must be between 1 and {DASHA_MAX_DEPTH}")
+        window_start = self._parse_dasha_date(start) if start else datetime.now().replace(second=0, microsecond=0)
+        window_end = self._parse_dasha_date(end) if end else window_start
+        if window_end < window_start:
+            raise ValueError("end must not be before start")
+        
+        tree = self.dasha_tree(lat, lon, year, month, day, hour, minute, timezone, ctx=ctx)
+        if tree is None:
+            return {"error": "Moon position not found"}
+        
+        return {
+            "dasha_system": "Vimshottari",
+            "birth_lord": tree.birth_lord,
+            "start": window_start.strftime("%d-%m-%Y %H:%M"),
+            "end": window_end.strftime("%d-%m-%Y %H:%M"),
+            "depth": depth,
+            "level": DASHA_LEVEL_KEYS[depth],
+            "periods": [period.to_dict() for period in tree.periods_between(window_start, window_end, depth)],
+        }
+    
+    @staticmethod
+    def _parse_dasha_date(value):
+        return parse_dasha_date(value)
+    
+    def calculate_dasha_periods_deep(self, lat, lon, year, month, day, hour, minute, timezone=5.5, depth=3, ctx=None):
         """
         Calculate Vimshottari Dasha up to specified depth.
         depth=1: Mahadasha only
@@ -889,71 +684,43 @@ class AstrologyService:
         depth=3: + Pratyantardasha
         depth=4: + Sookshma
         """
-        dasha = self.calculate_vimshottari_dasha(lat, lon, year, month, day, hour, minute, timezone)
+        dasha = self.calculate_vimshottari_dasha(lat, lon, year, month, day, hour, minute, timezone, ctx=ctx)
         
-        if "error" in dasha or depth <= 2:
+        if "error" in dasha or depth == 2:
             return dasha
-        
-        # Load config
-        dasha_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'dasha_data.json')
-        with open(dasha_path, 'r') as f:
-            dasha_data = json.load(f)
-        
-        lords = dasha_data["vimshottari"]["lords"]
-        periods = dasha_data["vimshottari"]["periods"]
-        
-        # Add Pratyantardasha to each Antardasha
-        if depth >= 3:
+        if depth <= 1:
             for md in dasha["mahadashas"]:
-                for ad in md["antardashas"]:
-                    ad["pratyantardashas"] = self._calculate_sub_dashas(
-                        ad["lord"], 
-                        datetime.strptime(ad["start_date"], "%d-%m-%Y %H:%M"),
-                        ad["duration_years"],
-                        lords, periods
-                    )
-                    
-                    # Add Sookshma if depth=4
-                    if depth >= 4:
-                        for prad in ad["pratyantardashas"]:
-                            prad["sookshmas"] = self._calculate_sub_dashas(
-                                prad["lord"],
-                                datetime.strptime(prad["start_date"], "%d-%m-%Y %H:%M"),
-                                prad["duration_years"],
-                                lords, periods
-                            )
+                del md["antardashas"]
+            return dasha
+        
+        # Sub-periods come from the dasha tree rather than re-parsing the formatted dates
+        tree = self.dasha_tree(lat, lon, year, month, day, hour, minute, timezone, ctx=ctx)
+        for md, tree_md in zip(dasha["mahadashas"], tree.mahadashas):
+            for ad, tree_ad in zip(md["antardashas"], tree_md.children()):
+                ad["pratyantardashas"] = [self._sub_dasha(p) for p in tree_ad.children()]
+                if depth >= 4:
+                    for prad, tree_prad in zip(ad["pratyantardashas"], tree_ad.children()):
+                        prad["sookshmas"] = [self._sub_dasha(p) for p in tree_prad.children()]
         
         return dasha
     
-    def _calculate_sub_dashas(self, parent_lord, start_date, parent_years, lords, periods):
-        """Calculate sub-periods for any dasha level."""
-        sub_dashas = []
-        lord_idx = lords.index(parent_lord)
-        current_date = start_date
-        
-        for i in range(9):
-            sub_lord = lords[(lord_idx + i) % 9]
-            sub_years = (parent_years * periods[sub_lord]) / 120
-            end_date = self._add_years(current_date, sub_years)
-            
-            sub_dashas.append({
-                "lord": sub_lord,
-                "start_date": current_date.strftime("%d-%m-%Y %H:%M"),
-                "end_date": end_date.strftime("%d-%m-%Y %H:%M"),
-                "duration_years": round(sub_years, 6)
-            })
-            current_date = end_date
-        
-        return sub_dashas
+    @staticmethod
+    def _sub_dasha(period):
+        return {
+            "lord": period.lord,
+            "start_date": period.start_datetime.strftime("%d-%m-%Y %H:%M"),
+            "end_date": period.end_datetime.strftime("%d-%m-%Y %H:%M"),
+            "duration_years": round(period.years, 6)
+        }
 
     # ============ ASCENDANT REPORT ============
     
-    def get_ascendant_report(self, lat, lon, year, month, day, hour, minute, timezone=5.5):
+    def get_ascendant_report(self, lat, lon, year, month, day, hour, minute, timezone=5.5, ctx=None):
         """
         Get detailed Ascendant Report based on rising sign.
         """
         # Calculate ascendant
-        planets = self._calculate_planets_full(lat, lon, year, month, day, hour, minute, timezone)
+        planets = self._calculate_planets_full(lat, lon, year, month, day, hour, minute, timezone, ctx=ctx)
         ascendant = next((p for p in planets if p["planet"] == "Ascendant"), None)
         
         if not ascendant:
@@ -961,12 +728,7 @@ class AstrologyService:
         
         asc_sign = ascendant["sign"]
         
-        # Load ascendant reports
-        report_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'ascendant_reports.json')
-        with open(report_path, 'r') as f:
-            reports = json.load(f)
-        
-        report = reports["ascendant_reports"].get(asc_sign, {})
+        report = thaw(reference_data.get().ascendant_reports["ascendant_reports"].get(asc_sign, {}))
         
         if not report:
             return {"error": f"Report not found for {asc_sign}"}
@@ -978,3 +740,179 @@ class AstrologyService:
             "nakshatra_pada": ascendant.get("nakshatra_pada", 1),
             "report": report
         }
+
+    # ============ FULL KUNDALI ============
+
+    def calculate_full(self, lat, lon, year, month, day, hour, minute, timezone=5.5,
+                       sections=None, dasha_depth=2, as_of_date=None, place="Unknown", ctx=None,
+                       keep_details=False):
+        """
+        Any subset of FULL_SECTIONS from one shared ephemeris pass, with the
+        time spent on each under "timings_ms".
+
+        basic            -> basic_details, ghat_chakra, astrological_details, planets, dasha_balance
+        panchang         -> panchang_details
+        charts           -> charts (Lagna, Moon, Navamsha)
+        dasha            -> dasha, Vimshottari to `dasha_depth` (1-4)
+        current_dasha    -> current_dasha as of `as_of_date` (DD-MM-YYYY, default today)
+        ascendant_report -> ascendant_report
+
+        With `keep_details`, the calculate_extended_birth_details result the
+        basic and panchang sections are derived from is returned as well,
+        under "birth_details".
+        """
+        sections = FULL_SECTIONS if sections is None else tuple(sections)
+        unknown = [name for name in sections if name not in FULL_SECTIONS]
+        if unknown:
+            raise ValueError(f"Unknown section(s): {', '.join(unknown)}. Valid: {', '.join(FULL_SECTIONS)}")
+
+        timings = {}
+        def timed(name, fn):
+            start = perf_counter()
+            value = fn()
+            timings[name] = round((perf_counter() - start) * 1000, 3)
+            return value
+
+        birth = (lat, lon, year, month, day, hour, minute, timezone)
+        ctx = timed("ephemeris", lambda: self._context(ctx, *birth))
+        result = {}
+
+        if "basic" in sections or "panchang" in sections or keep_details:
+            details = timed("birth_details", lambda: self.calculate_extended_birth_details(*birth, ctx=ctx))
+        if "basic" in sections or "panchang" in sections:
+            planets = timed("planets", lambda: self._calculate_planets_full(*birth, ctx=ctx))
+            moon = next((p for p in planets if p["planet"] == "Moon"), None)
+            basic = {}
+            if "basic" in sections:
+                basic = timed("basic", lambda: self._basic_section(birth, place, details, planets, moon))
+                result["basic_details"] = basic.pop("basic_details")
+            if "panchang" in sections:
+                result["panchang_details"] = timed("panchang", lambda: self._panchang_section(birth, details, moon))
+            result.update(basic)
+        if "charts" in sections:
+            result["charts"] = timed("charts", lambda: self.get_all_charts(*birth, ctx=ctx))
+        if "dasha" in sections:
+            result["dasha"] = timed("dasha", lambda: self.calculate_dasha_periods_deep(*birth, depth=dasha_depth, ctx=ctx))
+        if "current_dasha" in sections:
+            result["current_dasha"] = timed("current_dasha", lambda: self.get_current_dasha(*birth, as_of_date=as_of_date, ctx=ctx))
+        if "ascendant_report" in sections:
+            result["ascendant_report"] = timed("ascendant_report", lambda: self.get_ascendant_report(*birth, ctx=ctx))
+        if keep_details:
+            result["birth_details"] = details
+
+        result["timings_ms"] = timings
+        return result
+
+    @staticmethod
+    def _format_timezone(timezone):
+        sign = "-" if timezone < 0 else "+"
+        total = round(abs(timezone) * 60)
+        return f"{sign}{total // 60:02d}:{total % 60:02d}"
+
+    def _basic_section(self, birth, place, details, planets, moon):
+        lat, lon, year, month, day, hour, minute, timezone = birth
+        asc = next((p for p in planets if p["planet"] == "Ascendant"), None)
+        avakhada = details["avakhada_chakra"]
+        sun_moon = details["sun_moon_params"]
+        return {
+            "basic_details": {
+                "date_of_birth": f"{day:02d}/{month:02d}/{year}",
+                "time_of_birth": f"{hour:02d}:{minute:02d}",
+                "place_of_birth": place or "Unknown",
+                "latitude": details["birth_particulars"]["lat"],
+                "longitude": details["birth_particulars"]["lon"],
+                "timezone": self._format_timezone(timezone),
+                "ayanamsha": sun_moon["ayanamsha"],
+                "sunrise": sun_moon["sunrise"],
+                "sunset": sun_moon["sunset"]
+            },
+            "ghat_chakra": {
+                "varna": avakhada["varna"],
+                "vashya": avakhada["vashya"],
+                "yoni": avakhada["yoni"],
+                "gan": avakhada["gana"],
+                "nadi": avakhada["nadi"]
+            },
+            "astrological_details": {
+                "sign": moon["sign"] if moon else "Unknown",
+                "sign_lord": moon["sign_lord"] if moon else "Unknown",
+                "nakshatra": moon["nakshatra"] if moon else "Unknown",
+                "nakshatra_lord": moon["nakshatra_lord"] if moon else "Unknown",
+                "charan": moon["nakshatra_pada"] if moon else 0,
+                # Yunja (odd/even pada)
+                "yunja": "Poorva" if moon and moon["nakshatra_pada"] <= 2 else "Uttara",
+                "tatva": TATVA_BY_SIGN.get(moon["sign"], "Unknown") if moon else "Unknown",
+                "name_alphabet": avakhada["naamakshar"],
+                "paya": avakhada["paya_nakshatra"],
+                "ascendant": asc["sign"] if asc else "Unknown",
+                "ascendant_lord": asc["sign_lord"] if asc else "Unknown"
+            },
+            "planets": planets,
+            "dasha_balance": sun_moon["dasha_balance"]
+        }
+
+    def _panchang_section(self, birth, details, moon):
+        lat, lon, year, month, day, hour, minute, timezone = birth
+        # Prahar: 3-hour periods counted from sunrise (06:00 where the Sun does not rise)
+        sunrise = sun_times.get(lat, lon, date(year, month, day), timezone).local("sunrise", timezone)
+        sunrise_hour = sunrise.hour + sunrise.minute / 60.0 + sunrise.second / 3600.0 if sunrise else 6.0
+        prahar = int((hour + minute / 60.0 - sunrise_hour) / 3) + 1
+        if prahar < 1: prahar = 8 + prahar
+        panchang = details["panchang"]
+        return {
+            "month": details["tamil_calendar"]["tamil_month"],
+            "tithi": panchang["tithi"]["at_birth"],
+            "day": DAY_LORDS[date(year, month, day).weekday()],
+            "nakshatra": panchang["nakshatra"]["at_birth"],
+            "yog": panchang["yoga"]["at_birth"],
+            "karan": panchang["karana"]["at_birth"],
+            "prahar": prahar,
+            "moon_sign": moon["sign"] if moon else "Unknown"
+        }
+
+    # ============ PANCHANG CALENDAR ============
+
+    def panchang_range(self, lat, lon, start_date, end_date, timezone=5.5, start_event=True):
+        """
+        Sweep local dates start_date..end_date (inclusive) once and yield a
+        time-ordered stream of events: the panchang in force at the start
+        (unless start_event=False, for the later pieces of a range swept in
+        consecutive pieces), then every sunrise, sunset and
+        tithi/nakshatra/yoga/karana transition.
+        """
+        start_utc = ephem.Date(datetime(start_date.year, start_date.month, start_date.day) - timedelta(hours=timezone))
+        end_utc = ephem.Date(datetime(end_date.year, end_date.month, end_date.day) - timedelta(hours=timezone) + timedelta(days=1))
+        local = lambda utc: ephem.Date(utc + timezone / 24.0).datetime().isoformat(timespec="seconds")
+
+        solver = TransitionSolver(lat, lon, ayanamsa_mode=self.ayanamsa_mode)
+        nakshatras = reference_data.get().nakshatras
+        names = {
+            "tithi": lambda i: TITHI_NAMES[(i - 1) % 30],
+            "nakshatra": lambda i: nakshatras[i],
+            "yoga": lambda i: YOGA_NAMES[(i - 1) % 27],
+            "karana": self._karana_name,
+        }
+
+        def limb_events(limb):
+            for result, idx in solver.sweep(limb, start_utc, end_utc):
+                yield result.time, {
+                    "event": limb, "time": local(result.time), "index": idx, "name": names[limb](idx),
+                    "precision_seconds": round(result.precision_seconds, 3),
+                }
+
+        def sun_events():
+            for _, day in sun_times.sweep(lat, lon, start_date, end_date, timezone):
+                for event in ("sunrise", "sunset"):
+                    utc = getattr(day, event)
+                    if utc is not None and start_utc <= utc < end_utc:
+                        yield utc, {"event": event, "time": local(utc)}
+
+        if start_event:
+            at_start = solver.indices_at(start_utc)
+            yield {
+                "event": "start", "time": local(start_utc),
+                **{limb: names[limb](idx) for limb, idx in at_start.items()},
+            }
+        streams = [limb_events(limb) for limb in names] + [sun_events()]
+        for _, event in heapq.merge(*streams, key=lambda item: item[0]):
+            yield event
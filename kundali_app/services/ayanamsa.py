@@ -0,0 +1,77 @@
+import ephem
+import math
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple
+
+from kundali_app.core.config import settings
+
+
+class AyanamsaMode(NamedTuple):
+    """
+    `coefficients` are degrees for powers of Julian centuries from J2000
+    (mean ayanamsas: J2000 offset plus general precession). Modes without
+    coefficients are computed from a reference star and memoized.
+    """
+    label: str
+    coefficients: Optional[Tuple[float, ...]]
+
+
+AYANAMSAS = {
+    "lahiri": AyanamsaMode("Lahiri", (23.8570924, 1.39688796, 3.0709e-4)),
+    "raman": AyanamsaMode("Raman", (22.4107910, 1.39688808, 3.0706e-4)),
+    "kp": AyanamsaMode("KP", (23.7602400, 1.39688808, 3.0706e-4)),
+    "yukteshwar": AyanamsaMode("Yukteshwar", (22.4788030, 1.39688808, 3.0706e-4)),
+    "fagan_bradley": AyanamsaMode("Fagan-Bradley", (24.7403000, 1.39688797, 3.0709e-4)),
+    "true_chitra": AyanamsaMode("True Chitra", None),
+}
+
+
+def resolve(mode=None):
+    """Validated mode name; None selects settings.AYANAMSA_MODE."""
+    mode = (mode or settings.AYANAMSA_MODE).lower()
+    if mode not in AYANAMSAS:
+        raise ValueError(f"Unknown ayanamsa: {mode}. Valid: {', '.join(AYANAMSAS)}")
+    return mode
+
+
+def label(mode=None):
+    return AYANAMSAS[resolve(mode)].label
+
+
+def ayanamsa(date, mode=None):
+    """Ayanamsa in degrees at an ephem.Date (UTC) for `mode`."""
+    coefficients = AYANAMSAS[resolve(mode)].coefficients
+    if coefficients is None:
+        # Spica moves ~0.014" per 0.1 day, well below what the charts display
+        return _true_chitra(round(float(date), 1))
+    t = (float(date) - 36525.0) / 36525  # ephem.Date 36525 is J2000
+    return polynomial(t, coefficients)
+
+
+def longitude_of_date(body, date):
+    """
+    Apparent geocentric ecliptic longitude of date (degrees) of a computed
+    ephem body. The ayanamsas, the ascendant and the house cusps are all
+    measured in this frame, so every body longitude must be too.
+    """
+    eq = ephem.Equatorial(body.g_ra, body.g_dec, epoch=date)
+    return math.degrees(ephem.Ecliptic(eq, epoch=date).lon)
+
+
+def polynomial(t, coefficients):
+    """Horner evaluation; `t` may be a float or a NumPy array of Julian centuries."""
+    value = 0.0
+    for c in reversed(coefficients):
+        value = value * t + c
+    return value
+
+
+@lru_cache(maxsize=4096)
+def _true_chitra(date):
+    """
+    Spica (Chitra) held at 180 deg: its longitude in the planets' frame
+    (longitude_of_date) minus 180.
+    """
+    spica = ephem.star("Spica")
+    spica.compute(date)
+    return (longitude_of_date(spica, date) - 180) % 360
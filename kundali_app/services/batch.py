@@ -0,0 +1,123 @@
+import ephem
+import numpy as np
+
+from kundali_app.services import houses
+from kundali_app.services.ayanamsa import (AYANAMSAS, ayanamsa as ayanamsa_at, longitude_of_date, polynomial,
+                                           resolve as resolve_ayanamsa)
+from kundali_app.services.chart_context import BODY_FACTORIES, MEAN_NODE_SPEED, SPEED_STEP, STATIONARY_SPEED
+
+# Column order of the per-body axis in batch results (matches calculate_planets)
+BATCH_BODIES = ("Ascendant", "Sun", "Moon", "Mars", "Mercury", "Jupiter",
+                "Venus", "Saturn", "Rahu", "Ketu")
+
+BATCH_DTYPE = np.dtype([
+    ("sidereal_lon", "f8"),
+    ("sign_id", "i1"),         # 1=Aries .. 12=Pisces
+    ("nakshatra_id", "i1"),    # 1-27
+    ("nakshatra_pada", "i1"),  # 1-4
+    ("house", "i1"),           # whole sign, 1-12
+    ("speed", "f8"),           # deg/day; NaN for the Ascendant
+    ("is_retrograde", "?"),
+    ("is_stationary", "?"),
+])
+
+# ephem.Date(0) is 1899-12-31 12:00 UTC
+_EPHEM_EPOCH = np.datetime64("1899-12-31T12:00:00")
+_NAK_SPAN = 360 / 27
+_PADA_SPAN = 360 / 108
+
+
+def to_ephem_dates(utc):
+    """Convert an array of UTC datetime64 values to ephem.Date floats."""
+    utc = np.asarray(utc, dtype="datetime64[s]")
+    return (utc - _EPHEM_EPOCH) / np.timedelta64(1, "D")
+
+
+def _tropical_longitudes(dates, lat, lon):
+    """
+    Tropical ecliptic longitudes of date (n, 7) for the seven visible bodies at `dates`
+    and at `dates` + SPEED_STEP, plus local sidereal time (radians, n). This is the
+    only per-row loop: ephem has no array API.
+    """
+    names = list(BODY_FACTORIES)
+    bodies = [BODY_FACTORIES[name]() for name in names]
+    obs = ephem.Observer()
+    now = np.empty((len(dates), len(names)))
+    after = np.empty_like(now)
+    lst = np.empty(len(dates))
+    for i in range(len(dates)):
+        obs.lat, obs.lon = str(lat[i]), str(lon[i])
+        obs.date = dates[i]
+        lst[i] = obs.sidereal_time()
+        for out, offset in ((now, 0.0), (after, SPEED_STEP)):
+            obs.date = dates[i] + offset
+            for j, body in enumerate(bodies):
+                body.compute(obs)
+                out[i, j] = longitude_of_date(body, obs.date)
+    return now, after, lst
+
+
+def calculate_planets_batch(utc, lat, lon, house_system="whole_sign", ayanamsa_mode=None):
+    """
+    Sidereal positions for many births in one call.
+
+    `utc` is an array of UTC instants (datetime64) and `lat`/`lon` arrays of
+    the same length (or scalars). Returns a structured array of shape
+    (n, len(BATCH_BODIES)) with BATCH_DTYPE fields.
+    """
+    utc = np.asarray(utc, dtype="datetime64[s]")
+    n = utc.shape[0]
+    lat = np.broadcast_to(np.asarray(lat, dtype=float), (n,))
+    lon = np.broadcast_to(np.asarray(lon, dtype=float), (n,))
+
+    dates = to_ephem_dates(utc)
+    trop, trop_after, lst = _tropical_longitudes(dates, lat, lon)
+
+    # Ayanamsa and mean node
+    t = (dates + 2415020.0 - 2451545.0) / 36525
+    mode = resolve_ayanamsa(ayanamsa_mode)
+    coefficients = AYANAMSAS[mode].coefficients
+    if coefficients is not None:
+        ayanamsa = polynomial(t, coefficients)
+    else:
+        ayanamsa = np.array([ayanamsa_at(d, mode) for d in dates])
+    sid = (trop - ayanamsa[:, None]) % 360
+    rahu = ((125.04452 - 1934.136261 * t) % 360 - ayanamsa) % 360
+    ketu = (rahu + 180) % 360
+
+    # Instantaneous speed; retrograde/stationary only for Mars..Saturn
+    speed = ((trop_after - trop + 180) % 360 - 180) / SPEED_STEP
+    names = list(BODY_FACTORIES)
+    planets = [j for j, name in enumerate(names) if name in STATIONARY_SPEED]
+    threshold = np.array([STATIONARY_SPEED[names[j]] for j in planets])
+
+    # Ascendant from local sidereal time, latitude and obliquity
+    eps = np.radians(houses.obliquity(t))
+    phi = np.radians(lat)
+    asc = np.degrees(np.arctan2(np.cos(lst), -(np.sin(lst) * np.cos(eps) + np.tan(phi) * np.sin(eps))))
+    lagna = (asc - ayanamsa) % 360
+
+    lons = np.column_stack([lagna, sid, rahu, ketu])
+    sign_idx = np.floor(lons / 30).astype(int)
+
+    out = np.zeros((n, len(BATCH_BODIES)), dtype=BATCH_DTYPE)
+    out["sidereal_lon"] = lons
+    out["sign_id"] = sign_idx + 1
+    out["nakshatra_id"] = np.floor(lons / _NAK_SPAN) + 1
+    out["nakshatra_pada"] = np.floor((lons % _NAK_SPAN) / _PADA_SPAN) + 1
+    if house_system == "whole_sign":
+        out["house"] = (sign_idx - sign_idx[:, :1]) % 12 + 1
+    else:
+        ramc = np.degrees(lst)
+        for i in range(n):
+            cusps = houses.house_cusps(ramc[i], lat[i], np.degrees(eps[i]), house_system)
+            cusps = [(c - ayanamsa[i]) % 360 for c in cusps]
+            out["house"][i] = [houses.house_of(x, cusps, house_system) for x in lons[i]]
+        out["house"][:, 0] = 1
+    out["speed"][:, 0] = np.nan
+    out["speed"][:, 1:8] = speed
+    out["speed"][:, 8:] = MEAN_NODE_SPEED
+    cols = [j + 1 for j in planets]
+    out["is_retrograde"][:, cols] = speed[:, planets] < 0
+    out["is_stationary"][:, cols] = np.abs(speed[:, planets]) < threshold
+    return out
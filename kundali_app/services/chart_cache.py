@@ -0,0 +1,102 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import replace
+from datetime import datetime, timedelta
+
+from kundali_app.core.config import settings
+from kundali_app.services.ayanamsa import resolve as resolve_ayanamsa
+from kundali_app.services.chart_context import ChartContext
+
+# Coordinates are rounded before keying (~1 cm) so float noise from query
+# strings does not defeat the cache.
+COORD_PRECISION = 7
+
+
+class ChartCache:
+    """
+    Bounded LRU cache of ChartContext objects with TTL eviction.
+
+    Keyed on (UTC instant, lat, lon, ayanamsa mode, ephemeris backend). Two requests for the same
+    instant expressed in different timezones share the ephemeris; the hit is
+    re-stamped with the caller's local fields.
+    """
+
+    def __init__(self, maxsize=1024, ttl=3600.0, enabled=True):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(lat, lon, year, month, day, hour, minute, timezone,
+                 ayanamsa_mode=None, ephemeris=None):
+        utc_dt = datetime(year, month, day, hour, minute) - timedelta(hours=timezone)
+        return (utc_dt, round(float(lat), COORD_PRECISION), round(float(lon), COORD_PRECISION),
+                resolve_ayanamsa(ayanamsa_mode), ephemeris or settings.EPHEMERIS_BACKEND)
+
+    def get(self, lat, lon, year, month, day, hour, minute, timezone=5.5, ephemeris=None, ayanamsa_mode=None):
+        """Return a ChartContext for the birth moment, building it on a miss."""
+        if not self.enabled:
+            return ChartContext.build(lat, lon, year, month, day, hour, minute, timezone,
+                                      ephemeris=ephemeris, ayanamsa_mode=ayanamsa_mode)
+
+        key = self.make_key(lat, lon, year, month, day, hour, minute, timezone,
+                            ayanamsa_mode=ayanamsa_mode, ephemeris=ephemeris)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and now - entry[0] <= self.ttl:
+                self._data.move_to_end(key)
+                self.hits += 1
+                ctx = entry[1]
+            else:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                ctx = None
+
+        if ctx is None:
+            # Build outside the lock; a concurrent miss on the same key just
+            # computes it twice.
+            ctx = ChartContext.build(lat, lon, year, month, day, hour, minute, timezone,
+                                     ephemeris=ephemeris, ayanamsa_mode=ayanamsa_mode)
+            with self._lock:
+                self._data[key] = (now, ctx)
+                self._data.move_to_end(key)
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+
+        if (ctx.year, ctx.month, ctx.day, ctx.hour, ctx.minute, ctx.timezone) != (year, month, day, hour, minute, timezone):
+            local_dt = datetime(year, month, day, hour, minute)
+            ctx = replace(ctx, year=year, month=month, day=day, hour=hour, minute=minute,
+                          timezone=timezone, local_dt=local_dt)
+        return ctx
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+chart_cache = ChartCache(
+    maxsize=settings.CHART_CACHE_SIZE,
+    ttl=settings.CHART_CACHE_TTL,
+    enabled=settings.CHART_CACHE_ENABLED,
+)
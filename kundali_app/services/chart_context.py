@@ -0,0 +1,175 @@
+import ephem
+import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from types import MappingProxyType
+from typing import Mapping
+
+from kundali_app.core.config import settings
+from kundali_app.services import houses
+from kundali_app.services.ayanamsa import ayanamsa as ayanamsa_at, longitude_of_date, resolve as resolve_ayanamsa
+
+BODY_FACTORIES = {
+    "Sun": ephem.Sun, "Moon": ephem.Moon, "Mars": ephem.Mars,
+    "Mercury": ephem.Mercury, "Jupiter": ephem.Jupiter,
+    "Venus": ephem.Venus, "Saturn": ephem.Saturn
+}
+
+# Mean lunar node motion (deg/day); the node regresses
+MEAN_NODE_SPEED = -1934.136261 / 36525
+
+# Step (days) of the forward difference used for instantaneous speeds by every
+# backend (live, table, batch), so a planet near its station gets the same sign
+# from each; the speed error is about step / 2 x acceleration (< 0.01 deg/day
+# for the Moon)
+SPEED_STEP = 1.0 / 24
+
+# Below these speeds (deg/day, ~5% of mean geocentric motion) a planet is stationary
+STATIONARY_SPEED = {
+    "Mercury": 0.05, "Venus": 0.06, "Mars": 0.026,
+    "Jupiter": 0.004, "Saturn": 0.0017,
+}
+
+
+def forward_speed(lon, after):
+    """Speed (deg/day) from longitudes SPEED_STEP apart, unwrapped across 0/360."""
+    return ((after - lon + 180) % 360 - 180) / SPEED_STEP
+
+
+@dataclass(frozen=True)
+class ChartContext:
+    """
+    Everything derived from the ephemeris for one birth moment and place.
+
+    Built once per request (see `ChartContext.build`) and passed to every
+    AstrologyService method so the Sun/Moon/planet positions are computed
+    exactly once. Treat `observer` as read-only; use `new_observer()` to get
+    a copy that can be moved in time.
+    """
+    lat: float
+    lon: float
+    year: int
+    month: int
+    day: int
+    hour: int
+    minute: int
+    timezone: float
+    local_dt: datetime
+    utc_dt: datetime
+    date: float                   # ephem.Date (UTC) of the birth moment
+    observer: ephem.Observer
+    ayanamsa: float
+    ayanamsa_mode: str
+    sidereal_time: float          # local apparent sidereal time, radians
+    tropical: Mapping[str, float]  # tropical longitudes of date incl. "Rahu"
+    sidereal: Mapping[str, float]  # sidereal longitudes incl. "Rahu"/"Ketu"
+    speeds: Mapping[str, float]    # instantaneous longitudinal speed, deg/day
+
+    @classmethod
+    def build(cls, lat, lon, year, month, day, hour, minute, timezone=5.5, ephemeris=None, ayanamsa_mode=None):
+        """
+        `ephemeris` selects "live" (ephem) or "table" (precomputed file);
+        defaults to settings.EPHEMERIS_BACKEND. Instants outside the table's
+        span, or a missing or outdated table file, fall back to live ephem. `ayanamsa_mode` is a key of
+        ayanamsa.AYANAMSAS; defaults to settings.AYANAMSA_MODE.
+        """
+        obs = ephem.Observer()
+        obs.lat = str(lat)
+        obs.lon = str(lon)
+        local_dt = datetime(year, month, day, hour, minute)
+        utc_dt = local_dt - timedelta(hours=timezone)
+        obs.date = utc_dt
+
+        # Ayanamsa
+        t = (ephem.julian_date(obs.date) - 2451545.0) / 36525
+        ayanamsa_mode = resolve_ayanamsa(ayanamsa_mode)
+        ayanamsa = ayanamsa_at(obs.date, ayanamsa_mode)
+
+        table = None
+        if (ephemeris or settings.EPHEMERIS_BACKEND) == "table":
+            from kundali_app.services.ephemeris_table import available_table
+            table = available_table()
+            if table is not None and not (table.covers(obs.date) and table.covers(obs.date + SPEED_STEP)):
+                table = None
+
+        if table is not None:
+            tropical, _ = table.positions(obs.date)
+            after, _ = table.positions(obs.date + SPEED_STEP)
+            speeds = {name: forward_speed(tropical[name], after[name]) for name in BODY_FACTORIES}
+            speeds["Rahu"] = MEAN_NODE_SPEED
+        else:
+            tropical, speeds = cls._live_positions(obs, t)
+
+        sidereal = {name: (lon_ - ayanamsa) % 360 for name, lon_ in tropical.items()}
+        sidereal["Ketu"] = (sidereal["Rahu"] + 180) % 360
+        speeds["Ketu"] = speeds["Rahu"]
+
+        return cls(
+            lat=lat, lon=lon, year=year, month=month, day=day,
+            hour=hour, minute=minute, timezone=timezone,
+            local_dt=local_dt, utc_dt=utc_dt, date=float(obs.date),
+            observer=obs, ayanamsa=ayanamsa, ayanamsa_mode=ayanamsa_mode,
+            sidereal_time=float(obs.sidereal_time()),
+            tropical=MappingProxyType(tropical),
+            sidereal=MappingProxyType(sidereal),
+            speeds=MappingProxyType(speeds),
+        )
+
+    @staticmethod
+    def _live_positions(obs, t):
+        """
+        Tropical longitudes of date from ephem, with instantaneous speeds from a
+        forward difference over SPEED_STEP that reuses the birth position:
+        two computes per body.
+        """
+        shifted = ephem.Observer()
+        shifted.lat, shifted.lon = obs.lat, obs.lon
+
+        tropical, speeds = {}, {}
+        for name, factory in BODY_FACTORIES.items():
+            body = factory()
+            body.compute(obs)
+            tropical[name] = longitude_of_date(body, obs.date)
+            shifted.date = obs.date + SPEED_STEP
+            body.compute(shifted)
+            speeds[name] = forward_speed(tropical[name], longitude_of_date(body, shifted.date))
+
+        # Rahu (Mean Node)
+        tropical["Rahu"] = (125.04452 - 1934.136261 * t) % 360
+        speeds["Rahu"] = MEAN_NODE_SPEED
+        return tropical, speeds
+
+    def is_retrograde(self, name):
+        """Mercury, Venus, Mars, Jupiter or Saturn moving backwards; luminaries and (by convention here) the nodes never are."""
+        return name in STATIONARY_SPEED and self.speeds[name] < 0
+
+    def is_stationary(self, name):
+        return name in STATIONARY_SPEED and abs(self.speeds[name]) < STATIONARY_SPEED[name]
+
+    @property
+    def obliquity(self):
+        t = (ephem.julian_date(self.date) - 2451545.0) / 36525
+        return houses.obliquity(t)
+
+    @property
+    def ramc(self):
+        """Local sidereal time as right ascension of the MC, degrees."""
+        return math.degrees(self.sidereal_time)
+
+    @property
+    def ascendant(self):
+        """Sidereal lagna longitude."""
+        return (houses.ascendant(self.ramc, self.lat, self.obliquity) - self.ayanamsa) % 360
+
+    def house_cusps(self, system="whole_sign"):
+        """Sidereal cusps of houses 1..12 for a system in houses.HOUSE_SYSTEMS."""
+        if system == "whole_sign":
+            return [(int(self.ascendant / 30) * 30 + 30 * i) % 360 for i in range(12)]
+        cusps = houses.house_cusps(self.ramc, self.lat, self.obliquity, system)
+        return [(c - self.ayanamsa) % 360 for c in cusps]
+
+    def new_observer(self, date=None):
+        obs = ephem.Observer()
+        obs.lat, obs.lon = str(self.lat), str(self.lon)
+        obs.date = self.date if date is None else date
+        return obs
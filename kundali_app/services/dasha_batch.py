@@ -0,0 +1,124 @@
+"""
+Running Vimshottari periods for many (birth, date) pairs in one call.
+
+The per-birth path (AstrologyService.get_current_dasha) computes every
+planet to find the Moon and walks a DashaTree; here the caller passes the
+sidereal Moon longitude and the birth instant of N births plus M as-of
+dates, and all N x M pairs are evaluated with array arithmetic:
+
+- the birth nakshatra, its lord and the balance come from the longitude;
+- the mahadasha is located against the nine cumulative mahadasha ends of
+  each birth, every deeper level against the nine cumulative sub-period
+  fractions of its parent's lord (a 9 x 9 table), scaled to the parent span.
+
+Boundaries follow DashaTree.period_at: an instant on a boundary belongs to
+the earlier period, and pairs before birth or after the 120-year cycle have
+no period (lords -1, start/end NaT). Times are naive local, like birth.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from kundali_app.services.dasha_tree import MAX_DEPTH, YEAR_DAYS, vimshottari
+from kundali_app.services.reference_data import registry as reference_data
+
+# Lord column values index DASHA_LORDS (Vimshottari order, Ketu first)
+DASHA_LORDS = tuple(vimshottari()["lords"])
+
+DASHA_BATCH_DTYPE = np.dtype([
+    ("lords", "i1", (MAX_DEPTH,)),  # mahadasha .. prana; -1 below `depth` or outside the cycle
+    ("start", "datetime64[s]"),     # of the deepest period evaluated
+    ("end", "datetime64[s]"),
+])
+
+_NAK_SPAN = 360 / 27
+
+
+@lru_cache(maxsize=2)
+def _tables(data):
+    """Lookup tables of one ReferenceData (rebuilt after a reload)."""
+    v = data.vimshottari
+    years = np.array([v["periods"][lord] for lord in DASHA_LORDS], dtype=float)
+    # order[l, k]: k-th sub-period lord of a period ruled by l
+    order = (np.arange(9)[:, None] + np.arange(9)[None, :]) % 9
+    share = years[order] / v["total_years"]
+    ends = np.cumsum(share, axis=1)
+    ends[:, -1] = 1.0  # the last sub-period closes its parent exactly
+    nakshatra_lord = np.array([DASHA_LORDS.index(lord) for lord in data.nakshatra_lords])
+    return years, order, share, ends, nakshatra_lord
+
+
+def current_dashas_batch(birth, moon_longitude, as_of, depth=3):
+    """
+    Running periods for every birth at every as-of date.
+
+    `birth` is an array of N birth instants (datetime64, naive local),
+    `moon_longitude` N sidereal Moon longitudes (or a scalar) and `as_of`
+    M instants (datetime64, or a scalar). Returns a structured array of
+    shape (N, M) with DASHA_BATCH_DTYPE fields, evaluated down to `depth`
+    (1 = mahadasha .. 5 = prana).
+    """
+    if not 1 <= depth <= MAX_DEPTH:
+        raise ValueError(f"depth must be between 1 and {MAX_DEPTH}")
+    birth = np.atleast_1d(np.asarray(birth, dtype="datetime64[s]"))
+    as_of = np.atleast_1d(np.asarray(as_of, dtype="datetime64[s]"))
+    n, m = birth.shape[0], as_of.shape[0]
+    moon = np.broadcast_to(np.asarray(moon_longitude, dtype=float), (n,)) % 360
+    years, order, share, ends, nakshatra_lord = _tables(reference_data.get())
+
+    # Birth lord and balance (years left of the first mahadasha)
+    nakshatra = np.minimum((moon // _NAK_SPAN).astype(int), 26)
+    first = nakshatra_lord[nakshatra]
+    balance = years[first] * (1 - (moon % _NAK_SPAN) / _NAK_SPAN)
+
+    # Mahadasha ends in days since birth (N, 9)
+    md_days = years[order[first]] * YEAR_DAYS
+    md_days[:, 0] = balance * YEAR_DAYS
+    md_ends = np.cumsum(md_days, axis=1)
+
+    # Days since birth of every pair (N, M)
+    t = (as_of[None, :] - birth[:, None]) / np.timedelta64(1, "D")
+    valid = (t >= 0) & (t <= md_ends[:, -1:])
+
+    index = np.minimum((t[:, :, None] > md_ends[:, None, :]).sum(axis=2), 8)
+    rows = np.arange(n)[:, None]
+    lord = order[first[:, None], index]
+    end = md_ends[rows, index]
+    span = md_days[rows, index]
+    start = end - span
+
+    lords = np.full((n, m, MAX_DEPTH), -1, dtype=np.int8)
+    lords[:, :, 0] = lord
+    for level in range(1, depth):
+        position = np.where(span > 0, (t - start) / np.where(span > 0, span, 1), 0)
+        index = np.minimum((position[:, :, None] > ends[lord]).sum(axis=2), 8)
+        start = start + span * (ends[lord, index] - share[lord, index])
+        span = span * share[lord, index]
+        lord = order[lord, index]
+        lords[:, :, level] = lord
+
+    out = np.empty((n, m), dtype=DASHA_BATCH_DTYPE)
+    origin = birth[:, None]
+    out["start"] = origin + np.round(start * 86400).astype("timedelta64[s]")
+    out["end"] = origin + np.round((start + span) * 86400).astype("timedelta64[s]")
+    lords[~valid] = -1
+    out["lords"] = lords
+    out["start"][~valid] = np.datetime64("NaT")
+    out["end"][~valid] = np.datetime64("NaT")
+    return out
+
+
+def combined_periods(lords):
+    """
+    "Rahu-Sun-Moon" strings (object array) for a `lords` field of
+    current_dashas_batch; None where there is no period. Each distinct lord
+    path is formatted once.
+    """
+    lords = np.asarray(lords)
+    codes = (lords.astype(np.int64) + 1) @ (10 ** np.arange(MAX_DEPTH, dtype=np.int64))
+    unique, inverse = np.unique(codes, return_inverse=True)
+    names = np.empty(len(unique), dtype=object)
+    for i, code in enumerate(unique):
+        path = [int(code) // 10 ** level % 10 - 1 for level in range(MAX_DEPTH)]
+        names[i] = "-".join(DASHA_LORDS[lord] for lord in path if lord >= 0) or None
+    return names[inverse].reshape(codes.shape)
@@ -0,0 +1,120 @@
+"""
+Dasha transition index.
+
+Every mahadasha and antardasha start of a profile is stored as a
+DashaTransition row (level, lord, start/end Julian day), rewritten together
+with its snapshot (services/snapshots.py), so it follows any change to the
+birth data. "Which profiles start a new antardasha between D1 and D2" is then
+one range scan of ix_dasha_transitions_level_start instead of a dasha
+computation per profile. Julian days are of the naive local (birth-timezone)
+instants, like the rest of the dasha output.
+"""
+from datetime import datetime
+
+from sqlalchemy import delete, exists, insert, select
+
+from kundali_app.db.session import SessionLocal
+from kundali_app.models import ChartSnapshot, DashaTransition, JobStatus, Profile
+from kundali_app.services.dasha_tree import DATE_FORMAT, LEVEL_KEYS, DashaTree, from_jd, to_jd
+
+# Levels indexed: 9 mahadashas + 81 antardashas per profile
+TRANSITION_DEPTH = 2
+
+# Profile ids per DELETE ... IN (...) clause
+WRITE_BATCH = 500
+
+transitions = DashaTransition.__table__
+
+
+def transition_mappings(profile, data):
+    """DashaTransition rows (as dicts) of a profile from its snapshot's Moon; [] without one."""
+    moon = next((p for p in data["planets"] if p["planet"] == "Moon"), None)
+    if moon is None:
+        return []
+    birth = datetime.combine(profile.dob, profile.tob).replace(second=0, microsecond=0)
+    tree = DashaTree.from_moon(birth, moon["absolute_degree"], moon["nakshatra"])
+    rows = []
+    periods = list(tree.mahadashas)
+    while periods:
+        period = periods.pop(0)
+        rows.append({
+            "profile_id": profile.id, "level": period.level, "lord": period.lord,
+            "lords": "-".join(period.lords()), "start_jd": period.start, "end_jd": period.end,
+        })
+        if period.level < TRANSITION_DEPTH:
+            periods.extend(period.children())
+    return rows
+
+
+def replace_transitions(db, rows, profile_ids=None):
+    """
+    Replace the stored transitions of `profile_ids` (default: those in
+    `rows`) with `rows`. The caller commits.
+    """
+    if profile_ids is None:
+        profile_ids = {row["profile_id"] for row in rows}
+    profile_ids = list(profile_ids)
+    for start in range(0, len(profile_ids), WRITE_BATCH):
+        db.execute(delete(transitions).where(transitions.c.profile_id.in_(profile_ids[start:start + WRITE_BATCH])))
+    if rows:
+        db.execute(insert(transitions), rows)
+
+
+def _transitions_query(start, end, level, lord, limit):
+    query = (select(transitions)
+             .where(transitions.c.level == level,
+                    transitions.c.start_jd >= to_jd(start), transitions.c.start_jd <= to_jd(end))
+             .order_by(transitions.c.start_jd, transitions.c.profile_id))
+    if lord is not None:
+        query = query.where(transitions.c.lord == lord)
+    return query.limit(limit) if limit else query
+
+
+def _transition_dict(row):
+    return {
+        "profile_id": row.profile_id,
+        "level": LEVEL_KEYS[row.level],
+        "lord": row.lord,
+        "lords": row.lords,
+        "start_date": from_jd(row.start_jd).strftime(DATE_FORMAT),
+        "end_date": from_jd(row.end_jd).strftime(DATE_FORMAT),
+    }
+
+
+def find_transitions(db, start, end, level=2, lord=None, limit=None):
+    """Periods of `level` starting within [start, end] (naive datetimes), in start order."""
+    return [_transition_dict(row) for row in db.execute(_transitions_query(start, end, level, lord, limit))]
+
+
+async def find_transitions_async(db, start, end, level=2, lord=None, limit=None):
+    """find_transitions for an AsyncSession."""
+    return [_transition_dict(row) for row in await db.execute(_transitions_query(start, end, level, lord, limit))]
+
+
+def backfill():
+    """
+    Index the profiles whose snapshot was stored before this index existed
+    (completed, with a snapshot, without transitions); returns their count.
+    """
+    import json
+    from kundali_app.services.snapshots import fingerprint
+
+    db = SessionLocal()
+    try:
+        missing = (select(Profile, ChartSnapshot)
+                   .join(ChartSnapshot, ChartSnapshot.profile_id == Profile.id)
+                   .where(Profile.chart_status == JobStatus.COMPLETED.value,
+                          ~exists().where(transitions.c.profile_id == Profile.id)))
+        count = 0
+        for profile, snapshot in db.execute(missing).all():
+            try:
+                if snapshot.fingerprint != fingerprint(profile):
+                    continue  # Rebuilt (and indexed) on its next read
+            except ValueError:  # e.g. a stored ayanamsa no longer in the registry
+                continue
+            replace_transitions(db, transition_mappings(profile, json.loads(snapshot.data)), [profile.id])
+            count += 1
+        db.commit()
+        return count
+    finally:
+        db.close()
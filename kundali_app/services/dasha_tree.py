@@ -0,0 +1,208 @@
+"""
+Lazy Vimshottari dasha tree.
+
+Periods are kept as float Julian-day boundaries and a period's nine
+sub-periods are only computed the first time it is visited, so a query
+touches the branches it needs instead of expanding all 9^depth periods.
+Every period is split among the nine lords in Vimshottari order starting
+from its own lord, each getting (its years / 120) of the parent's span; the
+first mahadasha runs for the birth balance only, so its sub-periods are
+scaled to that balance.
+
+Times are naive local (birth-timezone) datetimes, like the rest of the
+dasha output; the Julian days are only an internal, arithmetic-friendly
+representation of them.
+"""
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from kundali_app.services.reference_data import registry as reference_data
+
+# Days per dasha year
+YEAR_DAYS = 365.25
+
+# Level numbers: 1 = mahadasha ... 5 = prana
+MAX_DEPTH = 5
+LEVEL_KEYS = {1: "mahadasha", 2: "antardasha", 3: "pratyantardasha", 4: "sookshma", 5: "prana"}
+
+DATE_FORMAT = "%d-%m-%Y %H:%M"
+
+_J2000 = datetime(2000, 1, 1, 12)
+_J2000_JD = 2451545.0
+
+
+def to_jd(dt):
+    return _J2000_JD + (dt - _J2000) / timedelta(days=1)
+
+
+def from_jd(jd):
+    # Rounded to the second: a float JD carries ~10 µs of noise, and a boundary
+    # landing a hair before a minute would otherwise format as the minute before
+    return _J2000 + timedelta(seconds=round((jd - _J2000_JD) * 86400))
+
+
+def parse_date(value):
+    """A DD-MM-YYYY or DD-MM-YYYY HH:MM string as a naive datetime."""
+    for fmt in (DATE_FORMAT, "%d-%m-%Y"):
+        try:
+            return datetime.strptime(value.strip(), fmt)
+        except ValueError:
+            pass
+    raise ValueError(f"Invalid date: {value}. Use DD-MM-YYYY or DD-MM-YYYY HH:MM")
+
+
+def vimshottari():
+    """Vimshottari lords, periods and nakshatra lords (services/reference_data.py)."""
+    return reference_data.get().vimshottari
+
+
+class DashaPeriod:
+    """One period of the tree; `children()` expands its sub-periods on first use."""
+
+    __slots__ = ("lord", "level", "start", "end", "parent", "_children")
+
+    def __init__(self, lord, level, start, end, parent=None):
+        self.lord = lord
+        self.level = level
+        self.start = start  # Julian days
+        self.end = end
+        self.parent = parent
+        self._children = None
+
+    def children(self) -> List["DashaPeriod"]:
+        if self._children is None:
+            if self.level >= MAX_DEPTH:
+                self._children = []
+            else:
+                v = vimshottari()
+                lords, periods, total = v["lords"], v["periods"], v["total_years"]
+                span = self.end - self.start
+                first = lords.index(self.lord)
+                children = []
+                start = self.start
+                for i in range(9):
+                    lord = lords[(first + i) % 9]
+                    end = start + span * periods[lord] / total
+                    children.append(DashaPeriod(lord, self.level + 1, start, end, self))
+                    start = end
+                children[-1].end = self.end  # no float drift at the parent's boundary
+                self._children = children
+        return self._children
+
+    @property
+    def years(self):
+        return (self.end - self.start) / YEAR_DAYS
+
+    @property
+    def start_datetime(self):
+        return from_jd(self.start)
+
+    @property
+    def end_datetime(self):
+        return from_jd(self.end)
+
+    def lords(self):
+        """Lords from the mahadasha down to this period."""
+        path = []
+        period = self
+        while period is not None:
+            path.append(period.lord)
+            period = period.parent
+        return path[::-1]
+
+    def to_dict(self):
+        return {
+            "level": LEVEL_KEYS[self.level],
+            "lord": self.lord,
+            "lords": self.lords(),
+            "start_date": self.start_datetime.strftime(DATE_FORMAT),
+            "end_date": self.end_datetime.strftime(DATE_FORMAT),
+            "duration_years": round(self.years, 6),
+        }
+
+    def __repr__(self):
+        return f"DashaPeriod({'-'.join(self.lords())}, {self.start_datetime:%Y-%m-%d} .. {self.end_datetime:%Y-%m-%d})"
+
+
+class DashaTree:
+    """The Vimshottari mahadashas from birth, with lazily expanded sub-periods."""
+
+    def __init__(self, birth, birth_lord, balance_years):
+        v = vimshottari()
+        lords, periods = v["lords"], v["periods"]
+        self.birth_lord = birth_lord
+        self.balance_years = balance_years
+        self.mahadashas = []
+        start = to_jd(birth)
+        first = lords.index(birth_lord)
+        for i in range(9):
+            lord = lords[(first + i) % 9]
+            years = balance_years if i == 0 else periods[lord]
+            end = start + years * YEAR_DAYS
+            self.mahadashas.append(DashaPeriod(lord, 1, start, end))
+            start = end
+
+    @classmethod
+    def from_moon(cls, birth, moon_longitude, nakshatra_name):
+        """Tree for a birth (naive local datetime) from the sidereal Moon."""
+        v = vimshottari()
+        birth_lord = v["nakshatra_lords"].get(nakshatra_name, "Ketu")
+        nak_len = 360 / 27
+        elapsed_fraction = (moon_longitude % nak_len) / nak_len
+        return cls(birth, birth_lord, v["periods"][birth_lord] * (1 - elapsed_fraction))
+
+    @property
+    def start(self):
+        return self.mahadashas[0].start
+
+    @property
+    def end(self):
+        return self.mahadashas[-1].end
+
+    def period_at(self, instant, depth=MAX_DEPTH) -> List[DashaPeriod]:
+        """
+        The running periods at `instant` (datetime), mahadasha first, down to
+        `depth`; [] outside the tree. Visits at most 9 periods per level.
+        """
+        jd = to_jd(instant)
+        path = []
+        candidates = self.mahadashas
+        for _ in range(min(depth, MAX_DEPTH)):
+            period = self._containing(candidates, jd)
+            if period is None:
+                break
+            path.append(period)
+            candidates = period.children()
+        return path
+
+    def periods_between(self, start, end, depth=2):
+        """
+        Yield the periods at level `depth` overlapping [start, end] (datetimes),
+        in time order. Only branches overlapping the window are expanded.
+        """
+        depth = max(1, min(depth, MAX_DEPTH))
+        lo, hi = to_jd(start), to_jd(end)
+        if hi < lo:
+            return
+
+        def walk(periods):
+            for period in periods:
+                if period.end < lo:
+                    continue
+                if period.start > hi:
+                    return
+                if period.level == depth:
+                    yield period
+                else:
+                    yield from walk(period.children())
+
+        yield from walk(self.mahadashas)
+
+    @staticmethod
+    def _containing(periods, jd) -> Optional[DashaPeriod]:
+        if not periods or jd < periods[0].start or jd > periods[-1].end:
+            return None
+        for period in periods:
+            if jd <= period.end:
+                return period
+        return periods[-1]
@@ -0,0 +1,199 @@
+"""
+Precomputed daily ephemeris table.
+
+`build_table` tabulates apparent geocentric tropical longitudes of date and speeds for the seven
+visible bodies and the mean node at a fixed step, and writes them to a compact
+binary file. `EphemerisTable` memory-maps that file and answers positions by
+cubic Hermite interpolation (value + derivative at each node). The tabulated
+speeds are only the nodes' derivatives: ChartContext takes a chart's speeds
+from two interpolated positions SPEED_STEP apart, as the live backend does.
+
+Build once, offline:
+    python -m kundali_app.services.ephemeris_table build
+    python -m kundali_app.services.ephemeris_table report
+"""
+import ephem
+import logging
+import math
+import os
+import struct
+import sys
+import time
+import numpy as np
+
+from kundali_app.core.config import settings
+from kundali_app.services.ayanamsa import longitude_of_date
+from kundali_app.services.chart_context import ChartContext, SPEED_STEP
+
+TABLE_BODIES = ("Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Rahu")
+
+# Header: magic, version, start (ephem.Date), step (days), rows, bodies; padded to 64 bytes
+_MAGIC = b"KEPH"
+_VERSION = 2  # 2: longitudes of date (1 was J2000)
+_HEADER = struct.Struct("<4sIddII")
+_HEADER_SIZE = 64
+
+_BUILD_HINT = "build it with: python -m kundali_app.services.ephemeris_table build"
+
+# Default span covers KundaliRequest's 1900-2100 with a margin for timezones
+DEFAULT_START = ephem.Date("1899/12/25")
+DEFAULT_END = ephem.Date("2101/01/07")
+
+logger = logging.getLogger(__name__)
+
+
+def _node_longitude(date):
+    t = (ephem.julian_date(date) - 2451545.0) / 36525
+    return (125.04452 - 1934.136261 * t) % 360
+
+
+def _live_longitudes(obs, bodies, date):
+    obs.date = date
+    lons = []
+    for body in bodies:
+        body.compute(obs)
+        lons.append(longitude_of_date(body, date))
+    lons.append(_node_longitude(date))
+    return np.array(lons)
+
+
+def build_table(path=None, start=DEFAULT_START, end=DEFAULT_END, step=1.0):
+    """Tabulate longitude and speed for TABLE_BODIES from `start` to `end` every `step` days."""
+    path = path or settings.EPHEMERIS_TABLE_PATH
+    rows = int(math.ceil((float(end) - float(start)) / step)) + 1
+    obs = ephem.Observer()
+    bodies = [getattr(ephem, name)() for name in TABLE_BODIES[:-1]]
+
+    data = np.empty((rows, len(TABLE_BODIES), 2))
+    for i in range(rows):
+        date = float(start) + i * step
+        lon = _live_longitudes(obs, bodies, date)
+        before = _live_longitudes(obs, bodies, date - SPEED_STEP)
+        after = _live_longitudes(obs, bodies, date + SPEED_STEP)
+        data[i, :, 0] = lon
+        data[i, :, 1] = ((after - before + 180) % 360 - 180) / (2 * SPEED_STEP)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "wb") as f:
+        header = _HEADER.pack(_MAGIC, _VERSION, float(start), step, rows, len(TABLE_BODIES))
+        f.write(header.ljust(_HEADER_SIZE, b"\0"))
+        f.write(data.astype("<f8").tobytes())
+    return path
+
+
+class EphemerisTable:
+    """Read-only, memory-mapped view of a table written by `build_table`."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            magic, version, start, step, rows, n_bodies = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != _MAGIC or version != _VERSION or n_bodies != len(TABLE_BODIES):
+            raise ValueError(f"{path} is not a version {_VERSION} ephemeris table; re{_BUILD_HINT}")
+        self.path = path
+        self.start = start
+        self.step = step
+        self.rows = rows
+        self.end = start + (rows - 1) * step
+        self.data = np.memmap(path, dtype="<f8", mode="r", offset=_HEADER_SIZE,
+                              shape=(rows, n_bodies, 2))
+
+    def covers(self, date):
+        # The last node is excluded so i + 1 is always valid
+        return self.start <= float(date) < self.end
+
+    def positions(self, date):
+        """
+        Tropical longitudes (deg) and speeds (deg/day) for TABLE_BODIES at an
+        ephem.Date, by cubic Hermite interpolation between the bracketing rows.
+        """
+        x = (float(date) - self.start) / self.step
+        i = int(x)
+        u = x - i
+        (p0, m0), (p1, m1) = self.data[i].T, self.data[i + 1].T
+        p1 = p0 + (p1 - p0 + 180) % 360 - 180  # unwrap across 0/360
+        m0, m1 = m0 * self.step, m1 * self.step
+
+        u2, u3 = u * u, u * u * u
+        lon = ((2 * u3 - 3 * u2 + 1) * p0 + (u3 - 2 * u2 + u) * m0
+               + (-2 * u3 + 3 * u2) * p1 + (u3 - u2) * m1)
+        speed = ((6 * u2 - 6 * u) * p0 + (3 * u2 - 4 * u + 1) * m0
+                 + (-6 * u2 + 6 * u) * p1 + (3 * u2 - 2 * u) * m1) / self.step
+        return dict(zip(TABLE_BODIES, (lon % 360).tolist())), dict(zip(TABLE_BODIES, speed.tolist()))
+
+
+_table = None
+
+
+def load_table(path=None):
+    """Process-wide EphemerisTable, opened on first use."""
+    global _table
+    path = path or settings.EPHEMERIS_TABLE_PATH
+    if _table is None or _table.path != path:
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Ephemeris table not found at {path}; {_BUILD_HINT}")
+        _table = EphemerisTable(path)
+    return _table
+
+
+_unusable = None  # path of a table that could not be opened, warned about already
+
+
+def available_table(path=None):
+    """
+    load_table(), or None if the file is missing or not a version _VERSION
+    table: charts then fall back to live ephem. Logged once per path.
+    """
+    global _unusable
+    path = path or settings.EPHEMERIS_TABLE_PATH
+    if _unusable == path:
+        return None
+    try:
+        return load_table(path)
+    except (OSError, ValueError) as e:
+        _unusable = path
+        logger.warning("Ephemeris table unusable, using live ephem: %s", e)
+        return None
+
+
+def report(samples=2000, seed=11):
+    """Print interpolation error against live ephem and the per-chart speedup."""
+    table = load_table()
+    rng = np.random.default_rng(seed)
+    dates = rng.uniform(table.start + 1, table.end - 1, samples)
+    obs = ephem.Observer()
+    bodies = [getattr(ephem, name)() for name in TABLE_BODIES[:-1]]
+
+    worst = np.zeros(len(TABLE_BODIES))
+    for date in dates:
+        live = _live_longitudes(obs, bodies, date)
+        lon, _ = table.positions(date)
+        err = np.abs((np.array([lon[n] for n in TABLE_BODIES]) - live + 180) % 360 - 180)
+        worst = np.maximum(worst, err)
+
+    print(f"max |table - ephem| over {samples} random instants:")
+    for name, e in zip(TABLE_BODIES, worst):
+        print(f"  {name:8s} {e * 3600:8.4f} arcsec")
+
+    births = [ephem.Date(d).datetime() for d in dates[:500]]
+    timings = {}
+    for backend in ("live", "table"):
+        t0 = time.perf_counter()
+        for dt in births:
+            ChartContext.build(26.8, 80.9, dt.year, dt.month, dt.day, dt.hour, dt.minute, 0.0,
+                               ephemeris=backend)
+        timings[backend] = (time.perf_counter() - t0) / len(births)
+    print(f"ChartContext.build: live {timings['live'] * 1e6:.0f} us, "
+          f"table {timings['table'] * 1e6:.0f} us "
+          f"({timings['live'] / timings['table']:.1f}x)")
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "build"
+    if command == "build":
+        t0 = time.perf_counter()
+        out = build_table(sys.argv[2] if len(sys.argv) > 2 else None)
+        print(f"Wrote {out} ({os.path.getsize(out) / 1e6:.1f} MB) in {time.perf_counter() - t0:.0f}s")
+    elif command == "report":
+        report()
+    else:
+        sys.exit("usage: python -m kundali_app.services.ephemeris_table [build [path] | report]")
@@ -0,0 +1,305 @@
+"""
+Bulk chart jobs.
+
+An upload (CSV or NDJSON births) is parsed line by line into ChartJobRecord
+rows, and results are written back per record, so neither the input nor the
+output of a job is ever held in memory as a whole. `JobRunner` computes the
+pending records of a job in chunks on the worker pool, keeping one chunk in
+flight per worker. All state lives in the database: jobs left pending or
+running by a restart are resumed from their remaining records.
+"""
+import csv
+import json
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, CancelledError, wait
+from datetime import datetime
+
+from kundali_app.core.config import settings
+from kundali_app.db.session import SessionLocal
+from kundali_app.models import ChartJob, ChartJobRecord, JobStatus
+from kundali_app.services.astrology import AstrologyService
+from kundali_app.services.tasks import compute_births
+from kundali_app.services.workers import PoolBusy, PoolTimeout, worker_pool
+
+INPUT_FORMATS = ("ndjson", "csv")
+REQUIRED_FIELDS = ("dob", "tob", "lat", "lon")
+
+# Records per INSERT while ingesting an upload
+INSERT_BATCH = 1000
+
+# Seconds between polls while a results stream waits for more records
+RESULTS_POLL = 0.5
+
+ACTIVE = (JobStatus.PENDING.value, JobStatus.RUNNING.value)
+
+
+def normalize_record(raw, line):
+    """Validated job record from a CSV row or NDJSON object; ValueError names the line."""
+    if not isinstance(raw, dict):
+        raise ValueError(f"line {line}: expected an object")
+    missing = [name for name in REQUIRED_FIELDS if raw.get(name) in (None, "")]
+    if missing:
+        raise ValueError(f"line {line}: missing {', '.join(missing)}")
+    try:
+        timezone = raw.get("timezone")
+        record = {
+            "dob": str(raw["dob"]).strip(),
+            "tob": str(raw["tob"]).strip(),
+            "lat": float(raw["lat"]),
+            "lon": float(raw["lon"]),
+            "timezone": 5.5 if timezone in (None, "") else float(timezone),
+        }
+        AstrologyService.parse_birth(record["dob"], record["tob"])
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"line {line}: {e}")
+    if raw.get("place"):
+        record["place"] = str(raw["place"])
+    if raw.get("id") not in (None, ""):
+        record["id"] = raw["id"]
+    return record
+
+
+def read_records(lines, fmt):
+    """Yield normalized records from an iterable of text lines (a file object for CSV)."""
+    if fmt == "csv":
+        reader = csv.DictReader(lines)
+        for row in reader:
+            yield normalize_record({k.strip().lower(): v for k, v in row.items() if k}, reader.line_num)
+        return
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            raw = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"line {number}: invalid JSON ({e.msg})")
+        yield normalize_record(raw, number)
+
+
+def progress(job):
+    """Progress and throughput of a ChartJob as a plain dict."""
+    processed = job.done + job.failed
+    elapsed = None
+    rate = None
+    eta = None
+    if job.started_at is not None:
+        elapsed = ((job.finished_at or datetime.utcnow()) - job.started_at).total_seconds()
+        if elapsed > 0 and processed:
+            rate = processed / elapsed
+            if job.status in ACTIVE:
+                eta = round((job.total - processed) / rate, 1)
+    return {
+        "id": job.id,
+        "status": job.status,
+        "sections": job.sections.split(","),
+        "ayanamsa": job.ayanamsa,
+        "total": job.total,
+        "done": job.done,
+        "failed": job.failed,
+        "progress": round(processed / job.total, 4) if job.total else 0.0,
+        "elapsed_seconds": round(elapsed, 3) if elapsed is not None else None,
+        "records_per_second": round(rate, 2) if rate is not None else None,
+        "eta_seconds": eta,
+        "error": job.error,
+        "created_at": job.created_at,
+    }
+
+
+class JobRunner:
+    """Runs chart jobs on background threads, one per active job."""
+
+    def __init__(self, pool=worker_pool, chunk_size=50, max_records=100000, chunk_timeout=None):
+        self.pool = pool
+        self.chunk_size = chunk_size
+        self.max_records = max_records
+        # Seconds a chunk may take once submitted; None uses the pool timeout
+        self.chunk_timeout = chunk_timeout
+        self._threads = {}
+        self._lock = threading.Lock()
+
+    def create(self, lines, fmt, sections, ayanamsa=None, dasha_depth=2):
+        """
+        Store a job and its records from `lines` and start it; returns its progress.
+        Nothing is stored if any record is invalid (ValueError).
+        """
+        db = SessionLocal()
+        try:
+            job = ChartJob(sections=",".join(sections), ayanamsa=ayanamsa, dasha_depth=dasha_depth)
+            db.add(job)
+            db.flush()
+            total = 0
+            batch = []
+            for record in read_records(lines, fmt):
+                total += 1
+                if total > self.max_records:
+                    raise ValueError(f"A job is limited to {self.max_records} records")
+                batch.append({"job_id": job.id, "seq": total, "payload": json.dumps(record),
+                              "status": JobStatus.PENDING.value})
+                if len(batch) >= INSERT_BATCH:
+                    db.bulk_insert_mappings(ChartJobRecord, batch)
+                    batch = []
+            if batch:
+                db.bulk_insert_mappings(ChartJobRecord, batch)
+            if not total:
+                raise ValueError("The upload contains no records")
+            job.total = total
+            db.commit()
+            summary = progress(job)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        self.start(summary["id"])
+        return summary
+
+    def start(self, job_id):
+        with self._lock:
+            thread = self._threads.get(job_id)
+            if thread is not None and thread.is_alive():
+                return
+            thread = threading.Thread(target=self._run, args=(job_id,), name=f"chart-job-{job_id[:8]}", daemon=True)
+            self._threads[job_id] = thread
+        thread.start()
+
+    def resume(self):
+        """Restart every job a previous process left pending or running."""
+        db = SessionLocal()
+        try:
+            job_ids = [row.id for row in db.query(ChartJob.id).filter(ChartJob.status.in_(ACTIVE))]
+        finally:
+            db.close()
+        for job_id in job_ids:
+            self.start(job_id)
+        return job_ids
+
+    def _run(self, job_id):
+        db = SessionLocal()
+        try:
+            job = db.get(ChartJob, job_id)
+            job.status = JobStatus.RUNNING.value
+            job.started_at = job.started_at or datetime.utcnow()
+            db.commit()
+            sections = job.sections.split(",")
+
+            in_flight = {}  # Future -> (record ids of its chunk, deadline)
+            chunk_timeout = self.chunk_timeout or self.pool.timeout
+            last_seq = 0
+            exhausted = False
+            while True:
+                while not exhausted and len(in_flight) < self.pool.workers:
+                    rows = (db.query(ChartJobRecord.id, ChartJobRecord.seq, ChartJobRecord.payload)
+                            .filter(ChartJobRecord.job_id == job_id,
+                                    ChartJobRecord.status == JobStatus.PENDING.value,
+                                    ChartJobRecord.seq > last_seq)
+                            .order_by(ChartJobRecord.seq)
+                            .limit(self.chunk_size)
+                            .all())
+                    if not rows:
+                        exhausted = True
+                        break
+                    try:
+                        future = self.pool.submit(compute_births, [json.loads(row.payload) for row in rows],
+                                                  sections, job.ayanamsa, job.dasha_depth)
+                    except PoolBusy:
+                        break
+                    last_seq = rows[-1].seq
+                    in_flight[future] = ([row.id for row in rows], time.monotonic() + chunk_timeout)
+                if not in_flight:
+                    if exhausted:
+                        break
+                    time.sleep(0.25)  # Pool is full with other work
+                    continue
+                first_deadline = min(deadline for _, deadline in in_flight.values())
+                done, _ = wait(in_flight, timeout=max(0.0, first_deadline - time.monotonic()),
+                               return_when=FIRST_COMPLETED)
+                for future in done:
+                    self._store(db, job, in_flight.pop(future)[0], future)
+                now = time.monotonic()
+                for future in [f for f, (_, deadline) in in_flight.items() if deadline <= now]:
+                    # Cancelled if not started; a running chunk keeps its worker until it ends
+                    future.cancel()
+                    error = PoolTimeout(f"Chunk did not finish within {chunk_timeout:g}s")
+                    self._store(db, job, in_flight.pop(future)[0], error=error)
+
+            job.status = JobStatus.COMPLETED.value
+            job.finished_at = datetime.utcnow()
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            job = db.get(ChartJob, job_id)
+            if job is not None:
+                job.status = JobStatus.FAILED.value
+                job.error = f"{type(e).__name__}: {e}"
+                job.finished_at = datetime.utcnow()
+                db.commit()
+        finally:
+            db.close()
+            with self._lock:
+                self._threads.pop(job_id, None)
+
+    @staticmethod
+    def _store(db, job, record_ids, future=None, error=None):
+        if error is None and future.cancelled():
+            error = CancelledError("the chunk was cancelled")
+        elif error is None and future.exception() is not None:
+            error = future.exception()
+        if error is not None:
+            # The whole chunk was lost (e.g. a worker process died or it timed out)
+            outcomes = [{"error": f"{type(error).__name__}: {error}"}] * len(record_ids)
+        else:
+            outcomes = future.result()
+        updates = []
+        for record_id, outcome in zip(record_ids, outcomes):
+            if "error" in outcome:
+                updates.append({"id": record_id, "status": JobStatus.FAILED.value, "error": outcome["error"]})
+                job.failed += 1
+            else:
+                updates.append({"id": record_id, "status": JobStatus.COMPLETED.value,
+                                "result": json.dumps(outcome["result"], default=str)})
+                job.done += 1
+        db.bulk_update_mappings(ChartJobRecord, updates)
+        db.commit()
+
+    @staticmethod
+    def results(job_id, follow=True, page=500):
+        """
+        Yield NDJSON lines ({"seq", "id", "result" | "error"}) in upload order.
+        With follow=True the stream waits for records still being computed and
+        ends when the job finishes; otherwise it stops at the first pending one.
+        """
+        last_seq = 0
+        while True:
+            db = SessionLocal()
+            try:
+                rows = (db.query(ChartJobRecord.seq, ChartJobRecord.status, ChartJobRecord.payload,
+                                 ChartJobRecord.result, ChartJobRecord.error)
+                        .filter(ChartJobRecord.job_id == job_id, ChartJobRecord.seq > last_seq)
+                        .order_by(ChartJobRecord.seq)
+                        .limit(page)
+                        .all())
+                status = db.query(ChartJob.status).filter(ChartJob.id == job_id).scalar()
+            finally:
+                db.close()
+
+            emitted = False
+            for row in rows:
+                if row.status == JobStatus.PENDING.value:
+                    break
+                record_id = json.dumps(json.loads(row.payload).get("id"))
+                if row.status == JobStatus.COMPLETED.value:
+                    # `result` is stored as JSON already; splice it in rather than re-encoding
+                    yield f'{{"seq": {row.seq}, "id": {record_id}, "result": {row.result}}}\n'
+                else:
+                    yield f'{{"seq": {row.seq}, "id": {record_id}, "error": {json.dumps(row.error)}}}\n'
+                last_seq = row.seq
+                emitted = True
+            if emitted:
+                continue
+            if not follow or status not in ACTIVE:
+                return
+            time.sleep(RESULTS_POLL)
+
+
+job_runner = JobRunner(chunk_size=settings.JOB_CHUNK_SIZE, max_records=settings.JOB_MAX_RECORDS)
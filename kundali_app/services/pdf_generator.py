@@ -1,15 +1,164 @@
+"""
+PDF kundali reports.
+
+The default report is the per-user pages (birth details, astrological
+details, planetary positions) alone. The illustrated report
+(`illustrated=True`) adds a cover, the house introductions from
+predictions.json and a page background. Only the per-user pages depend on
+the request, so:
+
+- The images in kundali_app/assets are decoded once per process,
+  downsampled to PDF_ASSET_DPI at the size they are drawn and kept as
+  shared ImageReaders (`load_assets`).
+- The cover, the house introductions and a page background (border and
+  mandala watermark) are rendered once into a `ReportTemplate`. They are
+  rebuilt when the reference data changes.
+- Per report, ReportLab renders only the user pages. pypdf stamps the
+  background under them and the house pages and joins them with the cover;
+  the template's compressed images are copied as they are.
+
+Without pypdf, everything is drawn by ReportLab in one document, still from
+the preloaded assets. `render_batch` spreads many reports over the worker
+pool.
+"""
+import math
+import os
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from io import BytesIO
+
+from PIL import Image
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas as pdf_canvas
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
-from io import BytesIO
+
+from kundali_app.core.config import settings
+from kundali_app.services.reference_data import registry as reference_data
+
+try:
+    import pypdf
+except ImportError:  # optional dependency
+    pypdf = None
+
+ASSETS_DIR = os.path.join(os.path.dirname(__file__), '..', 'assets')
+
+PAGE_WIDTH, PAGE_HEIGHT = A4
+
+# Drawn size (points) of each asset; images are downsampled to PDF_ASSET_DPI at this size
+ASSET_SIZES = {
+    "cover_pattern": (PAGE_HEIGHT, PAGE_HEIGHT),  # page background, cropped at the sides
+    "cover_ganesha": (220, 220),
+    "cover_hindi_text": (300, 300),
+    "mandala": (360, 360),
+    "book": (90, 90),
+}
+
+# Reports per worker task in render_batch
+BATCH_CHUNK = 8
+
+BIRTH_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#FFF8E7')),
+    ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#2D1810')),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+])
+
+ASTRO_TABLE_STYLE = TableStyle([
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+    ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#FFF8E7')),
+])
+
+PLANETS_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#8B0000')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+])
+
+
+# Opaque images are embedded as JPEG at this quality; ones with transparency stay lossless
+JPEG_QUALITY = 85
+
+
+def load_assets(directory=ASSETS_DIR, dpi=None):
+    """
+    {name: ImageReader} of ASSET_SIZES, decoded and downsampled (never
+    upsampled) once. Opaque images are re-encoded as JPEG, which ReportLab
+    embeds as is instead of compressing raw pixels per document.
+    """
+    dpi = dpi or settings.PDF_ASSET_DPI
+    assets = {}
+    for name, (width, height) in ASSET_SIZES.items():
+        with Image.open(os.path.join(directory, f"{name}.png")) as image:
+            image.load()
+            image.thumbnail((round(width / 72 * dpi), round(height / 72 * dpi)), Image.LANCZOS)
+            if image.mode in ("RGBA", "LA") and image.getextrema()[-1][0] < 255:
+                assets[name] = ImageReader(image)
+                continue
+            encoded = BytesIO()
+            image.convert("RGB").save(encoded, "JPEG", quality=JPEG_QUALITY)
+            encoded.seek(0)
+            assets[name] = ImageReader(encoded)
+    return assets
+
+
+def draw_cover(c, assets):
+    c.drawImage(assets["cover_pattern"], (PAGE_WIDTH - PAGE_HEIGHT) / 2, 0, PAGE_HEIGHT, PAGE_HEIGHT)
+    c.drawImage(assets["cover_ganesha"], (PAGE_WIDTH - 220) / 2, PAGE_HEIGHT - 330, 220, 220, mask='auto')
+    c.drawImage(assets["cover_hindi_text"], (PAGE_WIDTH - 300) / 2, 170, 300, 300, mask='auto')
+    c.setFillColor(colors.HexColor('#8B0000'))
+    c.setFont('Helvetica-Bold', 30)
+    c.drawCentredString(PAGE_WIDTH / 2, 120, "Janma Kundali Report")
+
+
+def draw_background(c, assets):
+    c.saveState()
+    c.setFillAlpha(0.08)
+    c.drawImage(assets["mandala"], (PAGE_WIDTH - 360) / 2, (PAGE_HEIGHT - 360) / 2, 360, 360)
+    c.restoreState()
+    c.setStrokeColor(colors.HexColor('#8B0000'))
+    c.setLineWidth(1.5)
+    c.rect(24, 24, PAGE_WIDTH - 48, PAGE_HEIGHT - 48)
+
+
+class ReportTemplate:
+    """The pages every report shares, rendered once to PDF bytes (see the module docstring)."""
+
+    def __init__(self, generator, assets, predictions, version):
+        self.version = version
+        self.cover = self._canvas_page(lambda c: draw_cover(c, assets))
+        self.background = self._canvas_page(lambda c: draw_background(c, assets))
+        buffer = BytesIO()
+        SimpleDocTemplate(buffer, pagesize=A4).build(generator.house_flowables(predictions))
+        self.houses = buffer.getvalue()
+
+    @staticmethod
+    def _canvas_page(draw):
+        buffer = BytesIO()
+        c = pdf_canvas.Canvas(buffer, pagesize=A4)
+        draw(c)
+        c.showPage()
+        c.save()
+        return buffer.getvalue()
+
 
 class PDFGenerator:
     def __init__(self):
         self.width, self.height = A4
         self.styles = getSampleStyleSheet()
         self.create_custom_styles()
+        self._assets = None
+        self._template = None
+        self._lock = threading.Lock()
 
     def create_custom_styles(self):
         try:
@@ -47,9 +196,34 @@ class PDFGenerator:
             ))
         except KeyError: pass
 
-    def generate(self, data: dict) -> BytesIO:
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4)
+    @property
+    def assets(self):
+        if self._assets is None:
+            with self._lock:
+                if self._assets is None:
+                    self._assets = load_assets()
+        return self._assets
+
+    def template(self):
+        """The ReportTemplate of the current reference data, built on first use."""
+        data = reference_data.get()
+        template = self._template
+        if template is None or template.version != data.version:
+            assets = self.assets
+            with self._lock:
+                if self._template is None or self._template.version != data.version:
+                    self._template = ReportTemplate(self, assets, data.predictions, data.version)
+                template = self._template
+        return template
+
+    def preload(self):
+        """Decode the assets and render the illustrated template now (e.g. in a worker initializer)."""
+        if pypdf is not None:
+            self.template()
+        else:
+            self.assets
+
+    def user_flowables(self, data):
         elements = []
 
         # 1. Title Page
@@ -72,13 +246,7 @@ class PDFGenerator:
             )]
         ]
         t = Table(bd_data, colWidths=[200, 300])
-        t.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#FFF8E7')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#2D1810')),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-        ]))
+        t.setStyle(BIRTH_TABLE_STYLE)
         elements.append(t)
         elements.append(Spacer(1, 0.3 * inch))
 
@@ -86,7 +254,7 @@ class PDFGenerator:
         elements.append(Paragraph("Astrological Details", self.styles['SectionHeader']))
         ad = data.get('astrological_details', {})
         pd = data.get('panchang_details', {})
-        
+
         astro_data = [
             ["Ascendant", ad.get('ascendant', '-')],
             ["Moon Sign", ad.get('sign', '-')],
@@ -94,10 +262,7 @@ class PDFGenerator:
             ["Tithi", pd.get('tithi', '-')],
         ]
         t2 = Table(astro_data, colWidths=[200, 300])
-        t2.setStyle(TableStyle([
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#FFF8E7')),
-        ]))
+        t2.setStyle(ASTRO_TABLE_STYLE)
         elements.append(t2)
         elements.append(Spacer(1, 0.3 * inch))
 
@@ -117,21 +282,92 @@ class PDFGenerator:
                     str(p.get('house', '')),
                     is_retro
                 ])
-            
+
             t3 = Table(table_data, colWidths=[80, 80, 60, 100, 50, 80])
-            t3.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#8B0000')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ]))
+            t3.setStyle(PLANETS_TABLE_STYLE)
             elements.append(t3)
+        return elements
+
+    def house_flowables(self, predictions):
+        elements = [Paragraph("The Twelve Houses", self.styles['SectionHeader'])]
+        for house, text in sorted(predictions.get("houses_intro", {}).items(), key=lambda item: int(item[0])):
+            elements.append(Paragraph(f"<b>House {house}</b>", self.styles['Normal']))
+            elements.append(Paragraph(text, self.styles['Normal']))
+            elements.append(Spacer(1, 0.15 * inch))
+        return elements
 
-        doc.build(elements)
+    def generate(self, data: dict, illustrated: bool = False) -> BytesIO:
+        if illustrated:
+            return self.generate_illustrated(data)
+        buffer = BytesIO()
+        SimpleDocTemplate(buffer, pagesize=A4).build(self.user_flowables(data))
         buffer.seek(0)
         return buffer
 
+    def generate_illustrated(self, data: dict) -> BytesIO:
+        if pypdf is None:
+            return self.generate_direct(data)
+        template = self.template()
+        body = BytesIO()
+        SimpleDocTemplate(body, pagesize=A4).build(self.user_flowables(data))
+
+        # One background page for all stamped pages, so its image is written once
+        background = pypdf.PdfReader(BytesIO(template.background)).pages[0]
+        writer = pypdf.PdfWriter()
+        writer.append(pypdf.PdfReader(BytesIO(template.cover)))
+        for reader in (pypdf.PdfReader(body), pypdf.PdfReader(BytesIO(template.houses))):
+            for page in reader.pages:
+                page.merge_page(background, over=False)
+                writer.add_page(page)
+        buffer = BytesIO()
+        writer.write(buffer)
+        buffer.seek(0)
+        return buffer
+
+    def generate_direct(self, data: dict, assets=None) -> BytesIO:
+        """The illustrated report drawn by ReportLab alone (no pypdf); images are re-encoded per report."""
+        assets = assets or self.assets
+        buffer = BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=A4)
+        background = lambda c, d: draw_background(c, assets)
+        elements = [PageBreak(), *self.user_flowables(data), PageBreak(),
+                    *self.house_flowables(reference_data.get().predictions)]
+        doc.build(elements, onFirstPage=lambda c, d: draw_cover(c, assets), onLaterPages=background)
+        buffer.seek(0)
+        return buffer
+
+
+def render_batch(payloads, illustrated=False, pool=None, chunk_size=BATCH_CHUNK, timeout=None):
+    """
+    PDF bytes for many report payloads, in order, rendered `chunk_size` per
+    task across the worker pool. `timeout` (default: the pool timeout per
+    round of tasks) bounds the whole batch; PoolBusy/PoolTimeout as for
+    WorkerPool.run.
+    """
+    from kundali_app.services.tasks import render_pdfs
+    from kundali_app.services.workers import worker_pool
+    pool = pool or worker_pool
+    futures = []
+    try:
+        for start in range(0, len(payloads), chunk_size):
+            futures.append(pool.submit(render_pdfs, payloads[start:start + chunk_size], illustrated))
+    except Exception:
+        # e.g. PoolBusy partway through: nobody will receive the chunks already queued
+        for future in futures:
+            future.cancel()
+        raise
+    timeout = timeout or pool.timeout * max(1, math.ceil(len(futures) / pool.workers))
+    deadline = time.monotonic() + timeout
+    pdfs = []
+    try:
+        for future in futures:
+            pdfs.extend(future.result(max(0, deadline - time.monotonic())))
+    except FutureTimeoutError:
+        raise pool.expire(futures, f"PDF batch did not finish within {timeout:g}s")
+    except Exception:
+        for future in futures:
+            future.cancel()
+        raise
+    return pdfs
+
 pdf_generator = PDFGenerator()
@@ -0,0 +1,87 @@
+"""
+Bulk storage of PlanetaryPosition rows.
+
+Positions are written and read through Core statements instead of one ORM
+object per planet: `replace_positions` deletes and re-inserts the rows of any
+number of profiles with one DELETE and one executemany INSERT, and
+`load_positions` (or `load_positions_async`) reads many profiles' rows with
+one indexed query per `READ_BATCH` ids (index ix_planetary_positions_profile_chart).
+"""
+from collections import defaultdict
+
+from sqlalchemy import delete, insert, select
+
+from kundali_app.models import ChartType, PlanetaryPosition
+
+NAVAMSHA_SPAN = 30 / 9
+
+# Profile ids per IN (...) clause; keeps well under SQLite's bound-parameter limit
+READ_BATCH = 500
+
+positions = PlanetaryPosition.__table__
+
+
+def position_mappings(profile_id, data):
+    """PlanetaryPosition rows (as dicts) for every varga in a snapshot: D1 and D9."""
+    rows = []
+    d9_signs = {p["planet"]: p for p in data["charts"]["navamsha_chart"]["planets"]}
+    for p in data["planets"]:
+        rows.append({
+            "profile_id": profile_id, "chart_type": ChartType.D1.value, "planet": p["planet"],
+            "sign_id": p["sign_id"], "degree": p["degree_decimal"], "absolute_degree": p["absolute_degree"],
+            "house": p["house"], "nakshatra_id": p["nakshatra_id"], "nakshatra_pada": p["nakshatra_pada"],
+            "is_retrograde": p["is_retrograde"],
+        })
+        d9 = d9_signs.get(p["planet"])
+        if d9 is None:
+            continue
+        # Each navamsha stretches 3deg20' of the D1 sign over a whole D9 sign
+        degree = round((p["degree_decimal"] % NAVAMSHA_SPAN) * 9, 4)
+        rows.append({
+            "profile_id": profile_id, "chart_type": ChartType.D9.value, "planet": p["planet"],
+            "sign_id": d9["sign_id"], "degree": degree, "absolute_degree": round((d9["sign_id"] - 1) * 30 + degree, 4),
+            "house": d9["house"], "nakshatra_id": None, "nakshatra_pada": None,
+            "is_retrograde": d9["is_retrograde"],
+        })
+    return rows
+
+
+def replace_positions(db, rows, profile_ids=None):
+    """
+    Replace the stored positions of `profile_ids` (default: those in `rows`)
+    with `rows`: one DELETE and one executemany INSERT. The caller commits.
+    """
+    if profile_ids is None:
+        profile_ids = {row["profile_id"] for row in rows}
+    profile_ids = list(profile_ids)
+    for start in range(0, len(profile_ids), READ_BATCH):
+        db.execute(delete(positions).where(positions.c.profile_id.in_(profile_ids[start:start + READ_BATCH])))
+    if rows:
+        db.execute(insert(positions), rows)
+
+
+def _positions_query(profile_ids, chart_type):
+    query = select(positions).where(positions.c.profile_id.in_(profile_ids))
+    if chart_type is not None:
+        query = query.where(positions.c.chart_type == chart_type)
+    return query.order_by(positions.c.profile_id, positions.c.id)
+
+
+def load_positions(db, profile_ids, chart_type=None):
+    """{profile_id: [position dicts]} for many profiles; profiles without rows map to []."""
+    profile_ids = list(profile_ids)
+    found = defaultdict(list)
+    for start in range(0, len(profile_ids), READ_BATCH):
+        for row in db.execute(_positions_query(profile_ids[start:start + READ_BATCH], chart_type)):
+            found[row.profile_id].append(row._asdict())
+    return {profile_id: found.get(profile_id, []) for profile_id in profile_ids}
+
+
+async def load_positions_async(db, profile_ids, chart_type=None):
+    """load_positions for an AsyncSession."""
+    profile_ids = list(profile_ids)
+    found = defaultdict(list)
+    for start in range(0, len(profile_ids), READ_BATCH):
+        for row in await db.execute(_positions_query(profile_ids[start:start + READ_BATCH], chart_type)):
+            found[row.profile_id].append(row._asdict())
+    return {profile_id: found.get(profile_id, []) for profile_id in profile_ids}
@@ -0,0 +1,114 @@
+"""
+Background chart computation for new profiles.
+
+Creating a profile only stores its birth data with chart_status "pending" and
+queues it here; `ProfileChartQueue` threads then build and store its snapshot
+(services/snapshots.py) on the worker pool. A failed attempt is retried after
+an exponential backoff until `max_attempts`, after which the profile is marked
+"failed" with the error. Status lives on the Profile row, so profiles left
+pending or running by a restart are queued again on startup.
+"""
+import queue
+import threading
+
+from kundali_app.db.session import SessionLocal
+from kundali_app.core.config import settings
+from kundali_app.models import JobStatus, Profile
+from kundali_app.services.snapshots import get_snapshot
+from kundali_app.services.workers import worker_pool
+
+ACTIVE = (JobStatus.PENDING.value, JobStatus.RUNNING.value)
+
+
+def chart_status(profile):
+    """Chart status of a profile as a plain dict."""
+    return {
+        "id": profile.id,
+        "status": profile.chart_status or JobStatus.PENDING.value,
+        "attempts": profile.chart_attempts or 0,
+        "error": profile.chart_error,
+    }
+
+
+class ProfileChartQueue:
+    """Computes queued profiles' snapshots on a few background threads, with retries."""
+
+    def __init__(self, pool=worker_pool, threads=2, max_attempts=3, backoff=2.0):
+        self.pool = pool
+        self.threads = threads
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self._queue = queue.Queue()
+        self._workers = []
+        self._lock = threading.Lock()
+
+    def _start(self):
+        with self._lock:
+            self._workers = [t for t in self._workers if t.is_alive()]
+            for n in range(len(self._workers), self.threads):
+                thread = threading.Thread(target=self._work, name=f"profile-charts-{n}", daemon=True)
+                self._workers.append(thread)
+                thread.start()
+
+    def enqueue(self, profile_id, attempt=1):
+        self._start()
+        self._queue.put((profile_id, attempt))
+
+    def resume(self):
+        """Queue every profile a previous process left pending or running."""
+        db = SessionLocal()
+        try:
+            profile_ids = [row.id for row in db.query(Profile.id).filter(Profile.chart_status.in_(ACTIVE))]
+        finally:
+            db.close()
+        for profile_id in profile_ids:
+            self.enqueue(profile_id)
+        return profile_ids
+
+    def _work(self):
+        while True:
+            profile_id, attempt = self._queue.get()
+            try:
+                self._compute(profile_id, attempt)
+            finally:
+                self._queue.task_done()
+
+    def _compute(self, profile_id, attempt):
+        db = SessionLocal()
+        try:
+            profile = db.get(Profile, profile_id)
+            if profile is None:
+                return  # Deleted while queued
+            profile.chart_status = JobStatus.RUNNING.value
+            profile.chart_attempts = attempt
+            db.commit()
+            try:
+                get_snapshot(db, profile, run=self.pool.run)
+            except Exception as e:
+                db.rollback()
+                profile = db.get(Profile, profile_id)
+                if profile is None:
+                    return
+                profile.chart_error = f"{type(e).__name__}: {e}"
+                if attempt < self.max_attempts:
+                    profile.chart_status = JobStatus.PENDING.value
+                    delay = self.backoff * 2 ** (attempt - 1)
+                    timer = threading.Timer(delay, self.enqueue, args=(profile_id, attempt + 1))
+                    timer.daemon = True
+                    timer.start()
+                else:
+                    profile.chart_status = JobStatus.FAILED.value
+                db.commit()
+                return
+            profile.chart_status = JobStatus.COMPLETED.value
+            profile.chart_error = None
+            db.commit()
+        finally:
+            db.close()
+
+
+profile_charts = ProfileChartQueue(
+    threads=settings.PROFILE_CHART_THREADS,
+    max_attempts=settings.PROFILE_CHART_ATTEMPTS,
+    backoff=settings.PROFILE_CHART_BACKOFF,
+)
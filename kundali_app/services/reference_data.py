@@ -0,0 +1,226 @@
+"""
+Reference data registry.
+
+Every JSON file under kundali_app/data is read and validated once into an
+immutable ReferenceData (nested MappingProxyType/tuples) together with the
+index tables the calculations need: sign and nakshatra attributes as tuples
+indexed by 0-based sign/nakshatra number and the navamsha map as a 12 x 9
+array of sign indexes. Requests read `registry.get()` and do no file I/O.
+
+With a reload interval, `get()` re-stats the files at most once per interval
+and swaps in a fresh ReferenceData when one changed; a file that fails
+validation is reported and the previous data stays in use. Readers holding
+the old object keep a consistent view. `version` hashes the file contents
+and is part of the snapshot fingerprint, so edited texts reach stored charts.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping, Tuple
+
+import numpy as np
+
+from kundali_app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+
+# Files loaded by the registry, by ReferenceData field
+DATA_FILES = {
+    "lookups": "astro_lookups.json",
+    "chart_definitions": "chart_definitions.json",
+    "dasha": "dasha_data.json",
+    "ascendant_reports": "ascendant_reports.json",
+    "predictions": "predictions.json",
+}
+
+PAYAS = ("gold", "silver", "copper")
+
+
+def freeze(value):
+    """Read-only copy of parsed JSON: dicts become MappingProxyType, lists tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value):
+    """Plain dict/list copy of frozen data, for embedding in responses."""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+@dataclass(frozen=True, eq=False)
+class ReferenceData:
+    """One validated load of kundali_app/data; see the module docstring."""
+    version: str
+    lookups: Mapping
+    chart_definitions: Mapping
+    dasha: Mapping
+    ascendant_reports: Mapping
+    predictions: Mapping
+
+    signs: Tuple[str, ...]                  # 0 = Aries
+    sign_index: Mapping[str, int]
+    sign_lords: Tuple[str, ...]
+    nakshatras: Tuple[str, ...]             # 0 = Ashwini
+    nakshatra_lords: Tuple[str, ...]
+    nakshatra_ganas: Tuple[str, ...]
+    nakshatra_yonis: Tuple[str, ...]
+    nakshatra_payas: Tuple[str, ...]        # "Gold", "Silver", "Copper" or "Iron"
+    navamsha: np.ndarray                    # [sign, part 0-8] -> D9 sign index (read-only)
+
+    @property
+    def vimshottari(self):
+        return self.dasha["vimshottari"]
+
+    @property
+    def dasha_effects(self):
+        return self.dasha.get("dasha_effects", MappingProxyType({}))
+
+    @classmethod
+    def load(cls, directory=DATA_DIR):
+        docs = {}
+        digest = hashlib.sha1()
+        for field, name in DATA_FILES.items():
+            with open(os.path.join(directory, name), 'rb') as f:
+                raw = f.read()
+            digest.update(raw)
+            try:
+                docs[field] = freeze(json.loads(raw))
+            except ValueError as e:
+                raise ValueError(f"{name}: {e}")
+        return cls.build(digest.hexdigest()[:12], **docs)
+
+    @classmethod
+    def build(cls, version, lookups, chart_definitions, dasha, ascendant_reports, predictions):
+        """Validate the documents and derive the index tables; ValueError names the bad file."""
+        def check(condition, name, message):
+            if not condition:
+                raise ValueError(f"{name}: {message}")
+
+        rashis, nakshatras = lookups.get("rashis", ()), lookups.get("nakshatras", ())
+        check(len(rashis) == 12, "astro_lookups.json", "expected 12 rashis")
+        check(len(nakshatras) == 27, "astro_lookups.json", "expected 27 nakshatras")
+        check(len(lookups.get("samvatsaras", ())) == 60, "astro_lookups.json", "expected 60 samvatsaras")
+        for field in ("name", "lord", "varna", "vashya"):
+            check(all(field in r for r in rashis), "astro_lookups.json", f"rashi without {field!r}")
+        for field in ("name", "lord", "gana", "yoni", "nadi", "padas"):
+            check(all(field in n for n in nakshatras), "astro_lookups.json", f"nakshatra without {field!r}")
+        signs = tuple(r["name"] for r in rashis)
+        sign_index = {name: i for i, name in enumerate(signs)}
+
+        mapping = chart_definitions.get("navamsha_mapping", {})
+        check(set(mapping) == set(signs), "chart_definitions.json", "navamsha_mapping must cover the 12 signs")
+        check(all(len(parts) == 9 and set(parts) <= set(signs) for parts in mapping.values()),
+              "chart_definitions.json", "navamsha_mapping needs 9 known signs per sign")
+        for chart in ("lagna", "moon", "navamsha"):
+            check("description" in chart_definitions.get("charts", {}).get(chart, {}),
+                  "chart_definitions.json", f"no description for the {chart} chart")
+        navamsha = np.array([[sign_index[s] for s in mapping[sign]] for sign in signs], dtype=np.int8)
+        navamsha.setflags(write=False)
+
+        v = dasha.get("vimshottari", {})
+        lords = v.get("lords", ())
+        check(len(lords) == 9 and set(v.get("periods", {})) == set(lords), "dasha_data.json",
+              "vimshottari needs 9 lords with periods")
+        check(sum(v["periods"].values()) == v.get("total_years"), "dasha_data.json",
+              "vimshottari periods must add up to total_years")
+        check(tuple(v.get("nakshatra_lords", {})) == tuple(n["name"] for n in nakshatras), "dasha_data.json",
+              "nakshatra_lords must list the 27 nakshatras in order")
+        check(all(v["nakshatra_lords"][n["name"]] == n["lord"] for n in nakshatras), "dasha_data.json",
+              "nakshatra_lords disagree with the nakshatra lords of astro_lookups.json")
+
+        reports = ascendant_reports.get("ascendant_reports", {})
+        check(set(reports) == set(signs), "ascendant_reports.json", "expected a report per sign")
+
+        paya = lookups.get("paya", {})
+        payas = tuple(next((p.capitalize() for p in PAYAS if i in paya.get(p, ())), "Iron") for i in range(27))
+
+        return cls(
+            version=version, lookups=lookups, chart_definitions=chart_definitions, dasha=dasha,
+            ascendant_reports=ascendant_reports, predictions=predictions,
+            signs=signs, sign_index=MappingProxyType(sign_index),
+            sign_lords=tuple(r["lord"] for r in rashis),
+            nakshatras=tuple(n["name"] for n in nakshatras),
+            nakshatra_lords=tuple(v["nakshatra_lords"][n["name"]] for n in nakshatras),
+            nakshatra_ganas=tuple(n["gana"] for n in nakshatras),
+            nakshatra_yonis=tuple(n["yoni"] for n in nakshatras),
+            nakshatra_payas=payas,
+            navamsha=navamsha,
+        )
+
+
+class ReferenceRegistry:
+    """
+    The current ReferenceData, loaded on first use. With `reload_interval`
+    > 0, file modification times are checked at most that often.
+    """
+
+    def __init__(self, directory=DATA_DIR, reload_interval=0.0):
+        self.directory = directory
+        self.reload_interval = reload_interval
+        self.reloads = 0
+        self.errors = 0
+        self._data = None
+        self._mtimes = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def _stat(self):
+        return tuple(os.stat(os.path.join(self.directory, name)).st_mtime_ns for name in DATA_FILES.values())
+
+    def get(self) -> ReferenceData:
+        data = self._data
+        if data is not None and (self.reload_interval <= 0 or time.monotonic() - self._checked < self.reload_interval):
+            return data
+        with self._lock:
+            if self._data is None:
+                self._mtimes = self._stat()
+                self._data = ReferenceData.load(self.directory)
+            elif self.reload_interval > 0 and time.monotonic() - self._checked >= self.reload_interval:
+                self._maybe_reload()
+            self._checked = time.monotonic()
+            return self._data
+
+    def _maybe_reload(self):
+        try:
+            mtimes = self._stat()
+            if mtimes == self._mtimes:
+                return
+            self._data = ReferenceData.load(self.directory)
+            self._mtimes = mtimes
+            self.reloads += 1
+            logger.info("Reloaded reference data, version %s", self._data.version)
+        except (OSError, ValueError) as e:
+            self.errors += 1
+            logger.error("Keeping reference data %s: %s", self._data.version, e)
+
+    def reload(self):
+        """Load the files now (e.g. after a deploy); raises if they do not validate."""
+        with self._lock:
+            mtimes = self._stat()
+            self._data = ReferenceData.load(self.directory)
+            self._mtimes = mtimes
+            self._checked = time.monotonic()
+            self.reloads += 1
+            return self._data
+
+    def stats(self):
+        data = self._data
+        return {"version": data.version if data else None, "reload_interval": self.reload_interval,
+                "reloads": self.reloads, "errors": self.errors}
+
+
+registry = ReferenceRegistry(reload_interval=settings.REFERENCE_RELOAD_SECONDS)
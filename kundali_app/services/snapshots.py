@@ -0,0 +1,84 @@
+"""
+Materialized chart snapshots.
+
+A profile's charts are computed once (tasks.build_snapshot) and stored as
+JSON in ChartSnapshot together with a fingerprint of everything that shapes
+the result: birth data, place, ayanamsa, house system, ephemeris backend,
+ENGINE_VERSION and the reference data version. Reads compare fingerprints and rebuild only when one of those
+changed. Storing a snapshot also rewrites the profile's PlanetaryPosition
+rows (D1 and D9) and its DashaTransition rows (services/dasha_transitions.py) so
+those tables agree with it.
+"""
+import hashlib
+import json
+
+from sqlalchemy.exc import IntegrityError
+
+from kundali_app.core.config import settings
+from kundali_app.models import ChartSnapshot
+from kundali_app.services.ayanamsa import resolve as resolve_ayanamsa
+from kundali_app.services.positions import position_mappings, replace_positions
+from kundali_app.services.reference_data import registry as reference_data
+from kundali_app.services.tasks import build_snapshot
+from kundali_app.services.dasha_transitions import replace_transitions, transition_mappings
+
+# Bump whenever a change to the calculations alters their output
+ENGINE_VERSION = "5"
+
+# Profiles do not carry a timezone yet
+PROFILE_TIMEZONE = 5.5
+
+
+def snapshot_args(profile):
+    """Arguments of tasks.build_snapshot for a profile."""
+    return (resolve_ayanamsa(profile.ayanamsa), profile.lat, profile.lon,
+            profile.dob.year, profile.dob.month, profile.dob.day,
+            profile.tob.hour, profile.tob.minute, PROFILE_TIMEZONE,
+            profile.location_name or "Unknown")
+
+
+def fingerprint(profile):
+    inputs = [ENGINE_VERSION, reference_data.get().version, settings.HOUSE_SYSTEM, settings.EPHEMERIS_BACKEND,
+              *snapshot_args(profile)]
+    return hashlib.sha1(json.dumps(inputs).encode()).hexdigest()
+
+
+def load(db, profile):
+    """The stored snapshot if it is still current, else None."""
+    row = db.get(ChartSnapshot, profile.id)
+    if row is None or row.fingerprint != fingerprint(profile):
+        return None
+    return json.loads(row.data)
+
+
+def store(db, profile, data):
+    row = db.get(ChartSnapshot, profile.id)
+    if row is None:
+        row = ChartSnapshot(profile_id=profile.id)
+        db.add(row)
+    row.fingerprint = fingerprint(profile)
+    row.engine_version = ENGINE_VERSION
+    row.data = json.dumps(data, default=str)
+
+    replace_positions(db, position_mappings(profile.id, data), [profile.id])
+    replace_transitions(db, transition_mappings(profile, data), [profile.id])
+    try:
+        db.commit()
+    except IntegrityError:
+        # A concurrent build (background queue vs. a first read) stored it first
+        db.rollback()
+
+
+def get_snapshot(db, profile, run=None):
+    """
+    The profile's snapshot, rebuilt and stored when missing or stale.
+    `run(fn, *args)` executes the build (e.g. WorkerPool.run); default inline.
+    """
+    data = load(db, profile)
+    if data is None:
+        args = snapshot_args(profile)
+        data = run(build_snapshot, *args) if run else build_snapshot(*args)
+        # Round-trip so fresh and stored snapshots look the same (e.g. string house keys)
+        data = json.loads(json.dumps(data, default=str))
+        store(db, profile, data)
+    return data
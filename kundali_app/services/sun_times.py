@@ -0,0 +1,134 @@
+import ephem
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import NamedTuple, Optional
+
+from kundali_app.core.config import settings
+
+
+class SunTimes(NamedTuple):
+    """Rise/set instants for one local date as UTC ephem.Date floats (None if the Sun never rises/sets)."""
+    sunrise: Optional[float]
+    sunset: Optional[float]
+    next_sunrise: Optional[float]
+
+    def local(self, field, timezone):
+        """Local datetime of `field` ("sunrise", "sunset", "next_sunrise"), or None."""
+        value = getattr(self, field)
+        if value is None:
+            return None
+        return ephem.Date(value + timezone / 24.0).datetime()
+
+
+class SunTimesService:
+    """
+    Sunrise, sunset and next-day sunrise, cached per (grid cell, local date, timezone).
+
+    Coordinates are snapped to a `grid`-degree cell and the times are computed
+    at the cell centre, so every location in a cell shares one entry (0.01 deg
+    moves sunrise by a few seconds at most). grid=0 disables snapping.
+    """
+
+    def __init__(self, grid=0.01, maxsize=4096):
+        self.grid = grid
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def snap(self, lat, lon):
+        if not self.grid:
+            return float(lat), float(lon)
+        return round(round(lat / self.grid) * self.grid, 6), round(round(lon / self.grid) * self.grid, 6)
+
+    def get(self, lat, lon, local_date, timezone=5.5):
+        lat, lon = self.snap(lat, lon)
+        key = (lat, lon, local_date, timezone)
+        with self._lock:
+            times = self._data.get(key)
+            if times is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return times
+            self.misses += 1
+
+        times = self._compute_day(self._observer(lat, lon), local_date, timezone)
+        self._store(key, times)
+        return times
+
+    def precompute_year(self, lat, lon, year, timezone=5.5):
+        """Fill the cache for every local date of `year`; returns {date: SunTimes}."""
+        return dict(self.sweep(lat, lon, date(year, 1, 1), date(year, 12, 31), timezone))
+
+    def sweep(self, lat, lon, start, end, timezone=5.5):
+        """
+        Yield (local date, SunTimes) for start..end inclusive, caching each day.
+        Each day's next sunrise is the following day's sunrise, so a day costs
+        one rising and one setting instead of two risings and a setting.
+        """
+        lat, lon = self.snap(lat, lon)
+        obs = self._observer(lat, lon)
+        sun = ephem.Sun()
+        day = start
+        sunrise = self._rise_or_set(obs.next_rising, sun, self._midnight_utc(day, timezone))
+        while day <= end:
+            midnight = self._midnight_utc(day, timezone)
+            sunset = self._rise_or_set(obs.next_setting, sun, midnight)
+            begin = sunrise + 0.5 if sunrise is not None else midnight + 1
+            next_sunrise = self._rise_or_set(obs.next_rising, sun, begin)
+            times = SunTimes(sunrise, sunset, next_sunrise)
+            self._store((lat, lon, day, timezone), times)
+            yield day, times
+            sunrise = next_sunrise
+            day += timedelta(days=1)
+
+    def _compute_day(self, obs, local_date, timezone):
+        sun = ephem.Sun()
+        midnight = self._midnight_utc(local_date, timezone)
+        sunrise = self._rise_or_set(obs.next_rising, sun, midnight)
+        sunset = self._rise_or_set(obs.next_setting, sun, midnight)
+        next_sunrise = None
+        if sunrise is not None:
+            next_sunrise = self._rise_or_set(obs.next_rising, sun, sunrise + 0.5)
+        return SunTimes(sunrise, sunset, next_sunrise)
+
+    @staticmethod
+    def _observer(lat, lon):
+        obs = ephem.Observer()
+        obs.lat, obs.lon = str(lat), str(lon)
+        return obs
+
+    @staticmethod
+    def _midnight_utc(local_date, timezone):
+        return ephem.Date(datetime(local_date.year, local_date.month, local_date.day) - timedelta(hours=timezone))
+
+    @staticmethod
+    def _rise_or_set(method, sun, start):
+        try:
+            return float(method(sun, start=start))
+        except (ephem.AlwaysUpError, ephem.NeverUpError):
+            return None
+
+    def _store(self, key, times):
+        with self._lock:
+            self._data[key] = times
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "grid_degrees": self.grid,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+sun_times = SunTimesService(grid=settings.SUN_GRID_DEG, maxsize=settings.SUN_CACHE_SIZE)
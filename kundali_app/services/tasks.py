@@ -0,0 +1,96 @@
+"""
+Work units dispatched to the worker pool (services/workers.py).
+
+They are module-level functions taking and returning plain data so they
+pickle across process boundaries; each worker keeps its own chart cache.
+"""
+from kundali_app.services.astrology import AstrologyService
+from kundali_app.services.pdf_generator import pdf_generator
+
+
+def call_service(ayanamsa_mode, method, *args, **kwargs):
+    """AstrologyService(ayanamsa=ayanamsa_mode).<method>(*args, **kwargs)."""
+    return getattr(AstrologyService(ayanamsa=ayanamsa_mode), method)(*args, **kwargs)
+
+
+def panchang_events(ayanamsa_mode, lat, lon, start_date, end_date, timezone, start_event=True):
+    """AstrologyService.panchang_range as a list, for one piece of a /panchang/range stream."""
+    service = AstrologyService(ayanamsa=ayanamsa_mode)
+    return list(service.panchang_range(lat, lon, start_date, end_date, timezone, start_event))
+
+
+def cache_stats():
+    """Counters of this process's chart and sunrise caches."""
+    from kundali_app.services.chart_cache import chart_cache
+    from kundali_app.services.sun_times import sun_times
+    return {"charts": chart_cache.stats(), "sun_times": sun_times.stats()}
+
+
+def render_pdf(data, illustrated=False):
+    """PDF report bytes for the payload accepted by /astro/download-pdf."""
+    return pdf_generator.generate(data, illustrated).getvalue()
+
+
+def render_pdfs(payloads, illustrated=False):
+    """render_pdf for a chunk of payloads (pdf_generator.render_batch)."""
+    return [pdf_generator.generate(data, illustrated).getvalue() for data in payloads]
+
+
+def compute_births(records, sections, ayanamsa_mode, dasha_depth=2):
+    """
+    calculate_full for a chunk of job records ({dob, tob, lat, lon, timezone,
+    place}); returns one {"result": ...} or {"error": ...} per record so a bad
+    birth does not fail its chunk.
+    """
+    service = AstrologyService(ayanamsa=ayanamsa_mode)
+    out = []
+    for record in records:
+        try:
+            birth = service.parse_birth(record["dob"], record["tob"])
+            result = service.calculate_full(record["lat"], record["lon"], *birth, record["timezone"],
+                                            sections=sections, dasha_depth=dasha_depth,
+                                            place=record.get("place", "Unknown"))
+            result.pop("timings_ms")
+            out.append({"result": result})
+        except Exception as e:
+            out.append({"error": f"{type(e).__name__}: {e}"})
+    return out
+
+
+def build_snapshot(ayanamsa_mode, lat, lon, year, month, day, hour, minute, timezone, place):
+    """Everything a profile's read endpoints serve, from one ChartContext (services/snapshots.py)."""
+    service = AstrologyService(ayanamsa=ayanamsa_mode)
+    birth = (lat, lon, year, month, day, hour, minute, timezone)
+    snapshot = service.calculate_full(*birth, sections=("basic", "panchang", "charts", "dasha", "ascendant_report"),
+                                      place=place, keep_details=True)
+    snapshot.pop("timings_ms")
+    return snapshot
+
+
+def current_dasha_rows(ids, births, moon_longitudes, dates, depth):
+    """
+    [id, date, combined_period, start, end] rows of every (birth, date) pair
+    from services/dasha_batch.py; births and dates are ISO strings. Pairs
+    outside the dasha cycle get None in the last three columns.
+    """
+    import numpy as np
+    from kundali_app.services.dasha_batch import combined_periods, current_dashas_batch
+
+    try:
+        birth = np.array(births, dtype="datetime64[m]")
+        as_of = np.array(dates, dtype="datetime64[m]")
+    except ValueError as e:
+        raise ValueError(f"Dates must be ISO YYYY-MM-DD or YYYY-MM-DDTHH:MM: {e}")
+    table = current_dashas_batch(birth, moon_longitudes, as_of, depth)
+    combined = combined_periods(table["lords"]).tolist()
+    start = np.datetime_as_string(table["start"], unit="m").tolist()
+    end = np.datetime_as_string(table["end"], unit="m").tolist()
+    dates = np.datetime_as_string(as_of, unit="m").tolist()
+    rows = []
+    for i, profile_id in enumerate(ids):
+        for j, date in enumerate(dates):
+            if combined[i][j] is None:
+                rows.append([profile_id, date, None, None, None])
+            else:
+                rows.append([profile_id, date, combined[i][j], start[i][j], end[i][j]])
+    return rows
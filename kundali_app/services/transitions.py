@@ -0,0 +1,160 @@
+import ephem
+import math
+from typing import NamedTuple, Optional
+
+from kundali_app.services.ayanamsa import ayanamsa as ayanamsa_at, longitude_of_date, resolve as resolve_ayanamsa
+
+# One second expressed in days (ephem.Date units)
+SECOND = 1.0 / 86400.0
+
+# How far past a crossing a sweep restarts its next search
+RESTART = 60 * SECOND
+
+NAK_SPAN = 360 / 27
+
+# Panchang limbs as functions of sidereal Sun (s) and Moon (m) longitudes:
+# name -> (phase function, segment width in degrees, mean angular rate in deg/day)
+PHASES = {
+    "tithi": (lambda s, m: (m - s) % 360, 12.0, 12.19),
+    "nakshatra": (lambda s, m: m % 360, NAK_SPAN, 13.18),
+    "yoga": (lambda s, m: (s + m) % 360, NAK_SPAN, 14.17),
+    "karana": (lambda s, m: (m - s) % 360, 6.0, 12.19),
+}
+
+
+class Transition(NamedTuple):
+    """
+    Result of a transition search. `time` is a UTC ephem.Date float; both it
+    and `precision_seconds` are None if no crossing was found within the horizon.
+    """
+    time: Optional[float]
+    precision_seconds: Optional[float]
+    evaluations: int
+
+
+class TransitionSolver:
+    """
+    Finds panchang transition times (tithi, nakshatra, yoga, karana boundaries)
+    for one location using rate-based bracketing and Illinois false-position refinement.
+
+    Sun/Moon positions are memoized per instant, so all limbs searched from the
+    same starting moment share their ephemeris evaluations.
+    """
+
+    def __init__(self, lat, lon, tolerance_seconds=1.0, horizon_days=3.0, ayanamsa_mode=None):
+        self.obs = ephem.Observer()
+        self.obs.lat, self.obs.lon = str(lat), str(lon)
+        self.sun = ephem.Sun()
+        self.moon = ephem.Moon()
+        self.tolerance = tolerance_seconds * SECOND
+        self.horizon = horizon_days
+        self.ayanamsa_mode = resolve_ayanamsa(ayanamsa_mode)
+        self.evaluations = 0
+        self._cache = {}
+
+    def prime(self, date, sun, moon):
+        """Seed the cache with sidereal Sun/Moon longitudes already computed elsewhere."""
+        self._cache[float(date)] = (sun, moon)
+
+    def positions(self, date):
+        """Sidereal (sun, moon) longitudes in degrees at an ephem.Date float."""
+        date = float(date)
+        cached = self._cache.get(date)
+        if cached is not None:
+            return cached
+        self.obs.date = date
+        self.sun.compute(self.obs)
+        self.moon.compute(self.obs)
+        self.evaluations += 1
+        ayanamsa = ayanamsa_at(date, self.ayanamsa_mode)
+        s = (longitude_of_date(self.sun, date) - ayanamsa) % 360
+        m = (longitude_of_date(self.moon, date) - ayanamsa) % 360
+        self._cache[date] = (s, m)
+        return s, m
+
+    def indices_at(self, date):
+        """All four limb indices from a single Sun/Moon evaluation (1-based except nakshatra)."""
+        s, m = self.positions(date)
+        return {
+            "tithi": int(PHASES["tithi"][0](s, m) / 12) + 1,
+            "nakshatra": int(m / NAK_SPAN),
+            "yoga": int(PHASES["yoga"][0](s, m) / NAK_SPAN) + 1,
+            "karana": int(PHASES["karana"][0](s, m) / 6) + 1,
+        }
+
+    def find(self, limb, start, direction=1):
+        """
+        Find when `limb` leaves its current segment (direction=1, end time)
+        or entered it (direction=-1, entry time), searching from `start`.
+        """
+        phase, width, rate = PHASES[limb]
+        start = float(start)
+        evals_before = self.evaluations
+
+        value = phase(*self.positions(start))
+        idx = int(value / width)
+        boundary = (idx + 1) * width if direction > 0 else idx * width
+
+        def dist(date):
+            # Signed angular distance from the boundary, continuous near it
+            return ((phase(*self.positions(date)) - boundary + 180) % 360) - 180
+
+        a, da = start, dist(start)
+        if da == 0:
+            return Transition(a, 0.0, self.evaluations - evals_before)
+
+        # Bracket: step by the rate-predicted distance (slightly overshooting)
+        # until the sign of the distance flips.
+        step_rate = rate
+        while True:
+            step = -da / step_rate * 1.05
+            if abs(step) < 60 * SECOND:
+                step = direction * 60 * SECOND
+            b = a + step
+            if abs(b - start) > self.horizon:
+                return Transition(None, None, self.evaluations - evals_before)
+            db = dist(b)
+            if db == 0:
+                return Transition(b, 0.0, self.evaluations - evals_before)
+            if (db > 0) != (da > 0):
+                break
+            measured = (db - da) / (b - a)
+            if measured > 0:
+                step_rate = measured
+            a, da = b, db
+
+        # Refine: Illinois variant of regula falsi keeps both ends shrinking
+        side = 0
+        while abs(b - a) > self.tolerance:
+            c = b - db * (b - a) / (db - da)
+            dc = dist(c)
+            if dc == 0:
+                a = b = c
+                break
+            if (dc > 0) == (db > 0):
+                b, db = c, dc
+                if side == -1:
+                    da /= 2
+                side = -1
+            else:
+                a, da = c, dc
+                if side == 1:
+                    db /= 2
+                side = 1
+
+        precision = abs(b - a) / 2 / SECOND
+        return Transition((a + b) / 2, precision, self.evaluations - evals_before)
+
+    def sweep(self, limb, start, end):
+        """
+        Yield (Transition, index entered) for every `limb` boundary in [start, end).
+        Each search starts just past the previous crossing and shares the
+        position cache, so consecutive days reuse the same search state.
+        """
+        date, end = float(start), float(end)
+        while True:
+            result = self.find(limb, date)
+            if result.time is None or result.time >= end:
+                return
+            date = result.time + RESTART
+            yield result, self.indices_at(date)[limb]
@@ -0,0 +1,234 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from kundali_app.core.config import settings
+
+
+class PoolBusy(Exception):
+    """The pool already holds `workers + queue_size` tasks."""
+
+
+class PoolTimeout(Exception):
+    """A task did not finish within its timeout."""
+
+
+def _timed(fn, submitted, report, args, kwargs):
+    # Runs in the worker: report how long the task queued and how long it ran,
+    # and the worker's own state (see WorkerPool `report`)
+    started = time.time()
+    result = fn(*args, **kwargs)
+    return result, started - submitted, time.time() - started, os.getpid(), report() if report else None
+
+
+class WorkerPool:
+    """
+    Bounded executor for CPU-bound work (ephemeris calculations, PDF rendering).
+
+    mode="process" runs tasks in a pool of spawned worker processes, so they
+    neither hold the GIL nor occupy the event loop; mode="thread" uses threads
+    (debugging, or platforms where spawning is undesirable). At most
+    `workers + queue_size` tasks are accepted at once; beyond that `PoolBusy`
+    is raised immediately instead of letting requests pile up.
+
+    A timed-out task cannot be interrupted inside a worker: the caller gets
+    `PoolTimeout`, the task keeps its slot until it finishes, and is cancelled
+    outright if it had not started yet.
+
+    `report` (a picklable function) runs in the worker after every task; its
+    latest result per worker process is kept in `worker_reports()`, e.g. the
+    counters of caches that live in the workers.
+    """
+
+    def __init__(self, workers=None, queue_size=64, timeout=30.0, mode="process", initializer=None, report=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.mode = mode
+        self.initializer = initializer
+        self.report = report
+        self._reports = {}  # worker pid -> latest report
+        self._executor = None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._wait_total = self._wait_max = 0.0
+        self._exec_total = self._exec_max = 0.0
+
+    def _get_executor(self):
+        if self._executor is None:
+            if self.mode == "process":
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=self.initializer,
+                )
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, initializer=self.initializer)
+        return self._executor
+
+    def _submit(self, fn, args, kwargs):
+        with self._lock:
+            if self.in_flight >= self.workers + self.queue_size:
+                self.rejected += 1
+                raise PoolBusy(f"Worker pool is full ({self.in_flight} tasks in flight)")
+            self.in_flight += 1
+            try:
+                try:
+                    future = self._get_executor().submit(_timed, fn, time.time(), self.report, args, kwargs)
+                except BrokenProcessPool:
+                    # A worker died (e.g. OOM-killed); start a fresh pool
+                    self._executor = None
+                    self._reports.clear()
+                    future = self._get_executor().submit(_timed, fn, time.time(), self.report, args, kwargs)
+            except Exception:
+                self.in_flight -= 1
+                raise
+        future.add_done_callback(self._finished)
+        return future
+
+    def _finished(self, future):
+        with self._lock:
+            self.in_flight -= 1
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                self.failed += 1
+                return
+            _, wait, execute, pid, report = future.result()
+            if report is not None:
+                self._reports[pid] = report
+            self.completed += 1
+            self._wait_total += wait
+            self._wait_max = max(self._wait_max, wait)
+            self._exec_total += execute
+            self._exec_max = max(self._exec_max, execute)
+
+    def _timeout(self, future, timeout):
+        return self.expire([future], f"Task did not finish within {timeout:g}s")
+
+    def expire(self, futures, message):
+        """
+        Give up on `futures` (of `submit`) after a caller-side timeout: cancel
+        those not started yet, count one timeout and return the PoolTimeout
+        to raise.
+        """
+        for future in futures:
+            future.cancel()
+        with self._lock:
+            self.timed_out += 1
+        return PoolTimeout(message)
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Queue `fn(*args, **kwargs)` without waiting or a timeout; returns a
+        Future of its result. Cancelling that future cancels the task if it
+        has not started yet.
+        """
+        inner = self._submit(fn, args, kwargs)
+        outer = Future()
+
+        def relay(future):
+            if outer.cancelled():
+                return
+            if future.cancelled():
+                outer.cancel()
+                outer.set_running_or_notify_cancel()  # wakes concurrent.futures.wait() callers
+            elif future.exception() is not None:
+                outer.set_exception(future.exception())
+            else:
+                outer.set_result(future.result()[0])
+
+        def cancel_inner(future):
+            if future.cancelled():
+                inner.cancel()
+
+        outer.add_done_callback(cancel_inner)
+        inner.add_done_callback(relay)
+        return outer
+
+    def run(self, fn, *args, timeout=None, **kwargs):
+        """Run `fn(*args, **kwargs)` on the pool and block for its result (for sync handlers)."""
+        timeout = timeout or self.timeout
+        future = self._submit(fn, args, kwargs)
+        try:
+            return future.result(timeout)[0]
+        except FutureTimeoutError:
+            raise self._timeout(future, timeout)
+
+    async def run_async(self, fn, *args, timeout=None, **kwargs):
+        """Awaitable `run` for async handlers; the event loop stays free meanwhile."""
+        timeout = timeout or self.timeout
+        future = self._submit(fn, args, kwargs)
+        try:
+            # shield: on timeout we decide about cancelling, not wait_for
+            result = await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout)
+        except asyncio.TimeoutError:
+            raise self._timeout(future, timeout)
+        return result[0]
+
+    def worker_reports(self):
+        """Latest `report` result of each worker process that has run a task."""
+        with self._lock:
+            return dict(self._reports)
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._reports.clear()
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def stats(self):
+        with self._lock:
+            done = self.completed
+            return {
+                "mode": self.mode,
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "timeout_seconds": self.timeout,
+                "in_flight": self.in_flight,
+                "queued": max(0, self.in_flight - self.workers),
+                "completed": done,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+                "wait_ms": {
+                    "avg": round(self._wait_total / done * 1000, 2) if done else 0.0,
+                    "max": round(self._wait_max * 1000, 2),
+                },
+                "exec_ms": {
+                    "avg": round(self._exec_total / done * 1000, 2) if done else 0.0,
+                    "max": round(self._exec_max * 1000, 2),
+                },
+            }
+
+
+def _warm_up():
+    # Import the heavy modules once per worker instead of on its first task
+    import kundali_app.services.tasks  # noqa: F401
+    from kundali_app.services.pdf_generator import pdf_generator
+    pdf_generator.preload()
+
+
+def _cache_report():
+    from kundali_app.services.tasks import cache_stats
+    return cache_stats()
+
+
+worker_pool = WorkerPool(
+    workers=settings.WORKERS,
+    queue_size=settings.WORKER_QUEUE_SIZE,
+    timeout=settings.WORKER_TIMEOUT,
+    mode=settings.WORKER_MODE,
+    initializer=_warm_up,
+    report=_cache_report,
+)
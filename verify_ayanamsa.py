@@ -0,0 +1,33 @@
+"""
+Check that the true Chitra ayanamsa keeps Spica at 180 deg sidereal across
+1900-2100, with Spica's longitude taken the same way as the planets'.
+The Lahiri value is printed for comparison (it drifts by design).
+Run with: python3 verify_ayanamsa.py
+"""
+import sys
+
+import ephem
+
+from kundali_app.services.ayanamsa import ayanamsa, longitude_of_date
+
+# Largest allowed deviation, degrees (ayanamsa() rounds the date to 0.1 day)
+TOLERANCE = 1e-3
+
+
+def check():
+    worst = 0.0
+    for year in range(1900, 2101, 10):
+        date = ephem.Date(f"{year}/3/21 07:13")  # off the 0.1-day grid of ayanamsa()
+        spica = ephem.star("Spica")
+        spica.compute(date)
+        tropical = longitude_of_date(spica, date)
+        chitra = (tropical - ayanamsa(date, "true_chitra")) % 360
+        lahiri = (tropical - ayanamsa(date, "lahiri")) % 360
+        worst = max(worst, abs(chitra - 180))
+        print(f"  {year}  true_chitra {chitra:11.6f}  lahiri {lahiri:10.4f}")
+    print(f"largest deviation from 180: {worst:.2e} deg")
+    return worst <= TOLERANCE
+
+
+if __name__ == "__main__":
+    sys.exit(0 if check() else 1)
@@ -13,7 +13,7 @@ import {
 import Image from 'next/image';
 import BirthDetailsForm from '@/components/BirthDetailsForm';
 import KundaliChart from '@/components/KundaliChart';
-import { calculateKundali, getCharts, getDasha, getAscendantReport, downloadPdf } from '@/lib/api';
+import { calculateFullKundali, downloadPdf } from '@/lib/api';
 import styles from './page.module.css';
 
 const { Title, Text, Paragraph } = Typography;
@@ -42,33 +42,22 @@ export default function Home() {
     setFormValues(values);
 
     try {
-      const [kundali, charts, dasha, ascendant] = await Promise.all([
-        calculateKundali(values).catch(err => {
-          console.error('Kundali error:', err);
-          return null;
-        }),
-        getCharts(values).catch(err => {
-          console.error('Charts error:', err);
-          return null;
-        }),
-        getDasha(values).catch(err => {
-          console.error('Dasha error:', err);
-          return null;
-        }),
-        getAscendantReport(values).catch(err => {
-          console.error('Ascendant error:', err);
-          return null;
-        }),
-      ]);
-
-      console.log('API Responses:', { kundali, charts, dasha, ascendant });
-
-      if (kundali) setKundaliData(kundali);
+      const full = await calculateFullKundali(
+        values, ['basic', 'panchang', 'charts', 'dasha', 'ascendant_report']
+      ).catch(err => {
+        console.error('Kundali error:', err);
+        return null;
+      });
+
+      console.log('API Response:', full);
+
+      const { charts, dasha, ascendant_report: ascendant, ...kundali } = full ?? {};
+      if (full) setKundaliData(kundali);
       if (charts) setChartData(charts);
       if (dasha) setDashaData(dasha);
       if (ascendant) setAscendantData(ascendant);
 
-      if (kundali || charts) {
+      if (full) {
         // Scroll to results on success
         setTimeout(() => {
           resultsRef.current?.scrollIntoView({ behavior: 'smooth' });
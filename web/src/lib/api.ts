@@ -28,6 +28,23 @@ export async function calculateKundali(data: KundaliRequest) {
     return response.json();
 }
 
+// All requested sections from one backend ephemeris pass; see /astro/calculate/full
+export async function calculateFullKundali(data: KundaliRequest, sections?: string[]) {
+    const params = buildFormData(data);
+    if (sections) {
+        params.set('sections', sections.join(','));
+    }
+
+    const response = await fetch(`${API_BASE}/astro/calculate/full?${params}`, {
+        method: 'POST',
+    });
+
+    if (!response.ok) {
+        throw new Error(`Failed to calculate Kundali: ${response.status}`);
+    }
+    return response.json();
+}
+
 export async function getCharts(data: KundaliRequest) {
     const params = buildFormData(data);
 